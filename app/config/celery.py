@@ -6,9 +6,17 @@ from math import ceil
 import requests
 from celery import Celery
 from celery.exceptions import ImproperlyConfigured
-from celery.signals import celeryd_after_setup, task_postrun, task_prerun
+from celery.signals import (
+    celeryd_after_setup,
+    task_postrun,
+    task_prerun,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 from django.conf import settings
 
+from grandchallenge.core.metrics import flush_metrics
+
 logger = logging.getLogger(__name__)
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
@@ -88,6 +96,18 @@ def set_ecs_scale_in_protection(*_, task, **__):
         response.raise_for_status()
 
 
+@task_postrun.connect()
+def flush_metrics_after_task(*_, **__):
+    flush_metrics()
+
+
+@worker_shutdown.connect()
+@worker_process_shutdown.connect()
+def flush_metrics_on_shutdown(*_, **__):
+    # Pool processes exit without running atexit handlers
+    flush_metrics(force=True)
+
+
 @task_postrun.connect()
 def remove_ecs_scale_in_protection(*_, **__):
     if (
@@ -784,6 +784,16 @@ FORUMS_MIN_ACCOUNT_AGE_DAYS = int(
     os.environ.get("FORUMS_MIN_ACCOUNT_AGE_DAYS", "2")
 )
 
+# The number of seconds that the receivers of notifications are cached
+NOTIFICATIONS_RECEIVERS_CACHE_TIMEOUT = int(
+    os.environ.get("NOTIFICATIONS_RECEIVERS_CACHE_TIMEOUT", "60")
+)
+
+# The number of notifications that are created per bulk insert
+NOTIFICATIONS_BULK_CREATE_BATCH_SIZE = int(
+    os.environ.get("NOTIFICATIONS_BULK_CREATE_BATCH_SIZE", "1000")
+)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"
@@ -947,6 +957,15 @@ CELERY_WORKER_MAX_MEMORY_MB = int(
 ECS_ENABLE_CELERY_SCALE_IN_PROTECTION = strtobool(
     os.environ.get("ECS_ENABLE_CELERY_SCALE_IN_PROTECTION", "False"),
 )
+# Maps task names to their profiling options, see
+# grandchallenge.core.profiling.profile_task, for example
+# {"grandchallenge.evaluation.tasks.calculate_ranks": {"dump_sample_rate": 0.1, "tracemalloc": true}}
+CELERY_TASK_PROFILING = json.loads(
+    os.environ.get("CELERY_TASK_PROFILING", "{}")
+)
+CELERY_TASK_PROFILING_DUMP_DIRECTORY = os.environ.get(
+    "CELERY_TASK_PROFILING_DUMP_DIRECTORY", "/tmp/task-profiles"
+)
 
 CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", "django-db")
 CELERY_RESULT_PERSISTENT = True
@@ -1020,6 +1039,20 @@ COMPONENTS_INPUT_BUCKET_NAME = os.environ.get(
 COMPONENTS_OUTPUT_BUCKET_NAME = os.environ.get(
     "COMPONENTS_OUTPUT_BUCKET_NAME", "grand-challenge-components-outputs"
 )
+# The number of concurrent S3 requests used to download the outputs of a job
+COMPONENTS_OUTPUT_DOWNLOAD_CONCURRENCY = int(
+    os.environ.get("COMPONENTS_OUTPUT_DOWNLOAD_CONCURRENCY", "20")
+)
+# Share inputs between jobs rather than copying them for each job
+COMPONENTS_INPUT_CACHE_ENABLED = strtobool(
+    os.environ.get("COMPONENTS_INPUT_CACHE_ENABLED", "False")
+)
+# Cached inputs are evicted when they have not been refreshed within the TTL.
+# They are refreshed when used by a job if they are older than half the TTL,
+# so this must be more than twice the time that a job can take to complete.
+COMPONENTS_INPUT_CACHE_TTL = timedelta(
+    days=int(os.environ.get("COMPONENTS_INPUT_CACHE_TTL_DAYS", "7"))
+)
 COMPONENTS_MAXIMUM_IMAGE_SIZE = 10 * GIGABYTE
 COMPONENTS_MINIMUM_JOB_DURATION = 5 * 60  # 5 minutes
 COMPONENTS_MAXIMUM_JOB_DURATION = 24 * 60 * 60  # 24 hours
@@ -1191,6 +1224,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "grandchallenge.components.tasks.delete_old_unsuccessful_container_images",
         "schedule": crontab(hour=2, minute=0),
     },
+    "delete_expired_cached_inputs": {
+        "task": "grandchallenge.components.tasks.delete_expired_cached_inputs",
+        "schedule": timedelta(hours=1),
+    },
     "deactivate_old_algorithm_images": {
         "task": "grandchallenge.algorithms.tasks.deactivate_old_algorithm_images",
         "schedule": crontab(hour=2, minute=30),
@@ -1229,7 +1266,7 @@ CELERY_BEAT_SCHEDULE = {
     },
     "update_challenge_compute_costs": {
         "task": "grandchallenge.challenges.tasks.update_challenge_compute_costs",
-        "schedule": crontab(minute=45),
+        "schedule": crontab(hour=6, minute=45),
     },
     "delete_users_who_dont_login": {
         "task": "grandchallenge.profiles.tasks.delete_users_who_dont_login",
@@ -1275,6 +1312,14 @@ CELERY_BEAT_SCHEDULE = {
         "task": "grandchallenge.core.tasks.put_cloudwatch_metrics",
         "schedule": timedelta(seconds=30),
     },
+    "drain_unowned_serialized_task_queues": {
+        "task": "grandchallenge.core.tasks.drain_unowned_serialized_task_queues",
+        "schedule": timedelta(minutes=1),
+    },
+    "reconcile_status_counters": {
+        "task": "grandchallenge.core.tasks.reconcile_all_status_counters",
+        "schedule": timedelta(minutes=10),
+    },
     **{
         f"stop_expired_services_{region}": {
             "task": "grandchallenge.components.tasks.stop_expired_services",
@@ -1302,6 +1347,21 @@ PUSH_CLOUDWATCH_METRICS = strtobool(
     os.environ.get("PUSH_CLOUDWATCH_METRICS", "False")
 )
 
+# Where the in-process pipeline metrics are exported to, one of
+# the exporters in grandchallenge.core.metrics
+METRICS_EXPORTER = os.environ.get(
+    "METRICS_EXPORTER", "grandchallenge.core.metrics.NullMetricsExporter"
+)
+METRICS_FLUSH_INTERVAL = timedelta(
+    seconds=int(os.environ.get("METRICS_FLUSH_INTERVAL_SECONDS", "60"))
+)
+# Used by the FileMetricsExporter
+METRICS_FILE_PATH = os.environ.get("METRICS_FILE_PATH", "/tmp/metrics.jsonl")
+# Required to scrape the metrics of the PrometheusMetricsExporter
+METRICS_PROMETHEUS_BEARER_TOKEN = os.environ.get(
+    "METRICS_PROMETHEUS_BEARER_TOKEN", ""
+)
+
 # The name of the group whose members will be able to create algorithms
 ALGORITHMS_CREATORS_GROUP_NAME = "algorithm_creators"
 ALGORITHMS_MAX_ACTIVE_JOBS = int(
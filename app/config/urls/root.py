@@ -15,6 +15,7 @@ from grandchallenge.core.views import (
     HomeTemplate,
     RedirectPath,
     healthcheck,
+    prometheus_metrics,
 )
 from grandchallenge.pages.sitemaps import PagesSitemap
 from grandchallenge.policies.sitemaps import PoliciesSitemap
@@ -60,6 +61,10 @@ urlpatterns = [
         "healthcheck/",
         healthcheck,
     ),
+    path(
+        "metrics/",
+        prometheus_metrics,
+    ),
     path(
         f"{settings.ADMIN_URL}/login/",
         RedirectView.as_view(url=settings.LOGIN_URL),
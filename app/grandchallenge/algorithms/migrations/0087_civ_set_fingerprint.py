@@ -0,0 +1,43 @@
+# Generated by Django 4.2.26 on 2026-10-17 08:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "algorithms",
+            "0086_alter_algorithm_logo_alter_algorithm_social_image",
+        ),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="inputs_fingerprint",
+            field=models.CharField(
+                default="e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+                editable=False,
+                help_text="The fingerprint of the set of inputs of this job",
+                max_length=64,
+            ),
+        ),
+        migrations.RunSQL(
+            sql=(
+                "UPDATE algorithms_job SET inputs_fingerprint = fingerprints.fingerprint "
+                "FROM (SELECT job_id, encode(sha256(convert_to(string_agg(componentinterfacevalue_id::text, ',' ORDER BY componentinterfacevalue_id), 'UTF8')), 'hex') AS fingerprint "
+                "FROM algorithms_job_inputs GROUP BY job_id) AS fingerprints "
+                "WHERE algorithms_job.id = fingerprints.job_id;"
+            ),
+            reverse_sql="",
+            elidable=True,
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["algorithm_image", "inputs_fingerprint"],
+                name="algorithms__algorit_10ebd0_idx",
+            ),
+        ),
+    ]
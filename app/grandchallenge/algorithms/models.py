@@ -1,5 +1,7 @@
 import logging
 from datetime import datetime
+from itertools import product
+from math import prod
 
 from actstream.actions import follow, is_following
 from dateutil.relativedelta import relativedelta
@@ -24,8 +26,10 @@ from pictures.models import PictureField
 
 from grandchallenge.algorithms.tasks import update_algorithm_average_duration
 from grandchallenge.anatomy.models import BodyStructure
+from grandchallenge.cases.models import Image
 from grandchallenge.charts.specs import stacked_bar
 from grandchallenge.components.models import (  # noqa: F401
+    EMPTY_CIV_SET_FINGERPRINT,
     CIVForObjectMixin,
     ComponentImage,
     ComponentInterface,
@@ -34,6 +38,7 @@ from grandchallenge.components.models import (  # noqa: F401
     ComponentJobManager,
     ImportStatusChoices,
     Tarball,
+    get_civ_set_fingerprint,
 )
 from grandchallenge.components.schemas import GPUTypeChoices
 from grandchallenge.core.guardian import (
@@ -64,6 +69,8 @@ from grandchallenge.workstations.utils import reassign_workstation_permissions
 
 logger = logging.getLogger(__name__)
 
+MAX_INPUT_COMBINATIONS_FOR_FINGERPRINT_LOOKUP = 1000
+
 
 def annotate_input_output_counts(queryset, inputs=None, outputs=None):
     return queryset.annotate(
@@ -937,20 +944,134 @@ class JobManager(ComponentJobManager):
 
         return obj
 
+    def bulk_create_system_jobs(
+        self,
+        *,
+        jobs,
+        input_civ_sets,
+        utilizations,
+        extra_viewer_groups=None,
+        extra_logs_viewer_groups=None,
+    ):
+        """
+        Creates jobs without a creator, and their related objects, in bulk
+
+        This results in the same objects and permissions as calling
+        `create` for each job, but with a fixed number of queries per
+        batch rather than per job. Signals are not sent for the created
+        objects, so the permissions that the signal handlers would
+        assign are assigned here.
+
+        Parameters
+        ----------
+        jobs
+            The unsaved jobs, none of which may have a creator
+        input_civ_sets
+            The component interface values to use as inputs for each job
+        utilizations
+            The unsaved utilization for each job
+        extra_viewer_groups
+            The groups that will also get permission to view the jobs
+        extra_logs_viewer_groups
+            The groups that will also get permission to view the logs for
+            the jobs
+        """
+        if not jobs:
+            return []
+
+        if any(job.creator for job in jobs):
+            raise RuntimeError(
+                "Only jobs without a creator can be bulk created"
+            )
+
+        for job, civs in zip(jobs, input_civ_sets, strict=True):
+            job.init_is_complimentary()
+            job.init_credits_consumed()
+            job.inputs_fingerprint = get_civ_set_fingerprint(
+                civ_pks=[civ.pk for civ in civs]
+            )
+
+        jobs = self.bulk_create(jobs)
+        self.model.update_status_counters_for_created(objs=jobs)
+
+        for job, utilization in zip(jobs, utilizations, strict=True):
+            # Mirrors JobUtilization.save for new instances
+            job.job_utilization = utilization
+            utilization.creator = job.creator
+            utilization.algorithm_image = job.algorithm_image
+            utilization.algorithm = job.algorithm_image.algorithm
+
+        JobUtilization.objects.bulk_create(utilizations)
+
+        self.model.inputs.through.objects.bulk_create(
+            self.model.inputs.through(
+                job_id=job.pk, componentinterfacevalue_id=civ.pk
+            )
+            for job, civs in zip(jobs, input_civ_sets, strict=True)
+            for civ in civs
+        )
+
+        if extra_viewer_groups is not None:
+            self.model.viewer_groups.through.objects.bulk_create(
+                self.model.viewer_groups.through(
+                    job_id=job.pk, group_id=group.pk
+                )
+                for job in jobs
+                for group in extra_viewer_groups
+            )
+
+            images = Image.objects.filter(
+                componentinterfacevalue__pk__in={
+                    civ.pk for civs in input_civ_sets for civ in civs
+                }
+            ).distinct()
+
+            for group in extra_viewer_groups:
+                assign_perm("view_job", group, jobs)
+                assign_perm("view_image", group, images)
+
+        if extra_logs_viewer_groups is not None:
+            for group in extra_logs_viewer_groups:
+                assign_perm("algorithms.view_logs", group, jobs)
+
+        return jobs
+
     def get_jobs_with_same_inputs(
         self, *, inputs, algorithm_image, algorithm_model
     ):
-        existing_civs = self.retrieve_existing_civs(civ_data_objects=inputs)
         unique_kwargs = {
             "algorithm_image": algorithm_image,
         }
-        input_interface_count = len(inputs)
 
         if algorithm_model:
             unique_kwargs["algorithm_model"] = algorithm_model
         else:
             unique_kwargs["algorithm_model__isnull"] = True
 
+        # There can be several existing civs with the same data
+        # so any combination of these could be the inputs of a job
+        existing_civs_per_input = [
+            self.retrieve_existing_civs(civ_data_objects=[civ_data])
+            for civ_data in inputs
+        ]
+
+        if (
+            prod(len(civs) for civs in existing_civs_per_input)
+            <= MAX_INPUT_COMBINATIONS_FOR_FINGERPRINT_LOOKUP
+        ):
+            return Job.objects.filter(
+                inputs_fingerprint__in={
+                    get_civ_set_fingerprint(civ_pks=[civ.pk for civ in civs])
+                    for civs in product(*existing_civs_per_input)
+                },
+                **unique_kwargs,
+            )
+
+        existing_civs = [
+            civ for civs in existing_civs_per_input for civ in civs
+        ]
+        input_interface_count = len(inputs)
+
         # annotate the number of inputs and the number of inputs that match
         # the existing civs and filter on both counts so as to not include jobs
         # with partially overlapping inputs
@@ -1093,10 +1214,20 @@ class Job(CIVForObjectMixin, ComponentJob):
         on_delete=models.SET_NULL,
         related_name="viewers_of_algorithm_job",
     )
+    inputs_fingerprint = models.CharField(
+        max_length=64,
+        default=EMPTY_CIV_SET_FINGERPRINT,
+        editable=False,
+        help_text="The fingerprint of the set of inputs of this job",
+    )
 
     class Meta(UUIDModel.Meta, ComponentJob.Meta):
         ordering = ("created",)
         permissions = [("view_logs", "Can view the jobs logs")]
+        indexes = [
+            *ComponentJob.Meta.indexes,
+            models.Index(fields=["algorithm_image", "inputs_fingerprint"]),
+        ]
 
     def __str__(self):
         return f"Job {self.pk}"
@@ -1258,6 +1389,20 @@ class Job(CIVForObjectMixin, ComponentJob):
     def remove_viewer(self, user):
         return user.groups.remove(self.viewers)
 
+    def update_inputs_fingerprint(self, *, exclude_civ_pks=()):
+        # Lock the row so that concurrent changes to the inputs
+        # are included in the fingerprint
+        Job.objects.select_for_update().filter(pk=self.pk).exists()
+
+        self.inputs_fingerprint = get_civ_set_fingerprint(
+            civ_pks=self.inputs.exclude(pk__in=exclude_civ_pks).values_list(
+                "pk", flat=True
+            )
+        )
+        Job.objects.filter(pk=self.pk).update(
+            inputs_fingerprint=self.inputs_fingerprint
+        )
+
     def add_civ(self, *, civ):
         super().add_civ(civ=civ)
         return self.inputs.add(civ)
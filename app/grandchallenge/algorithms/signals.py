@@ -70,6 +70,32 @@ def update_view_image_permissions_on_job_io_change(  # noqa:C901
         raise NotImplementedError
 
 
+@receiver(m2m_changed, sender=Job.inputs.through)
+def update_inputs_fingerprint_on_job_inputs_change(
+    *, instance, action, reverse, model, pk_set, **_
+):
+    if action not in ["post_add", "post_remove", "pre_clear", "post_clear"]:
+        # nothing to do for the other actions
+        return
+
+    if reverse:
+        if action == "pre_clear":
+            # The jobs are no longer related after the clear
+            jobs = instance.algorithms_jobs_as_input.all()
+            exclude_civ_pks = [instance.pk]
+        elif action == "post_clear":
+            return
+        else:
+            jobs = model.objects.filter(pk__in=pk_set)
+            exclude_civ_pks = []
+
+        for job in jobs:
+            job.update_inputs_fingerprint(exclude_civ_pks=exclude_civ_pks)
+
+    elif action != "pre_clear":
+        instance.update_inputs_fingerprint()
+
+
 def _get_images_for_jobs(*, jobs):
     input_images = Image.objects.filter(
         componentinterfacevalue__algorithms_jobs_as_input__in=jobs
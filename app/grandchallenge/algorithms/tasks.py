@@ -1,11 +1,12 @@
 from typing import NamedTuple
 
+from celery import group
 from celery.utils.log import get_task_logger
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.core.cache import cache
 from django.db import transaction
-from django.db.models import F, Max
+from django.db.models import Exists, F, Max, OuterRef
 from django.db.transaction import on_commit
 from django.utils import timezone
 
@@ -28,6 +29,8 @@ from grandchallenge.subdomains.utils import reverse
 
 logger = get_task_logger(__name__)
 
+JOB_CREATION_BATCH_SIZE = 1000
+
 
 @acks_late_micro_short_task(
     retry_on=(LockNotAcquiredException, TooManyJobsScheduled)
@@ -117,6 +120,7 @@ def create_algorithm_jobs(
         The challenge that should be assigned for utilization tracking
     """
     from grandchallenge.algorithms.models import Job
+    from grandchallenge.utilization.models import JobUtilization
 
     if not algorithm_image:
         raise RuntimeError("Algorithm image required to create jobs.")
@@ -135,21 +139,24 @@ def create_algorithm_jobs(
         time_limit = settings.ALGORITHMS_JOB_DEFAULT_TIME_LIMIT_SECONDS
 
     jobs = []
+    pending = []
+
     for interface, archive_items in valid_job_inputs.items():
         for ai in archive_items:
-            if len(jobs) >= max_jobs:
-                raise TooManyJobsScheduled
+            if len(jobs) + len(pending) >= max_jobs:
+                break
 
             use_warm_pool = (requires_gpu_type == GPUTypeChoices.A10G) and (
                 (
                     items_remaining
                     - settings.ALGORITHMS_MAX_ACTIVE_JOBS_PER_ALGORITHM
                     - len(jobs)
+                    - len(pending)
                 )
                 > 0
             )
 
-            job = Job.objects.create(
+            job = Job(
                 creator=None,  # System jobs, so no creator
                 algorithm_image=algorithm_image,
                 algorithm_model=algorithm_model,
@@ -159,24 +166,56 @@ def create_algorithm_jobs(
                 time_limit=time_limit,
                 requires_gpu_type=requires_gpu_type,
                 requires_memory_gb=requires_memory_gb,
-                extra_viewer_groups=extra_viewer_groups,
-                extra_logs_viewer_groups=extra_logs_viewer_groups,
-                input_civ_set=ai.values.all(),
                 use_warm_pool=use_warm_pool,
             )
+            utilization = JobUtilization(
+                archive=ai.archive,
+                phase=job_utilization_phase,
+                challenge=job_utilization_challenge,
+            )
+            pending.append((job, ai.values.all(), utilization))
 
-            job.utilization.archive = ai.archive
-            job.utilization.phase = job_utilization_phase
-            job.utilization.challenge = job_utilization_challenge
-            job.utilization.save()
+            if len(pending) >= JOB_CREATION_BATCH_SIZE:
+                jobs += _create_jobs(
+                    pending=pending,
+                    extra_viewer_groups=extra_viewer_groups,
+                    extra_logs_viewer_groups=extra_logs_viewer_groups,
+                )
+                pending = []
 
-            job.execute()
+    jobs += _create_jobs(
+        pending=pending,
+        extra_viewer_groups=extra_viewer_groups,
+        extra_logs_viewer_groups=extra_logs_viewer_groups,
+    )
 
-            jobs.append(job)
+    if jobs:
+        # Dispatch the execution of all of the jobs at once
+        on_commit(group([job.execute_signature for job in jobs]).apply_async)
+
+    if len(jobs) < items_remaining and len(jobs) >= max_jobs:
+        raise TooManyJobsScheduled
 
     return jobs
 
 
+def _create_jobs(*, pending, extra_viewer_groups, extra_logs_viewer_groups):
+    from grandchallenge.algorithms.models import Job
+
+    if not pending:
+        return []
+
+    jobs, input_civ_sets, utilizations = zip(*pending, strict=True)
+
+    return Job.objects.bulk_create_system_jobs(
+        jobs=list(jobs),
+        input_civ_sets=input_civ_sets,
+        utilizations=list(utilizations),
+        extra_viewer_groups=extra_viewer_groups,
+        extra_logs_viewer_groups=extra_logs_viewer_groups,
+    )
+
+
 def filter_archive_items_for_algorithm(
     *, archive_items, algorithm_image, algorithm_model=None
 ):
@@ -197,9 +236,9 @@ def filter_archive_items_for_algorithm(
     -------
     Dictionary of valid ArchiveItems for new jobs, grouped by AlgorithmInterface
     """
+    from grandchallenge.algorithms.models import Job
     from grandchallenge.evaluation.models import (
         get_archive_items_for_interfaces,
-        get_valid_jobs_for_interfaces_and_archive_items,
     )
 
     algorithm_interfaces = (
@@ -213,30 +252,29 @@ def filter_archive_items_for_algorithm(
         algorithm_interfaces=algorithm_interfaces, archive_items=archive_items
     )
 
-    # Next, group all system jobs that have been run for the provided archive items
-    # with the same model and image by interface
-    existing_jobs_for_interfaces = (
-        get_valid_jobs_for_interfaces_and_archive_items(
-            algorithm_image=algorithm_image,
-            algorithm_model=algorithm_model,
-            algorithm_interfaces=algorithm_interfaces,
-            valid_archive_items_per_interface=valid_job_inputs,
-        )
+    if algorithm_model:
+        extra_filter = {"algorithm_model": algorithm_model}
+    else:
+        extra_filter = {"algorithm_model__isnull": True}
+
+    # Next, find the system jobs that have been run with the same model and
+    # image for exactly the values of an archive item
+    existing_jobs = Job.objects.filter(
+        algorithm_image=algorithm_image,
+        creator=None,
+        inputs_fingerprint=OuterRef("values_fingerprint"),
+        **extra_filter,
     )
-    # Finally, exclude archive items for which there already is a job
-    filtered_valid_job_inputs = {}
-    for interface, archive_items in valid_job_inputs.items():
-        job_input_sets_for_interface = {
-            frozenset(j.inputs.all())
-            for j in existing_jobs_for_interfaces[interface]
-        }
-        filtered_valid_job_inputs[interface] = [
-            ai
-            for ai in archive_items
-            if not frozenset(ai.values.all()) in job_input_sets_for_interface
-        ]
 
-    return filtered_valid_job_inputs
+    # Finally, exclude archive items for which there already is a job
+    return {
+        interface: list(
+            archive_items.filter(
+                ~Exists(existing_jobs.filter(algorithm_interface=interface))
+            )
+        )
+        for interface, archive_items in valid_job_inputs.items()
+    }
 
 
 @acks_late_micro_short_task
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.26 on 2026-10-17 08:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("archives", "0024_alter_archive_logo_alter_archive_social_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archiveitem",
+            name="values_fingerprint",
+            field=models.CharField(
+                default="e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+                editable=False,
+                help_text="The fingerprint of the set of values of this item",
+                max_length=64,
+            ),
+        ),
+        migrations.RunSQL(
+            sql=(
+                "UPDATE archives_archiveitem SET values_fingerprint = fingerprints.fingerprint "
+                "FROM (SELECT archiveitem_id, encode(sha256(convert_to(string_agg(componentinterfacevalue_id::text, ',' ORDER BY componentinterfacevalue_id), 'UTF8')), 'hex') AS fingerprint "
+                "FROM archives_archiveitem_values GROUP BY archiveitem_id) AS fingerprints "
+                "WHERE archives_archiveitem.id = fingerprints.archiveitem_id;"
+            ),
+            reverse_sql="",
+            elidable=True,
+        ),
+        migrations.AddIndex(
+            model_name="archiveitem",
+            index=models.Index(
+                fields=["archive", "values_fingerprint"],
+                name="archives_ar_archive_01de8f_idx",
+            ),
+        ),
+    ]
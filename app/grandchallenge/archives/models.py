@@ -9,11 +9,13 @@ from pictures.models import PictureField
 
 from grandchallenge.anatomy.models import BodyStructure
 from grandchallenge.components.models import (
+    EMPTY_CIV_SET_FINGERPRINT,
     CIVForObjectMixin,
     CIVSetObjectPermissionsMixin,
     CIVSetStringRepresentationMixin,
     ComponentInterfaceValue,
     LinkedComponentInterfacesMixin,
+    get_civ_set_fingerprint,
 )
 from grandchallenge.core.guardian import (
     GroupObjectPermissionBase,
@@ -324,6 +326,12 @@ class ArchiveItem(
         ComponentInterfaceValue, blank=True, related_name="archive_items"
     )
     title = models.CharField(max_length=255, default="", blank=True)
+    values_fingerprint = models.CharField(
+        max_length=64,
+        default=EMPTY_CIV_SET_FINGERPRINT,
+        editable=False,
+        help_text="The fingerprint of the set of values of this item",
+    )
 
     class Meta:
         constraints = [
@@ -333,6 +341,9 @@ class ArchiveItem(
                 condition=~Q(title=""),
             )
         ]
+        indexes = [
+            models.Index(fields=["archive", "values_fingerprint"]),
+        ]
 
     def assign_permissions(self):
         # Archive editors, uploaders and users can view this archive item
@@ -383,6 +394,20 @@ class ArchiveItem(
     def is_editable(self):
         return True
 
+    def update_values_fingerprint(self, *, exclude_civ_pks=()):
+        # Lock the row so that concurrent changes to the values
+        # are included in the fingerprint
+        ArchiveItem.objects.select_for_update().filter(pk=self.pk).exists()
+
+        self.values_fingerprint = get_civ_set_fingerprint(
+            civ_pks=self.values.exclude(pk__in=exclude_civ_pks).values_list(
+                "pk", flat=True
+            )
+        )
+        ArchiveItem.objects.filter(pk=self.pk).update(
+            values_fingerprint=self.values_fingerprint
+        )
+
     def add_civ(self, *, civ):
         super().add_civ(civ=civ)
         return self.values.add(civ)
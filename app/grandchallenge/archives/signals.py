@@ -45,6 +45,34 @@ def update_view_image_permissions_on_archive_item_values_change(
         )
 
 
+@receiver(m2m_changed, sender=ArchiveItem.values.through)
+def update_values_fingerprint_on_archive_item_values_change(
+    *, instance, action, reverse, model, pk_set, **_
+):
+    if action not in ["post_add", "post_remove", "pre_clear", "post_clear"]:
+        # nothing to do for the other actions
+        return
+
+    if reverse:
+        if action == "pre_clear":
+            # The items are no longer related after the clear
+            archive_items = instance.archive_items.all()
+            exclude_civ_pks = [instance.pk]
+        elif action == "post_clear":
+            return
+        else:
+            archive_items = model.objects.filter(pk__in=pk_set)
+            exclude_civ_pks = []
+
+        for archive_item in archive_items:
+            archive_item.update_values_fingerprint(
+                exclude_civ_pks=exclude_civ_pks
+            )
+
+    elif action != "pre_clear":
+        instance.update_values_fingerprint()
+
+
 @receiver(pre_delete, sender=ArchiveItem)
 @receiver(post_save, sender=ArchiveItem)
 def update_view_image_permissions_on_archive_item_change(
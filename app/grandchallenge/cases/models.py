@@ -2,12 +2,15 @@ import gzip
 import hashlib
 import json
 import logging
+import re
+import zlib
 from pathlib import Path
 from tempfile import SpooledTemporaryFile, TemporaryDirectory
 from typing import NamedTuple
 from urllib.parse import urlparse
 
 import boto3
+import numpy as np
 from actstream.actions import follow
 from billiard.exceptions import SoftTimeLimitExceeded
 from botocore.awsrequest import AWSRequest
@@ -25,7 +28,7 @@ from django.utils.text import get_valid_filename
 from django.utils.translation import gettext_lazy as _
 from grand_challenge_dicom_de_identifier.deidentifier import DicomDeidentifier
 from guardian.shortcuts import assign_perm, get_groups_with_perms, remove_perm
-from panimg.image_builders.metaio_utils import load_sitk_image
+from panimg.image_builders.metaio_utils import load_sitk_image, parse_mh_header
 from panimg.models import (
     MAXIMUM_SEGMENTS_LENGTH,
     ColorSpace,
@@ -44,7 +47,11 @@ from grandchallenge.core.guardian import (
     GroupObjectPermissionBase,
     UserObjectPermissionBase,
 )
-from grandchallenge.core.models import FieldChangeMixin, UUIDModel
+from grandchallenge.core.models import (
+    FieldChangeMixin,
+    StatusCountersMixin,
+    UUIDModel,
+)
 from grandchallenge.core.storage import protected_s3_storage
 from grandchallenge.core.templatetags.remove_whitespace import oxford_comma
 from grandchallenge.core.validators import JSONValidator
@@ -58,6 +65,47 @@ from grandchallenge.uploads.models import UserUpload
 
 logger = logging.getLogger(__name__)
 
+STORAGE_READ_CHUNK_SIZE = 8 * settings.MEGABYTE
+METAIMAGE_HEADER_CHUNK_SIZE = 64 * 1024
+METAIMAGE_MAX_HEADER_SIZE = settings.MEGABYTE
+METAIMAGE_DATA_FILE_LINE = re.compile(
+    rb"^ElementDataFile\s*=[^\n]*\n", re.MULTILINE
+)
+METAIMAGE_ELEMENT_TYPES = {
+    "MET_CHAR": "i1",
+    "MET_UCHAR": "u1",
+    "MET_SHORT": "i2",
+    "MET_USHORT": "u2",
+    "MET_INT": "i4",
+    "MET_UINT": "u4",
+    "MET_LONG_LONG": "i8",
+    "MET_ULONG_LONG": "u8",
+    "MET_FLOAT": "f4",
+    "MET_DOUBLE": "f8",
+}
+METAIMAGE_MASK_ELEMENT_TYPES = {"MET_CHAR", "MET_UCHAR"}
+
+
+def get_metaimage_dtype(*, header):
+    try:
+        element_type = METAIMAGE_ELEMENT_TYPES[header["ElementType"]]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported element type {header.get('ElementType')!r}"
+        )
+
+    if header.get("BinaryDataByteOrderMSB", "False") == "True":
+        byte_order = ">"
+    else:
+        byte_order = "<"
+
+    return np.dtype(f"{byte_order}{element_type}")
+
+
+def raise_for_missing_object(*, error, file):
+    if error.response["Error"]["Code"] in {"404", "NoSuchKey"}:
+        raise FileNotFoundError(f"No file found for {file}") from error
+
 
 SEGMENTS_SCHEMA = {
     "$schema": "http://json-schema.org/draft-07/schema",
@@ -92,7 +140,7 @@ IMPORT_JOB_FAILURE_NDJSON_SCHEMA = {
 }
 
 
-class RawImageUploadSession(UUIDModel):
+class RawImageUploadSession(StatusCountersMixin, UUIDModel):
     """
     A session keeps track of uploaded files and forms the basis of a processing
     task that tries to make sense of the uploaded files to form normalized
@@ -649,11 +697,102 @@ class Image(UUIDModel):
                     f"No mhd or mha file found for image {self.name} (pk: {self.pk})"
                 )
 
-        if not header_file.file.storage.exists(name=header_file.file.name):
-            raise FileNotFoundError(f"No file found for {header_file.file}")
-
         return header_file, image_data_file
 
+    @property
+    def metaimage_header(self) -> dict[str, str]:
+        """
+        Return the header of the MHA/MHD file that belongs to this image,
+        without downloading the voxel data.
+
+        Returns
+        -------
+            The header of the MHA/MHD file as key value pairs
+        """
+        header_file, _ = self._metaimage_files
+        header, _ = header_file.read_metaimage_header()
+        return header
+
+    def iter_voxel_chunks(self):
+        """
+        Stream the voxel values of the MHA/MHD image from storage.
+
+        The values are yielded in chunks as flat NumPy arrays in file
+        order, with the channels interleaved, so that the full volume
+        never has to be held in memory.
+        """
+        header_file, image_data_file = self._metaimage_files
+        header, data_offset = header_file.read_metaimage_header()
+
+        if image_data_file is None:
+            if header.get("ElementDataFile") != "LOCAL":
+                raise ValueError("The MHA file does not contain its data")
+        else:
+            header_file, data_offset = image_data_file, 0
+
+        dtype = get_metaimage_dtype(header=header)
+
+        if header.get("CompressedData", "False") == "True":
+            # Accept both zlib and gzip streams
+            decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        else:
+            decompressor = None
+
+        remainder = b""
+
+        for chunk in header_file.iter_chunks(start=data_offset):
+            if decompressor is not None:
+                chunk = decompressor.decompress(chunk)
+
+            chunk = remainder + chunk
+            end = len(chunk) - len(chunk) % dtype.itemsize
+            remainder = chunk[end:]
+
+            if end:
+                yield np.frombuffer(chunk[:end], dtype=dtype)
+
+    def get_segments(self) -> frozenset[int] | None:
+        """
+        Determine the segments of the MHA/MHD image in the same way as
+        panimg, streaming the voxel values rather than loading the image.
+
+        Returns
+        -------
+            The unique voxel values, or the 1-indexed volumes of a 4D
+            segmentation, or None if the image is not a segmentation
+        """
+        header = self.metaimage_header
+
+        if int(header.get("ElementNumberOfChannels", 1)) != 1 or (
+            header.get("ElementType") not in METAIMAGE_MASK_ELEMENT_TYPES
+        ):
+            # Only single channel, 8 bit images should be checked.
+            # Everything else is not a segmentation
+            return None
+
+        is_4d = int(header["NDims"]) == 4
+        segments = set()
+
+        for chunk in self.iter_voxel_chunks():
+            segments.update(np.unique(chunk).tolist())
+
+            if is_4d and not segments.issubset({0, 1}):
+                # 4D Segmentations must only have values 0 and 1
+                # as the 4th dimension encodes the overlay type
+                return None
+            elif len(segments) > MAXIMUM_SEGMENTS_LENGTH:
+                return None
+
+        if is_4d:
+            # Use 1-indexing for each segmentation
+            n_volumes = int(header["DimSize"].split()[3])
+            segments = {idx + 1 for idx in range(n_volumes)}
+
+        if len(segments) <= MAXIMUM_SEGMENTS_LENGTH:
+            return frozenset(segments)
+        else:
+            return None
+
     @property
     def sitk_image(self):
         """
@@ -669,13 +808,10 @@ class Image(UUIDModel):
         """
         files = [i for i in self._metaimage_files if i is not None]
 
-        file_size = 0
-        for file in files:
-            if not file.file.storage.exists(name=file.file.name):
-                raise FileNotFoundError(f"No file found for {file.file}")
-
-            # Add up file sizes of mhd and raw file to get total file size
-            file_size += file.file.size
+        # Add up file sizes of mhd and raw file to get total file size
+        file_size = sum(
+            file.size_in_storage or file.file.size for file in files
+        )
 
         # Check file size to guard for out of memory error
         if file_size > settings.MAX_SITK_FILE_SIZE:
@@ -685,16 +821,10 @@ class Image(UUIDModel):
 
         with TemporaryDirectory() as tempdirname:
             for file in files:
-                with (
-                    file.file.open("rb") as infile,
-                    open(
-                        Path(tempdirname) / Path(file.file.name).name, "wb"
-                    ) as outfile,
-                ):
-                    buffer = True
-                    while buffer:
-                        buffer = infile.read(1024)
-                        outfile.write(buffer)
+                with open(
+                    Path(tempdirname) / Path(file.file.name).name, "wb"
+                ) as outfile:
+                    file.download_fileobj(fileobj=outfile)
 
             try:
                 hdr_path = Path(tempdirname) / Path(files[0].file.name).name
@@ -941,6 +1071,37 @@ class ImageFile(FieldChangeMixin, UUIDModel):
 
         super().save(*args, **kwargs)
 
+    def save_files(self):
+        """
+        Saves the files of a new image file to storage, as is done by save,
+        so that the image file can then be bulk created.
+        """
+        if not self._state.adding:
+            raise RuntimeError("Files can only be saved for new image files")
+
+        if self._directory is not None:
+            self.save_directory()
+
+        self.update_size_in_storage()
+
+        if not self.file._committed:
+            self.file.save(self.file.name, self.file.file, save=False)
+
+    def delete_files(self):
+        """
+        Deletes the files saved by save_files, for when the image file
+        could not be created.
+        """
+        if self._directory is not None:
+            for file in self._directory.rglob("**/*"):
+                if file.is_file():
+                    self.file.field.storage.delete(
+                        name=self._directory_file_destination(file=file)
+                    )
+
+        if self.file and self.file._committed:
+            self.file.storage.delete(name=self.file.name)
+
     def _directory_file_destination(self, *, file):
         base = self.file.field.upload_to(
             instance=self, filename=f"{self._directory.stem}"
@@ -964,6 +1125,73 @@ class ImageFile(FieldChangeMixin, UUIDModel):
                     name=self._directory_file_destination(file=file), content=f
                 )
 
+    def _get_object(self, **kwargs):
+        try:
+            return self.file.storage.connection.meta.client.get_object(
+                Bucket=self.file.storage.bucket.name,
+                Key=self.file.name,
+                **kwargs,
+            )
+        except ClientError as error:
+            raise_for_missing_object(error=error, file=self.file)
+            raise
+
+    def download_fileobj(self, *, fileobj):
+        """Downloads the file using concurrent ranged requests"""
+        try:
+            self.file.storage.connection.meta.client.download_fileobj(
+                Bucket=self.file.storage.bucket.name,
+                Key=self.file.name,
+                Fileobj=fileobj,
+            )
+        except ClientError as error:
+            raise_for_missing_object(error=error, file=self.file)
+            raise
+
+    def iter_chunks(self, *, start=0):
+        """Streams the file from the given byte offset in large chunks"""
+        kwargs = {"Range": f"bytes={start}-"} if start else {}
+        response = self._get_object(**kwargs)
+        yield from response["Body"].iter_chunks(
+            chunk_size=STORAGE_READ_CHUNK_SIZE
+        )
+
+    def read_metaimage_header(self) -> tuple[dict[str, str], int]:
+        """
+        Reads the MetaImage header at the start of this file with ranged
+        requests, so that the voxel data is not downloaded.
+
+        Returns
+        -------
+            The parsed header and the byte offset of the data that follows it
+        """
+        content = b""
+        object_size = None
+
+        while object_size is None or len(content) < object_size:
+            if len(content) >= METAIMAGE_MAX_HEADER_SIZE:
+                raise ValueError("The MetaImage header is too large")
+
+            response = self._get_object(
+                Range=(
+                    f"bytes={len(content)}-"
+                    f"{len(content) + METAIMAGE_HEADER_CHUNK_SIZE - 1}"
+                )
+            )
+            object_size = int(response["ContentRange"].split("/")[-1])
+            content += response["Body"].read()
+
+            if match := METAIMAGE_DATA_FILE_LINE.search(content):
+                content = content[: match.end()]
+                break
+
+        with TemporaryDirectory() as tempdirname:
+            header_path = Path(tempdirname) / "header.mhd"
+            header_path.write_bytes(content)
+            header = parse_mh_header(header_path)
+
+        return header, len(content)
+
     def update_size_in_storage(self):
         if not self.file:
             self.size_in_storage = 0
@@ -1007,7 +1235,7 @@ class PostProcessImageTaskStatusChoices(models.TextChoices):
     COMPLETED = "COMPLETED", _("Completed")
 
 
-class PostProcessImageTask(UUIDModel):
+class PostProcessImageTask(StatusCountersMixin, UUIDModel):
     image = models.OneToOneField(
         to=Image,
         on_delete=models.CASCADE,
@@ -1,16 +1,19 @@
 import re
 import zipfile
 from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from shutil import rmtree
 from tempfile import TemporaryDirectory
+from time import perf_counter
 
 import boto3
 import botocore.exceptions
 from billiard.exceptions import SoftTimeLimitExceeded, TimeLimitExceeded
 from botocore.exceptions import ClientError
-from celery import signature
+from celery import group, signature
 from celery.utils.log import get_task_logger
 from django.apps import apps
 from django.conf import settings
@@ -43,11 +46,19 @@ from grandchallenge.core.celery import (
     acks_late_micro_short_task,
 )
 from grandchallenge.core.exceptions import LockNotAcquiredException
+from grandchallenge.core.metrics import observe
 from grandchallenge.core.utils.query import check_lock_acquired
 from grandchallenge.uploads.models import UserUpload
 
 logger = get_task_logger(__name__)
 
+IMAGE_FILE_UPLOAD_CONCURRENCY = 8
+USER_UPLOAD_DOWNLOAD_CONCURRENCY = 8
+
+# Local file header and end of central directory (empty archive)
+# signatures, anything else is left for the image builders
+ZIP_MAGIC_NUMBERS = (b"PK\x03\x04", b"PK\x05\x06")
+
 POST_PROCESSORS = [
     import_string(p) for p in settings.CASES_POST_PROCESSORS if p
 ]
@@ -57,28 +68,71 @@ class DuplicateFilesException(ValueError):
     pass
 
 
+@contextmanager
+def _log_duration(*, stage):
+    start = perf_counter()
+
+    try:
+        yield
+    finally:
+        duration = perf_counter() - start
+        logger.info(f"{stage} took {duration:.3f} seconds")
+        observe("ImageImportStageDuration", value=duration, Stage=stage)
+
+
 def _populate_tmp_dir(tmp_dir, upload_session):
     session_files = [*upload_session.user_uploads.all()]
 
-    populate_provisioning_directory(session_files, tmp_dir)
-    extract_files(source_path=tmp_dir)
+    with _log_duration(stage="Provisioning"):
+        download_and_extract_uploads(session_files, tmp_dir)
 
 
-def populate_provisioning_directory(
+def download_and_extract_uploads(
     input_files: Sequence[UserUpload], provisioning_dir: Path
 ):
     """
     Provisions provisioning_dir with the files associated using the given
-    list of uploaded files.
+    list of uploaded files, extracting any zip files.
+
+    The files are downloaded concurrently, each with multipart ranged
+    requests, and extracted as soon as they have been downloaded.
+    Duplicate filenames are rejected before anything is downloaded.
     """
+    destinations = {}
+
     for input_file in input_files:
         dest = Path(safe_join(provisioning_dir, input_file.filename))
 
-        if dest.exists():
+        if dest.exists() or dest in destinations:
             raise DuplicateFilesException("Duplicate files uploaded")
 
-        with open(dest, "wb") as f:
-            input_file.download_fileobj(fileobj=f)
+        destinations[dest] = input_file
+
+    with ThreadPoolExecutor(
+        max_workers=USER_UPLOAD_DOWNLOAD_CONCURRENCY
+    ) as executor:
+        futures = [
+            executor.submit(_download_and_extract, input_file=f, dest=d)
+            for d, f in destinations.items()
+        ]
+
+        for future in futures:
+            future.result()
+
+
+def _download_and_extract(*, input_file: UserUpload, dest: Path):
+    with open(dest, "wb") as f:
+        input_file.download_fileobj(fileobj=f)
+
+    check_compressed_and_extract(src_path=dest, checked_paths=set())
+
+
+def _is_zip_file(*, path: Path):
+    if not path.is_file():
+        return False
+
+    with open(path, "rb") as f:
+        return f.read(4) in ZIP_MAGIC_NUMBERS
 
 
 def check_compressed_and_extract(*, src_path: Path, checked_paths: set[Path]):
@@ -88,6 +142,9 @@ def check_compressed_and_extract(*, src_path: Path, checked_paths: set[Path]):
 
     checked_paths.add(src_path)
 
+    if not _is_zip_file(path=src_path):
+        return
+
     extracted_dir = src_path.parent / f"{src_path.name}_extracted"
     extracted_dir.mkdir()
 
@@ -323,13 +380,14 @@ def import_images(
 
     """
     with TemporaryDirectory() as output_directory:
-        panimg_result = convert(
-            input_directory=input_directory,
-            output_directory=output_directory,
-            builders=builders,
-            post_processors=[],  # Do the post-processing later
-            recurse_subdirectories=recurse_subdirectories,
-        )
+        with _log_duration(stage="Converting images"):
+            panimg_result = convert(
+                input_directory=input_directory,
+                output_directory=output_directory,
+                builders=builders,
+                post_processors=[],  # Do the post-processing later
+                recurse_subdirectories=recurse_subdirectories,
+            )
 
         _check_all_ids(panimg_result=panimg_result)
 
@@ -338,11 +396,12 @@ def import_images(
             new_image_files=panimg_result.new_image_files,
         )
 
-        _store_images(
-            origin=origin,
-            images=django_result.new_images,
-            image_files=django_result.new_image_files,
-        )
+        with _log_duration(stage="Storing images"):
+            _store_images(
+                origin=origin,
+                images=django_result.new_images,
+                image_files=django_result.new_image_files,
+            )
 
         post_process_image_ids = {
             f.image.pk
@@ -350,10 +409,7 @@ def import_images(
             if f.image_type == ImageFile.IMAGE_TYPE_TIFF
         }
 
-        for image_id in post_process_image_ids:
-            task = PostProcessImageTask(image_id=image_id)
-            task.full_clean()
-            task.save()
+        _create_post_process_image_tasks(image_ids=post_process_image_ids)
 
     return ImporterResult(
         new_images=django_result.new_images,
@@ -419,14 +475,67 @@ def _store_images(
     images: set[Image],
     image_files: set[ImageFile],
 ):
+    images_by_pk = {image.pk: image for image in images}
+
     for image in images:
         image.origin = origin
-        image.full_clean()
-        image.save()
+        # Uniqueness, constraints and the origin are checked by the
+        # database on insert, saving a query per image
+        image.full_clean(
+            exclude=["origin"],
+            validate_unique=False,
+            validate_constraints=False,
+        )
 
     for obj in image_files:
-        obj.full_clean()
-        obj.save()
+        # Avoids a query per file when generating the file path
+        obj.image = images_by_pk[obj.image_id]
+        obj.full_clean(
+            exclude=["image"],
+            validate_unique=False,
+            validate_constraints=False,
+        )
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=IMAGE_FILE_UPLOAD_CONCURRENCY
+        ) as executor:
+            # The storage connections are thread local so the files
+            # can be uploaded concurrently
+            futures = [executor.submit(obj.save_files) for obj in image_files]
+
+            for future in futures:
+                future.result()
+
+        # Use a savepoint so that the outer transaction remains usable
+        # for reporting the error if the inserts fail
+        with transaction.atomic():
+            Image.objects.bulk_create(images)
+            ImageFile.objects.bulk_create(image_files)
+    except Exception:
+        # Nothing references the uploaded files if the image files
+        # were not created
+        for obj in image_files:
+            obj.delete_files()
+        raise
+
+
+def _create_post_process_image_tasks(*, image_ids):
+    tasks = PostProcessImageTask.objects.bulk_create(
+        [PostProcessImageTask(image_id=image_id) for image_id in image_ids]
+    )
+    PostProcessImageTask.update_status_counters_for_created(objs=tasks)
+
+    if tasks:
+        # bulk_create does not call save, which schedules the task
+        on_commit(
+            group(
+                execute_post_process_image_task.signature(
+                    kwargs={"post_process_image_task_pk": task.pk}
+                )
+                for task in tasks
+            ).apply_async
+        )
 
 
 def _handle_raw_files(
@@ -1,5 +1,10 @@
+from collections import Counter
+from datetime import timedelta
+
 from django.contrib.auth.models import Permission
-from django.db.models import Sum
+from django.db import transaction
+from django.db.models import Avg, F, Sum, Value
+from django.db.models.functions import Greatest
 
 from grandchallenge.algorithms.models import (
     AlgorithmImage,
@@ -7,11 +12,13 @@ from grandchallenge.algorithms.models import (
     Job,
 )
 from grandchallenge.cases.models import ImageFile
+from grandchallenge.challenges.models import Challenge
 from grandchallenge.components.models import ComponentInterfaceValue
 from grandchallenge.evaluation.models import (
     Evaluation,
     EvaluationGroundTruth,
     Method,
+    Phase,
 )
 from grandchallenge.utilization.models import (
     EvaluationUtilization,
@@ -20,68 +27,92 @@ from grandchallenge.utilization.models import (
 )
 
 
-def annotate_compute_costs(*, challenge):
-    algorithm_job_utilizations = JobUtilization.objects.filter(
-        challenge=challenge
-    )
-    job_warm_pool_utilizations = JobWarmPoolUtilization.objects.filter(
-        challenge=challenge
-    )
-    evaluation_job_utilizations = EvaluationUtilization.objects.filter(
-        challenge=challenge
-    )
-
-    update_compute_cost_euro_millicents(
-        obj=challenge,
-        algorithm_job_utilizations=algorithm_job_utilizations,
-        job_warm_pool_utilizations=job_warm_pool_utilizations,
-        evaluation_job_utilizations=evaluation_job_utilizations,
-    )
-
-
-def annotate_job_duration_and_compute_costs(*, phase):
-    algorithm_job_utilizations = JobUtilization.objects.filter(phase=phase)
-    job_warm_pool_utilizations = JobWarmPoolUtilization.objects.filter(
-        phase=phase
-    )
-    evaluation_job_utilizations = EvaluationUtilization.objects.filter(
-        phase=phase, external_evaluation=False
-    )
-
-    phase.average_algorithm_job_duration = algorithm_job_utilizations.filter(
-        job__status=Job.SUCCESS
-    ).average_duration()
-
-    update_compute_cost_euro_millicents(
-        obj=phase,
-        algorithm_job_utilizations=algorithm_job_utilizations,
-        job_warm_pool_utilizations=job_warm_pool_utilizations,
-        evaluation_job_utilizations=evaluation_job_utilizations,
-    )
-
+def get_compute_costs(*, group_by, pks=None):
+    """
+    Sum the compute costs of all utilizations grouped by the challenge
+    or phase, using a single query per utilization table.
 
-def update_compute_cost_euro_millicents(
-    *,
-    obj,
-    algorithm_job_utilizations,
-    job_warm_pool_utilizations,
-    evaluation_job_utilizations,
-):
-    algorithm_job_costs = algorithm_job_utilizations.aggregate(
-        Sum("compute_cost_euro_millicents")
-    )
-    job_warm_pool_costs = job_warm_pool_utilizations.aggregate(
-        Sum("compute_cost_euro_millicents")
-    )
-    evaluation_costs = evaluation_job_utilizations.aggregate(
-        Sum("compute_cost_euro_millicents")
-    )
+    If pks is given only the costs of those challenges or phases are
+    summed.
+    """
+    querysets = [
+        JobUtilization.objects.all(),
+        JobWarmPoolUtilization.objects.all(),
+        EvaluationUtilization.objects.all(),
+    ]
 
-    items = [algorithm_job_costs, job_warm_pool_costs, evaluation_costs]
+    if group_by == "phase":
+        # External evaluations are not attributed to the phase
+        querysets[2] = querysets[2].filter(external_evaluation=False)
+
+    if pks is not None:
+        querysets = [
+            queryset.filter(**{f"{group_by}__in": pks})
+            for queryset in querysets
+        ]
+
+    costs = Counter()
+
+    for queryset in querysets:
+        for row in (
+            queryset.exclude(**{group_by: None})
+            .values(group_by)
+            .order_by()
+            .annotate(total=Sum("compute_cost_euro_millicents"))
+        ):
+            costs[row[group_by]] += row["total"] or 0
+
+    return costs
+
+
+def get_average_algorithm_job_durations():
+    return {
+        row["phase"]: row["duration__avg"]
+        for row in JobUtilization.objects.filter(
+            phase__isnull=False,
+            job__status=Job.SUCCESS,
+            duration__gt=timedelta(seconds=0),
+        )
+        .values("phase")
+        .order_by()
+        .annotate(Avg("duration"))
+    }
+
+
+@transaction.atomic
+def apply_compute_cost_deltas(*, challenge_deltas, phase_deltas):
+    """
+    Apply changes in compute costs to the running totals of the challenges
+    and phases, sending any budget alerts for the challenges.
+    """
+    # Serialise concurrent updates to the same challenges, the
+    # annotated queryset below cannot be locked as it is grouped
+    list(
+        Challenge.objects.select_for_update(no_key=True)
+        .filter(pk__in=challenge_deltas)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    for challenge in Challenge.objects.with_available_compute().filter(
+        pk__in=challenge_deltas
+    ):
+        challenge.compute_cost_euro_millicents = max(
+            challenge.compute_cost_euro_millicents
+            + challenge_deltas[challenge.pk],
+            0,
+        )
+        Challenge.objects.filter(pk=challenge.pk).update(
+            compute_cost_euro_millicents=challenge.compute_cost_euro_millicents
+        )
+        challenge.send_alert_if_budget_consumed_warning_threshold_exceeded()
 
-    obj.compute_cost_euro_millicents = sum(
-        item["compute_cost_euro_millicents__sum"] or 0 for item in items
-    )
+    for pk, delta in phase_deltas.items():
+        Phase.objects.filter(pk=pk).update(
+            compute_cost_euro_millicents=Greatest(
+                F("compute_cost_euro_millicents") + delta, Value(0)
+            )
+        )
 
 
 def annotate_storage_size(*, challenge):
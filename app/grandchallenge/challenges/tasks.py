@@ -3,6 +3,7 @@ import random
 import time
 from typing import NamedTuple
 
+from celery.utils.log import get_task_logger
 from django.contrib.auth import get_user_model
 from django.db import transaction
 from django.db.models import Count, Max, Min, Q
@@ -10,9 +11,9 @@ from django.utils.timezone import datetime
 from psycopg.errors import LockNotAvailable
 
 from grandchallenge.challenges.costs import (
-    annotate_compute_costs,
-    annotate_job_duration_and_compute_costs,
     annotate_storage_size,
+    get_average_algorithm_job_durations,
+    get_compute_costs,
 )
 from grandchallenge.challenges.emails import (
     send_onboarding_task_due_reminder,
@@ -26,6 +27,10 @@ from grandchallenge.core.celery import (
 )
 from grandchallenge.evaluation.models import Evaluation, Phase
 
+logger = get_task_logger(__name__)
+
+COMPUTE_COSTS_UPDATE_BATCH_SIZE = 500
+
 
 @acks_late_2xlarge_task
 def update_challenge_results_cache():
@@ -96,31 +101,128 @@ def retry_with_backoff(exceptions, max_attempts=5, base_delay=1, max_delay=10):
 
 @acks_late_2xlarge_task
 def update_challenge_compute_costs():
-    for challenge in Challenge.objects.with_available_compute().iterator():
-        with transaction.atomic():
-            annotate_compute_costs(challenge=challenge)
+    """
+    Reconciles the running compute costs of the challenges and phases with
+    their utilizations, and updates the average algorithm job durations.
+
+    The compute costs are kept up to date as the utilizations change, so
+    any difference found here is logged as drift. Everything is calculated
+    with grouped queries. The costs of the drifted objects are then
+    recalculated with their rows locked, so that the changes applied by
+    the utilizations in the meantime are not overwritten.
+    """
+    challenge_costs = get_compute_costs(group_by="challenge")
+    phase_costs = get_compute_costs(group_by="phase")
+    average_durations = get_average_algorithm_job_durations()
+
+    for pk, compute_cost_euro_millicents in Challenge.objects.values_list(
+        "pk", "compute_cost_euro_millicents"
+    ):
+        if compute_cost_euro_millicents != challenge_costs[pk]:
+            _reconcile_challenge_compute_costs(pk=pk)
+
+    changed_phases = []
+
+    for (
+        pk,
+        compute_cost_euro_millicents,
+        average_algorithm_job_duration,
+    ) in Phase.objects.prefetch_related(None).values_list(
+        "pk", "compute_cost_euro_millicents", "average_algorithm_job_duration"
+    ):
+        if compute_cost_euro_millicents != phase_costs[pk]:
+            _reconcile_phase_compute_costs(pk=pk)
+
+        if average_algorithm_job_duration != average_durations.get(pk):
+            changed_phases.append(
+                Phase(
+                    pk=pk,
+                    average_algorithm_job_duration=average_durations.get(pk),
+                )
+            )
 
-            @retry_with_backoff((LockNotAvailable,))
-            def save_challenge():
-                challenge.save(update_fields=("compute_cost_euro_millicents",))
+    _bulk_update_in_batches(
+        model=Phase,
+        objs=changed_phases,
+        fields=["average_algorithm_job_duration"],
+    )
 
-            save_challenge()
 
-    for phase in Phase.objects.iterator():
-        with transaction.atomic():
-            annotate_job_duration_and_compute_costs(phase=phase)
+@retry_with_backoff((LockNotAvailable,))
+@transaction.atomic
+def _reconcile_challenge_compute_costs(*, pk):
+    # Lock the row first as the annotated queryset below cannot be
+    # locked, this serialises the reconciliation with the deltas
+    (
+        Challenge.objects.select_for_update(no_key=True)
+        .filter(pk=pk)
+        .values_list("pk", flat=True)
+        .get()
+    )
 
-            @retry_with_backoff((LockNotAvailable,))
-            def save_phase():
-                phase.save(
-                    skip_calculate_ranks=True,
-                    update_fields=(
-                        "average_algorithm_job_duration",
-                        "compute_cost_euro_millicents",
-                    ),
+    challenge = (
+        Challenge.objects.with_available_compute()
+        .only(
+            "pk",
+            "short_name",
+            "hidden",
+            "compute_cost_euro_millicents",
+            "percent_budget_consumed_warning_thresholds",
+        )
+        .get(pk=pk)
+    )
+    challenge.compute_cost_euro_millicents = get_compute_costs(
+        group_by="challenge", pks=[pk]
+    )[pk]
+
+    if challenge.has_changed("compute_cost_euro_millicents"):
+        logger.warning(
+            f"Compute costs of challenge {challenge.pk} drifted from "
+            f"{challenge.initial_value('compute_cost_euro_millicents')} "
+            f"to {challenge.compute_cost_euro_millicents}"
+        )
+        Challenge.objects.filter(pk=pk).update(
+            compute_cost_euro_millicents=challenge.compute_cost_euro_millicents
+        )
+        challenge.send_alert_if_budget_consumed_warning_threshold_exceeded()
+
+
+@retry_with_backoff((LockNotAvailable,))
+@transaction.atomic
+def _reconcile_phase_compute_costs(*, pk):
+    previous_cost = (
+        Phase.objects.prefetch_related(None)
+        .select_for_update(no_key=True)
+        .filter(pk=pk)
+        .values_list("compute_cost_euro_millicents", flat=True)
+        .get()
+    )
+    compute_cost_euro_millicents = get_compute_costs(
+        group_by="phase", pks=[pk]
+    )[pk]
+
+    if previous_cost != compute_cost_euro_millicents:
+        logger.warning(
+            f"Compute costs of phase {pk} drifted from {previous_cost} "
+            f"to {compute_cost_euro_millicents}"
+        )
+        Phase.objects.filter(pk=pk).update(
+            compute_cost_euro_millicents=compute_cost_euro_millicents
+        )
+
+
+def _bulk_update_in_batches(*, model, objs, fields):
+    for idx in range(0, len(objs), COMPUTE_COSTS_UPDATE_BATCH_SIZE):
+
+        @retry_with_backoff((LockNotAvailable,))
+        def update_batch():
+            with transaction.atomic():
+                model.objects.bulk_update(
+                    objs[idx : idx + COMPUTE_COSTS_UPDATE_BATCH_SIZE],
+                    fields,
                 )
 
-            save_phase()
+        update_batch()
 
 
 @acks_late_2xlarge_task
@@ -1,8 +1,10 @@
 import logging
 import re
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from json import JSONDecodeError
+from threading import Lock
 from typing import NamedTuple
 
 import boto3
@@ -11,7 +13,11 @@ from django.conf import settings
 from django.db.models import TextChoices
 from django.utils.functional import cached_property
 
-from grandchallenge.components.backends.base import Executor, JobParams
+from grandchallenge.components.backends.base import (
+    Executor,
+    JobParams,
+    create_boto3_client,
+)
 from grandchallenge.components.backends.exceptions import (
     ComponentException,
     RetryStep,
@@ -31,6 +37,23 @@ from grandchallenge.evaluation.utils import get
 logger = logging.getLogger(__name__)
 
 
+_SAGEMAKER_CLIENTS = {}
+_SAGEMAKER_CLIENTS_LOCK = Lock()
+
+
+def get_sagemaker_client(*, region_name):
+    """
+    Returns a SageMaker client for the region that is shared between
+    executors, boto3 clients are thread safe but creating them is not.
+    """
+    with _SAGEMAKER_CLIENTS_LOCK:
+        if region_name not in _SAGEMAKER_CLIENTS:
+            _SAGEMAKER_CLIENTS[region_name] = boto3.client(
+                "sagemaker", region_name=region_name
+            )
+        return _SAGEMAKER_CLIENTS[region_name]
+
+
 class LogStreamNotFound(Exception):
     """Raised when a log stream could not be found"""
 
@@ -389,16 +412,15 @@ class AmazonSageMakerBaseExecutor(Executor, ABC):
     @property
     def _sagemaker_client(self):
         if self.__sagemaker_client is None:
-            self.__sagemaker_client = boto3.client(
-                "sagemaker",
-                region_name=settings.COMPONENTS_AMAZON_ECR_REGION,
+            self.__sagemaker_client = get_sagemaker_client(
+                region_name=settings.COMPONENTS_AMAZON_ECR_REGION
             )
         return self.__sagemaker_client
 
     @property
     def _logs_client(self):
         if self.__logs_client is None:
-            self.__logs_client = boto3.client(
+            self.__logs_client = create_boto3_client(
                 "logs", region_name=settings.COMPONENTS_AMAZON_ECR_REGION
             )
         return self.__logs_client
@@ -406,7 +428,7 @@ class AmazonSageMakerBaseExecutor(Executor, ABC):
     @property
     def _cloudwatch_client(self):
         if self.__cloudwatch_client is None:
-            self.__cloudwatch_client = boto3.client(
+            self.__cloudwatch_client = create_boto3_client(
                 "cloudwatch",
                 region_name=settings.COMPONENTS_AMAZON_ECR_REGION,
             )
@@ -495,8 +517,7 @@ class AmazonSageMakerBaseExecutor(Executor, ABC):
         job_status = self._get_job_status(event=event)
 
         self._set_duration(event=event)
-        self._set_task_logs(event=event)
-        self._set_runtime_metrics(event=event)
+        self._set_task_logs_and_runtime_metrics(event=event)
 
         if job_status == "Completed":
             self._handle_completed_job()
@@ -561,40 +582,82 @@ class AmazonSageMakerBaseExecutor(Executor, ABC):
         else:
             raise LogStreamNotFound("Log stream not found")
 
+    def _set_task_logs_and_runtime_metrics(self, *, event):
+        """
+        Fetches the logs and metrics of the job concurrently
+
+        These are independent requests to CloudWatch Logs and CloudWatch
+        Metrics, so the slowest of the two determines the latency.
+        """
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [
+                pool.submit(self._set_task_logs, event=event),
+                pool.submit(self._set_runtime_metrics, event=event),
+            ]
+
+        for future in futures:
+            future.result()
+
     def _set_task_logs(self, *, event):
         stdout = []
         stderr = []
 
-        for log_event in self._get_log_events(event=event):
-            try:
-                parsed_log = parse_structured_log(
-                    log=log_event["message"].replace("\x00", "")
-                )
-                timestamp = ms_timestamp_to_datetime(log_event["timestamp"])
-            except (JSONDecodeError, KeyError, ValueError):
-                logger.warning("Could not parse log")
-                continue
-
-            if parsed_log is not None:
-                output = f"{timestamp.isoformat()} {parsed_log.message}"
-                if parsed_log.source == SourceChoices.STDOUT:
-                    stdout.append(output)
-                elif parsed_log.source == SourceChoices.STDERR:
-                    stderr.append(output)
+        for log_events in self._get_log_event_pages(event=event):
+            page_stdout = []
+            page_stderr = []
+
+            for log_event in log_events:
+                parsed_log_event = self._parse_log_event(log_event=log_event)
+
+                if parsed_log_event is None:
+                    continue
+
+                source, output = parsed_log_event
+
+                if source == SourceChoices.STDOUT:
+                    page_stdout.append(output)
+                elif source == SourceChoices.STDERR:
+                    page_stderr.append(output)
                 else:
                     logger.error("Invalid source")
 
+            # Prepend as the pages are fetched backwards
+            stdout = page_stdout + stdout
+            stderr = page_stderr + stderr
+
+            if len(stdout) >= LOGLINES and len(stderr) >= LOGLINES:
+                # Older events would be truncated anyway
+                break
+
         self._stdout = stdout[-LOGLINES:] if len(stdout) > LOGLINES else stdout
         self._stderr = stderr[-LOGLINES:] if len(stderr) > LOGLINES else stderr
 
-    def _get_log_events(self, *, event):
-        log_events = []
+    @staticmethod
+    def _parse_log_event(*, log_event):
+        try:
+            parsed_log = parse_structured_log(
+                log=log_event["message"].replace("\x00", "")
+            )
+            timestamp = ms_timestamp_to_datetime(log_event["timestamp"])
+        except (JSONDecodeError, KeyError, ValueError):
+            logger.warning("Could not parse log")
+            return None
+
+        if parsed_log is None:
+            return None
+        else:
+            return (
+                parsed_log.source,
+                f"{timestamp.isoformat()} {parsed_log.message}",
+            )
 
+    def _get_log_event_pages(self, *, event):
+        """Yields the pages of log events, starting with the most recent"""
         try:
             log_stream_name = self._get_log_stream_name(data_log=False)
         except LogStreamNotFound as error:
             logger.warning(str(error))
-            return log_events
+            return
 
         n_calls = 0
         next_token = None
@@ -614,9 +677,10 @@ class AmazonSageMakerBaseExecutor(Executor, ABC):
             response = self._logs_client.get_log_events(**call_args)
             n_calls += 1
 
-            # Prepend the new events as we are working backwards with
-            # nextBackwardToken and startFromHead = False
-            log_events = response["events"] + log_events
+            # Working backwards with nextBackwardToken
+            # and startFromHead = False
+            yield response["events"]
+
             new_token = response["nextBackwardToken"]
 
             if new_token == next_token:
@@ -624,8 +688,6 @@ class AmazonSageMakerBaseExecutor(Executor, ABC):
             else:
                 next_token = new_token
 
-        return log_events
-
     def _set_runtime_metrics(self, *, event):
         try:
             started = ms_timestamp_to_datetime(
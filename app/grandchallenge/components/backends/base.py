@@ -9,11 +9,13 @@ import logging
 import os
 import secrets
 from abc import ABC, abstractmethod
+from contextlib import ExitStack
 from datetime import timedelta
 from json import JSONDecodeError
 from math import ceil
 from pathlib import Path
 from tempfile import SpooledTemporaryFile, TemporaryDirectory
+from threading import Lock
 from typing import NamedTuple
 from uuid import UUID
 
@@ -30,8 +32,9 @@ from django.core.exceptions import SuspiciousFileOperation, ValidationError
 from django.db import transaction
 from django.utils._os import safe_join
 from django.utils.functional import cached_property
+from django.utils.timezone import now
 from panimg.image_builders import image_builder_mhd, image_builder_tiff
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from pydantic_core import to_json
 
 from grandchallenge.cases.tasks import import_images
@@ -49,6 +52,7 @@ from grandchallenge.components.schemas import GPUTypeChoices
 from grandchallenge.components.serializers import (
     ComponentInterfaceValueSerializer,
 )
+from grandchallenge.core.metrics import increment
 from grandchallenge.core.utils.error_messages import (
     format_validation_error_message,
 )
@@ -66,6 +70,22 @@ S3_CHUNK_SIZE = 5 * settings.MEGABYTE
 ASYNC_CONCURRENCY = 50
 ASYNC_BOTO_CONFIG = Config(max_pool_connections=120)
 
+# Inputs shared between jobs are stored under this prefix
+# in the input bucket when the input cache is enabled
+INPUT_CACHE_PREFIX = "/inputs-cache"
+
+
+_BOTO3_CLIENT_LOCK = Lock()
+
+
+def create_boto3_client(*args, **kwargs):
+    """
+    Creates a boto3 client with the default session, boto3 clients are
+    thread safe but creating them is not.
+    """
+    with _BOTO3_CLIENT_LOCK:
+        return boto3.client(*args, **kwargs)
+
 
 class JobParams(NamedTuple):
     app_label: str
@@ -77,6 +97,13 @@ class JobParams(NamedTuple):
 class CIVProvisioningTask(NamedTuple):
     key: str
     task: functools.partial
+    # Where the input is stored if it is not under key
+    cache_key: str | None = None
+
+
+class OutputDownload(NamedTuple):
+    destination: str | io.IOBase
+    task: functools.partial
 
 
 def duration_to_millicents(*, duration, usd_cents_per_hour):
@@ -174,6 +201,47 @@ def list_and_delete_objects_from_prefix(*, s3_client, bucket, prefix):
         )
 
 
+def delete_expired_objects_from_input_cache(*, s3_client):
+    """Deletes the cached inputs that have not been refreshed within the TTL"""
+    cutoff = now() - settings.COMPONENTS_INPUT_CACHE_TTL
+
+    paginator = s3_client.get_paginator("list_objects_v2")
+
+    page_iterator = paginator.paginate(
+        Bucket=settings.COMPONENTS_INPUT_BUCKET_NAME,
+        Prefix=(
+            INPUT_CACHE_PREFIX.lstrip("/")
+            if settings.USING_MINIO
+            else INPUT_CACHE_PREFIX
+        ),
+    )
+
+    total_deleted = 0
+
+    for page in page_iterator:
+        expired = [
+            {"Key": content["Key"]}
+            for content in page.get("Contents", [])
+            if content["LastModified"] < cutoff
+        ]
+
+        if expired:
+            # Pages contain at most 1000 objects, the delete_objects limit
+            response = s3_client.delete_objects(
+                Bucket=settings.COMPONENTS_INPUT_BUCKET_NAME,
+                Delete={"Objects": expired},
+            )
+
+            total_deleted += len(response.get("Deleted", []))
+
+            if errors := response.get("Errors"):
+                logger.error(
+                    f"Errors occurred while deleting: {len(errors)} failed deletions"
+                )
+
+    logger.info(f"Deleted {total_deleted} expired objects from input cache")
+
+
 async def s3_copy(
     *,
     source_bucket,
@@ -213,6 +281,198 @@ async def s3_upload_content(
             )
 
 
+async def s3_download_fileobj(
+    *,
+    bucket,
+    key,
+    fileobj,
+    semaphore,
+    s3_client,
+    httpx_client,  # Unused, but must be present to match signature
+):
+    async with semaphore:
+        await s3_client.download_fileobj(
+            Fileobj=fileobj,
+            Bucket=bucket,
+            Key=key,
+        )
+
+
+async def s3_download_file(
+    *,
+    bucket,
+    key,
+    filename,
+    semaphore,
+    s3_client,
+    httpx_client,  # Unused, but must be present to match signature
+):
+    async with semaphore:
+        await s3_client.download_file(
+            Filename=filename,
+            Bucket=bucket,
+            Key=key,
+        )
+
+
+async def s3_download_prefix(
+    *,
+    bucket,
+    prefix,
+    directory,
+    semaphore,
+    s3_client,
+    httpx_client,
+):
+    """
+    Downloads all objects under prefix to directory, returning the listing.
+
+    Nothing is downloaded if the listing is truncated or empty,
+    the caller is responsible for checking that.
+    """
+    async with semaphore:
+        response = await s3_client.list_objects_v2(
+            Bucket=bucket,
+            Prefix=(prefix.lstrip("/") if settings.USING_MINIO else prefix),
+        )
+
+    if response.get("IsTruncated", False):
+        return response
+
+    async with asyncio.TaskGroup() as task_group:
+        for file in response.get("Contents", []):
+            try:
+                root_key = safe_join("/", file["Key"])
+                dest = safe_join(directory, Path(root_key).relative_to(prefix))
+            except (SuspiciousFileOperation, ValueError):
+                logger.warning(f"Skipping {file=}")
+                continue
+
+            logger.info(f"Downloading {file['Key']} to {dest} from {bucket}")
+
+            Path(dest).parent.mkdir(parents=True, exist_ok=True)
+            task_group.create_task(
+                s3_download_file(
+                    bucket=bucket,
+                    key=file["Key"],
+                    filename=dest,
+                    semaphore=semaphore,
+                    s3_client=s3_client,
+                    httpx_client=httpx_client,
+                )
+            )
+
+    return response
+
+
+def _record_s3_request(*, model, parsed, **__):
+    increment("S3Requests", Operation=model.name)
+
+    if model.name == "GetObject":
+        increment(
+            "S3BytesDownloaded",
+            value=parsed.get("ContentLength", 0),
+            unit="Bytes",
+        )
+
+
+def _record_s3_upload(*, request, **__):
+    # The prepared request has the length of any kind of body, including
+    # the file objects and parts of managed and multipart uploads
+    increment(
+        "S3BytesUploaded",
+        value=int(request.headers.get("Content-Length", 0)),
+        unit="Bytes",
+    )
+
+
+async def run_s3_tasks(*, tasks, concurrency, return_exceptions=False):
+    """
+    Runs the tasks concurrently with shared clients, limiting the
+    number of concurrent requests to concurrency.
+
+    Returns the results of the tasks in order. If return_exceptions is
+    set the exceptions are returned in place of the results, otherwise
+    the first exception cancels the remaining tasks and is raised.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    session = aioboto3.Session()
+    timeout = httpx.Timeout(60.0)
+
+    async with session.client(
+        "s3",
+        endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+        config=ASYNC_BOTO_CONFIG,
+    ) as s3_client:
+        for operation in ("PutObject", "UploadPart"):
+            s3_client.meta.events.register(
+                f"before-send.s3.{operation}", _record_s3_upload
+            )
+        s3_client.meta.events.register("after-call.s3", _record_s3_request)
+
+        async with httpx.AsyncClient(timeout=timeout) as httpx_client:
+            coroutines = [
+                task(
+                    semaphore=semaphore,
+                    s3_client=s3_client,
+                    httpx_client=httpx_client,
+                )
+                for task in tasks
+            ]
+
+            if return_exceptions:
+                return await asyncio.gather(
+                    *coroutines, return_exceptions=True
+                )
+
+            async with asyncio.TaskGroup() as task_group:
+                futures = [
+                    task_group.create_task(coroutine)
+                    for coroutine in coroutines
+                ]
+
+            return [future.result() for future in futures]
+
+
+def raise_for_download_error(*, download_result):
+    if isinstance(download_result, BaseException):
+        raise download_result
+
+
+async def s3_cached(
+    *,
+    task,
+    bucket,
+    key,
+    semaphore,
+    s3_client,
+    httpx_client,
+):
+    """
+    Runs the task that creates the cached object at key, unless the
+    object exists and is less than half the cache TTL old.
+
+    The task refreshes the modification time of the object, so jobs
+    that use it have at least half the TTL before it is evicted.
+    """
+    async with semaphore:
+        try:
+            response = await s3_client.head_object(Bucket=bucket, Key=key)
+        except botocore.exceptions.ClientError as error:
+            if error.response["Error"]["Code"] != "404":
+                raise
+        else:
+            if (
+                response["LastModified"]
+                > now() - settings.COMPONENTS_INPUT_CACHE_TTL / 2
+            ):
+                return
+
+    await task(
+        semaphore=semaphore, s3_client=s3_client, httpx_client=httpx_client
+    )
+
+
 async def s3_sign_request_then_stream(*, request, signer, **kwargs):
     """
     Signed requests have a TTL of 5 minutes, so sign just before making the request
@@ -362,20 +622,46 @@ class Executor(ABC):
 
     def get_outputs(self, *, output_interfaces):
         """Create ComponentInterfaceValues from the output interfaces"""
+        output_interfaces = [*output_interfaces]
         outputs = []
 
-        with transaction.atomic():
-            # Atomic block required as create_instance needs to
-            # create interfaces in order to store the files
-            for interface in output_interfaces:
-                if interface.is_image_kind:
-                    res = self._create_images_result(interface=interface)
-                elif interface.is_json_kind:
-                    res = self._create_json_result(interface=interface)
-                else:
-                    res = self._create_file_result(interface=interface)
+        with ExitStack() as stack:
+            # Downloading does not need database access so the outputs
+            # for all interfaces are fetched concurrently first
+            downloads = [
+                self._get_output_download(interface=interface, stack=stack)
+                for interface in output_interfaces
+            ]
+            download_results = self._download_outputs(
+                tasks=[download.task for download in downloads]
+            )
 
-                outputs.append(res)
+            with transaction.atomic():
+                # Atomic block required as create_instance needs to
+                # create interfaces in order to store the files
+                for interface, download, download_result in zip(
+                    output_interfaces, downloads, download_results, strict=True
+                ):
+                    if interface.is_image_kind:
+                        res = self._create_images_result(
+                            interface=interface,
+                            directory=download.destination,
+                            download_result=download_result,
+                        )
+                    elif interface.is_json_kind:
+                        res = self._create_json_result(
+                            interface=interface,
+                            fileobj=download.destination,
+                            download_result=download_result,
+                        )
+                    else:
+                        res = self._create_file_result(
+                            interface=interface,
+                            fileobj=download.destination,
+                            download_result=download_result,
+                        )
+
+                    outputs.append(res)
 
         return outputs
 
@@ -509,7 +795,7 @@ class Executor(ABC):
     @property
     def _s3_client(self):
         if self.__s3_client is None:
-            self.__s3_client = boto3.client(
+            self.__s3_client = create_boto3_client(
                 "s3",
                 endpoint_url=settings.AWS_S3_ENDPOINT_URL,
             )
@@ -521,11 +807,25 @@ class Executor(ABC):
 
     @property
     def _algorithm_model_key(self):
-        return safe_join(self._auxiliary_data_prefix, "algorithm-model.tar.gz")
+        if settings.COMPONENTS_INPUT_CACHE_ENABLED:
+            return self._get_input_object_cache_key(
+                src=self._algorithm_model, filename="algorithm-model.tar.gz"
+            )
+        else:
+            return safe_join(
+                self._auxiliary_data_prefix, "algorithm-model.tar.gz"
+            )
 
     @property
     def _ground_truth_key(self):
-        return safe_join(self._auxiliary_data_prefix, "ground-truth.tar.gz")
+        if settings.COMPONENTS_INPUT_CACHE_ENABLED:
+            return self._get_input_object_cache_key(
+                src=self._ground_truth, filename="ground-truth.tar.gz"
+            )
+        else:
+            return safe_join(
+                self._auxiliary_data_prefix, "ground-truth.tar.gz"
+            )
 
     @property
     def _required_volume_size_gb(self):
@@ -544,8 +844,44 @@ class Executor(ABC):
         auxiliary_size_bytes = self._get_input_prefix_size_bytes(
             prefix=self._auxiliary_data_prefix
         )
+        cached_size_bytes = sum(
+            self._get_input_prefix_size_bytes(prefix=prefix)
+            for prefix in self._input_cache_prefixes
+        )
+
+        return inputs_size_bytes + auxiliary_size_bytes + cached_size_bytes
+
+    @property
+    def _input_cache_prefixes(self):
+        """The prefixes of the objects in the input cache used by this job"""
+        if not settings.COMPONENTS_INPUT_CACHE_ENABLED:
+            return set()
+
+        response = self._s3_client.get_object(
+            Bucket=settings.COMPONENTS_INPUT_BUCKET_NAME,
+            Key=self._invocation_key,
+        )
+        invocation = TypeAdapter(list[InferenceTask]).validate_json(
+            response["Body"].read()
+        )
 
-        return inputs_size_bytes + auxiliary_size_bytes
+        keys = {
+            inference_io.bucket_key
+            for inference_task in invocation
+            for inference_io in inference_task.inputs
+        }
+
+        if self._algorithm_model:
+            keys.add(self._algorithm_model_key)
+
+        if self._ground_truth:
+            keys.add(self._ground_truth_key)
+
+        return {
+            str(Path(key).parent)
+            for key in keys
+            if key.startswith(f"{INPUT_CACHE_PREFIX}/")
+        }
 
     def _get_input_prefix_size_bytes(self, *, prefix):
         paginator = self._s3_client.get_paginator("list_objects_v2")
@@ -564,25 +900,17 @@ class Executor(ABC):
 
     @async_to_sync
     async def _provision(self, *, tasks):
-        semaphore = asyncio.Semaphore(ASYNC_CONCURRENCY)
-        session = aioboto3.Session()
-        timeout = httpx.Timeout(60.0)
-
-        async with session.client(
-            "s3",
-            endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-            config=ASYNC_BOTO_CONFIG,
-        ) as s3_client:
-            async with httpx.AsyncClient(timeout=timeout) as httpx_client:
-                async with asyncio.TaskGroup() as task_group:
-                    for task in tasks:
-                        task_group.create_task(
-                            task(
-                                semaphore=semaphore,
-                                s3_client=s3_client,
-                                httpx_client=httpx_client,
-                            )
-                        )
+        await run_s3_tasks(tasks=tasks, concurrency=ASYNC_CONCURRENCY)
+
+    @async_to_sync
+    async def _download_outputs(self, *, tasks):
+        # Errors are returned rather than raised so that they can be
+        # reported in the same order as the interfaces
+        return await run_s3_tasks(
+            tasks=tasks,
+            concurrency=settings.COMPONENTS_OUTPUT_DOWNLOAD_CONCURRENCY,
+            return_exceptions=True,
+        )
 
     def _get_provisioning_tasks(self, *, input_civs, input_prefixes):
         provisioning_tasks = []
@@ -601,7 +929,10 @@ class Executor(ABC):
                             )
                         ),
                         bucket_name=settings.COMPONENTS_INPUT_BUCKET_NAME,
-                        bucket_key=civ_provisioning_task.key,
+                        bucket_key=(
+                            civ_provisioning_task.cache_key
+                            or civ_provisioning_task.key
+                        ),
                         decompress=civ.decompress,
                     )
                 )
@@ -669,6 +1000,10 @@ class Executor(ABC):
                         medical_imaging_auth=medical_imaging_auth,
                         unsigned_request=instance_request.unsigned_request,
                         target_key=key,
+                        cache_source=(
+                            f"{settings.AWS_HEALTH_IMAGING_DATASTORE_ID}/"
+                            f"{civ.image.dicom_image_set.image_set_id}"
+                        ),
                     )
 
             elif civ.interface.is_panimg_kind:
@@ -760,34 +1095,92 @@ class Executor(ABC):
         )
 
     @staticmethod
+    def _get_input_cache_key(*, source, filename):
+        """
+        The key of a cached input, from the sha256 of its source location
+
+        The key is derived from where the input was copied from rather
+        than from its contents, so it does not change if the source is
+        overwritten. Stored files are never overwritten as
+        AWS_S3_FILE_OVERWRITE is disabled, but if the source does change
+        jobs use the stale copy until it is older than half of
+        COMPONENTS_INPUT_CACHE_TTL and is copied again.
+        """
+        return safe_join(
+            INPUT_CACHE_PREFIX,
+            hashlib.sha256(source.encode("utf-8")).hexdigest(),
+            filename,
+        )
+
+    @classmethod
+    def _get_input_object_cache_key(cls, *, src, filename):
+        return cls._get_input_cache_key(
+            source=f"{src.storage.bucket.name}/{src.name}", filename=filename
+        )
+
+    @staticmethod
+    def _get_provisioning_task(*, task, key, cache_key):
+        if cache_key is None:
+            return CIVProvisioningTask(task=task, key=key)
+        else:
+            return CIVProvisioningTask(
+                task=functools.partial(
+                    s3_cached,
+                    task=task,
+                    bucket=settings.COMPONENTS_INPUT_BUCKET_NAME,
+                    key=cache_key,
+                ),
+                key=key,
+                cache_key=cache_key,
+            )
+
+    @classmethod
     def _get_copy_sop_instance_task(
+        cls,
         *,
         medical_imaging_auth,
         unsigned_request,
         target_key,
+        cache_source,
     ):
-        return CIVProvisioningTask(
+        if settings.COMPONENTS_INPUT_CACHE_ENABLED:
+            cache_key = cls._get_input_cache_key(
+                source=cache_source, filename=Path(target_key).name
+            )
+        else:
+            cache_key = None
+
+        return cls._get_provisioning_task(
             task=functools.partial(
                 s3_sign_request_then_stream,
                 request=unsigned_request,
                 signer=medical_imaging_auth,
                 bucket=settings.COMPONENTS_INPUT_BUCKET_NAME,
-                key=target_key,
+                key=cache_key or target_key,
             ),
             key=target_key,
+            cache_key=cache_key,
         )
 
-    @staticmethod
-    def _get_copy_input_object_task(*, src, target_key):
-        return CIVProvisioningTask(
+    @classmethod
+    def _get_copy_input_object_task(cls, *, src, target_key):
+        if settings.COMPONENTS_INPUT_CACHE_ENABLED:
+            cache_key = cls._get_input_object_cache_key(
+                src=src, filename=Path(target_key).name
+            )
+        else:
+            cache_key = None
+
+        return cls._get_provisioning_task(
             task=functools.partial(
                 s3_copy,
                 source_bucket=src.storage.bucket.name,
                 source_key=src.name,
                 target_bucket=settings.COMPONENTS_INPUT_BUCKET_NAME,
-                target_key=target_key,
+                target_key=cache_key or target_key,
             ),
             key=target_key,
+            cache_key=cache_key,
         )
 
     @staticmethod
@@ -868,43 +1261,64 @@ class Executor(ABC):
         else:
             raise ComponentException(user_error(self.stderr))
 
-    def _create_images_result(self, *, interface):
-        prefix = safe_join(self._io_prefix, interface.relative_path)
+    def _get_output_download(self, *, interface, stack):
+        key = safe_join(self._io_prefix, interface.relative_path)
 
-        response = self._s3_client.list_objects_v2(
-            Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
-            Prefix=(prefix.lstrip("/") if settings.USING_MINIO else prefix),
-        )
+        if interface.is_image_kind:
+            directory = stack.enter_context(TemporaryDirectory())
+            return OutputDownload(
+                destination=directory,
+                task=functools.partial(
+                    s3_download_prefix,
+                    bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
+                    prefix=key,
+                    directory=directory,
+                ),
+            )
+        else:
+            if interface.is_json_kind:
+                fileobj = stack.enter_context(io.BytesIO())
+            else:
+                fileobj = stack.enter_context(
+                    SpooledTemporaryFile(max_size=MAX_SPOOL_SIZE)
+                )
 
-        if response.get("IsTruncated", False):
+            return OutputDownload(
+                destination=fileobj,
+                task=functools.partial(
+                    s3_download_fileobj,
+                    bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
+                    key=key,
+                    fileobj=fileobj,
+                ),
+            )
+
+    def _create_images_result(self, *, interface, directory, download_result):
+        raise_for_download_error(download_result=download_result)
+
+        if download_result.get("IsTruncated", False):
             raise ComponentException(
                 f"Too many files produced in {interface.relative_path!r}"
             )
 
-        output_files = response.get("Contents", [])
-        if not output_files:
+        if not download_result.get("Contents", []):
             raise ComponentException(
                 f"Output directory {interface.relative_path!r} is empty"
             )
 
-        with TemporaryDirectory() as tmpdir:
-            self._download_output_files(
-                output_files=output_files, tmpdir=tmpdir, prefix=prefix
+        try:
+            importer_result = import_images(
+                input_directory=directory,
+                builders=[image_builder_mhd, image_builder_tiff],
             )
-
-            try:
-                importer_result = import_images(
-                    input_directory=tmpdir,
-                    builders=[image_builder_mhd, image_builder_tiff],
-                )
-            except RuntimeError as error:
-                if "std::bad_alloc" in str(error):
-                    raise ComponentException(
-                        "The output image was too large to process, "
-                        "please try again with smaller images"
-                    ) from error
-                else:
-                    raise
+        except RuntimeError as error:
+            if "std::bad_alloc" in str(error):
+                raise ComponentException(
+                    "The output image was too large to process, "
+                    "please try again with smaller images"
+                ) from error
+            else:
+                raise
 
         if len(importer_result.new_images) == 0:
             raise ComponentException(
@@ -928,42 +1342,15 @@ class Executor(ABC):
 
         return civ
 
-    def _download_output_files(self, *, output_files, tmpdir, prefix):
-        for file in output_files:
-            try:
-                root_key = safe_join("/", file["Key"])
-                dest = safe_join(tmpdir, Path(root_key).relative_to(prefix))
-            except (SuspiciousFileOperation, ValueError):
-                logger.warning(f"Skipping {file=}")
-                continue
-
-            logger.info(
-                f"Downloading {file['Key']} to {dest} from "
-                f"{settings.COMPONENTS_OUTPUT_BUCKET_NAME}"
-            )
+    def _create_json_result(self, *, interface, fileobj, download_result):
+        try:
+            raise_for_download_error(download_result=download_result)
 
-            Path(dest).parent.mkdir(parents=True, exist_ok=True)
-            self._s3_client.download_file(
-                Filename=dest,
-                Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
-                Key=file["Key"],
+            fileobj.seek(0)
+            result = json.loads(
+                fileobj.read().decode("utf-8"),
+                parse_constant=lambda x: None,  # Removes -inf, inf and NaN
             )
-
-    def _create_json_result(self, *, interface):
-        key = safe_join(self._io_prefix, interface.relative_path)
-
-        try:
-            with io.BytesIO() as fileobj:
-                self._s3_client.download_fileobj(
-                    Fileobj=fileobj,
-                    Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
-                    Key=key,
-                )
-                fileobj.seek(0)
-                result = json.loads(
-                    fileobj.read().decode("utf-8"),
-                    parse_constant=lambda x: None,  # Removes -inf, inf and NaN
-                )
             civ = interface.create_instance(value=result)
         except botocore.exceptions.ClientError:
             raise ComponentException(
@@ -984,18 +1371,12 @@ class Executor(ABC):
 
         return civ
 
-    def _create_file_result(self, *, interface):
-        key = safe_join(self._io_prefix, interface.relative_path)
-
+    def _create_file_result(self, *, interface, fileobj, download_result):
         try:
-            with SpooledTemporaryFile(max_size=MAX_SPOOL_SIZE) as fileobj:
-                self._s3_client.download_fileobj(
-                    Fileobj=fileobj,
-                    Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
-                    Key=key,
-                )
-                fileobj.seek(0)
-                civ = interface.create_instance(fileobj=fileobj)
+            raise_for_download_error(download_result=download_result)
+
+            fileobj.seek(0)
+            civ = interface.create_instance(fileobj=fileobj)
         except botocore.exceptions.ClientError:
             raise ComponentException(
                 f"Output file {interface.relative_path!r} was not produced"
@@ -3,6 +3,7 @@ import logging
 import re
 import secrets
 from enum import Enum
+from hashlib import sha256
 from json import JSONDecodeError
 from pathlib import Path
 from tempfile import NamedTemporaryFile
@@ -74,7 +75,11 @@ from grandchallenge.core.error_handlers import (
     RawImageUploadSessionErrorHandler,
     UserUploadCIVErrorHandler,
 )
-from grandchallenge.core.models import FieldChangeMixin, UUIDModel
+from grandchallenge.core.models import (
+    FieldChangeMixin,
+    StatusCountersMixin,
+    UUIDModel,
+)
 from grandchallenge.core.storage import (
     private_s3_storage,
     protected_s3_storage,
@@ -1577,7 +1582,7 @@ class ComponentJobManager(models.QuerySet):
         return existing_civs
 
 
-class ComponentJob(FieldChangeMixin, UUIDModel):
+class ComponentJob(StatusCountersMixin, FieldChangeMixin, UUIDModel):
     # The job statuses come directly from celery.result.AsyncResult.status:
     # http://docs.celeryproject.org/en/latest/reference/celery.result.html
     # Note: check the implementation of active() if changing this to choices
@@ -1841,8 +1846,12 @@ class ComponentJob(FieldChangeMixin, UUIDModel):
             "immutable": True,
         }
 
+    @property
+    def execute_signature(self):
+        return provision_job.signature(**self.signature_kwargs)
+
     def execute(self):
-        on_commit(provision_job.signature(**self.signature_kwargs).apply_async)
+        on_commit(self.execute_signature.apply_async)
 
     def execute_task_on_success(self):
         on_commit(
@@ -2444,6 +2453,22 @@ class CIVSetObjectPermissionsMixin:
         raise NotImplementedError
 
 
+def get_civ_set_fingerprint(*, civ_pks):
+    """
+    Returns a fingerprint of a set of component interface values
+
+    The fingerprint is the hex encoded SHA-256 of the comma separated,
+    sorted primary keys. This must match the SQL used in the migrations
+    that populate the fingerprints.
+    """
+    return sha256(
+        ",".join(str(pk) for pk in sorted(civ_pks)).encode("utf-8")
+    ).hexdigest()
+
+
+EMPTY_CIV_SET_FINGERPRINT = get_civ_set_fingerprint(civ_pks=[])
+
+
 class CIVForObjectMixin:
 
     def add_civ(self, *, civ):
@@ -8,6 +8,9 @@ import uuid
 import zlib
 from base64 import b64decode, b64encode
 from binascii import hexlify
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from lzma import LZMAError
 from pathlib import Path
 from tempfile import NamedTemporaryFile, TemporaryDirectory
@@ -29,7 +32,6 @@ from django.db.models import Count, DateTimeField, ExpressionWrapper, F, Q
 from django.db.transaction import on_commit
 from django.utils.module_loading import import_string
 from django.utils.timezone import now
-from panimg.models import SimpleITKImage
 
 from grandchallenge.cases.models import (
     DICOMImageSetUpload,
@@ -54,6 +56,7 @@ from grandchallenge.core.celery import (
     acks_late_micro_short_task,
 )
 from grandchallenge.core.exceptions import LockNotAcquiredException
+from grandchallenge.core.metrics import timed
 from grandchallenge.core.templatetags.remove_whitespace import oxford_comma
 from grandchallenge.core.utils.error_messages import (
     format_validation_error_message,
@@ -296,6 +299,20 @@ def delete_old_unsuccessful_container_images():
             )
 
 
+@acks_late_micro_short_task
+def delete_expired_cached_inputs():
+    if not settings.COMPONENTS_INPUT_CACHE_ENABLED:
+        return
+
+    from grandchallenge.components.backends.base import (
+        delete_expired_objects_from_input_cache,
+    )
+
+    delete_expired_objects_from_input_cache(
+        s3_client=boto3.client("s3", endpoint_url=settings.AWS_S3_ENDPOINT_URL)
+    )
+
+
 @acks_late_2xlarge_task(ignore_errors=(InstanceInUse,))
 def remove_container_image_from_registry(
     *, pk: uuid.UUID, app_label: str, model_name: str
@@ -750,7 +767,47 @@ def lock_for_utilization_update(*, algorithm_image_pk):
         ).get()
 
 
-@acks_late_2xlarge_task(retry_on=(LockNotAcquiredException,))
+def get_job_serialization_key(*, job_pk, job_app_label, job_model_name, **__):
+    """Serializes the invocations of a task for the same job"""
+    return f"{job_app_label}.{job_model_name}.{job_pk}"
+
+
+def get_event_serialization_key(*, event, backend):
+    """
+    Serializes the events for jobs of the same algorithm image
+
+    Handling the events of algorithm jobs locks the algorithm image,
+    so these are serialized by algorithm image rather than by job.
+    """
+    Backend = import_string(backend)  # noqa: N806
+
+    job_params = Backend.get_job_params(
+        job_name=Backend.get_job_name(event=event)
+    )
+    model = apps.get_model(
+        app_label=job_params.app_label, model_name=job_params.model_name
+    )
+
+    if any(f.name == "algorithm_image" for f in model._meta.get_fields()):
+        algorithm_image_pk = (
+            model.objects.filter(pk=job_params.pk)
+            .values_list("algorithm_image_id", flat=True)
+            .first()
+        )
+        return f"algorithms.algorithmimage.{algorithm_image_pk}"
+    else:
+        return get_job_serialization_key(
+            job_pk=job_params.pk,
+            job_app_label=job_params.app_label,
+            job_model_name=job_params.model_name,
+        )
+
+
+@acks_late_2xlarge_task(
+    retry_on=(LockNotAcquiredException,),
+    serialize_on=get_job_serialization_key,
+)
+@timed("JobStageDuration", Stage="provision_job")
 @transaction.atomic
 def provision_job(
     *, job_pk: uuid.UUID, job_app_label: str, job_model_name: str, backend: str
@@ -789,6 +846,7 @@ def provision_job(
 
 
 @acks_late_micro_short_task(retry_on=(RetryStep,))
+@timed("JobStageDuration", Stage="execute_job")
 def execute_job(
     *,
     job_pk: uuid.UUID,
@@ -869,46 +927,14 @@ def get_update_status_kwargs(*, executor=None):
         return {}
 
 
-@acks_late_micro_short_task(retry_on=(RetryStep, LockNotAcquiredException))
-@transaction.atomic
-def handle_event(*, event, backend):
+def _update_job_from_event(*, job, executor, handle):
     """
-    Receives events when tasks have stops and determines what to do next.
-    In the case of transient failure the job could be scheduled again
-    on the backend. If the job is complete then sets stdout and stderr.
-    `handle_event` is expected to raise `ComponentException` in which case
-    the job will be marked as failed and the error returned to the user.
+    Updates the status of the job from the result of handling its event
 
-    Job must be in the EXECUTING state.
-
-    Once the job has executed it will be in the EXECUTED or FAILURE states.
+    `handle` runs (or returns the result of) `executor.handle_event`.
     """
-    Backend = import_string(backend)  # noqa: N806
-
-    job_name = Backend.get_job_name(event=event)
-    job_params = Backend.get_job_params(job_name=job_name)
-
-    model = apps.get_model(
-        app_label=job_params.app_label,
-        model_name=job_params.model_name,
-    )
-
-    with check_lock_acquired():
-        job = model.objects.select_for_update(nowait=True).get(
-            pk=job_params.pk, attempt=job_params.attempt
-        )
-
-    executor = job.get_executor(backend=backend)
-
-    if job.status != job.EXECUTING:
-        # Nothing to do
-        return
-
-    if hasattr(job, "algorithm_image"):
-        lock_for_utilization_update(algorithm_image_pk=job.algorithm_image_id)
-
     try:
-        executor.handle_event(event=event)
+        handle()
     except TaskCancelled:
         job.update_status(
             status=job.CANCELLED, **get_update_status_kwargs(executor=executor)
@@ -945,7 +971,166 @@ def handle_event(*, event, backend):
         )
 
 
-@acks_late_2xlarge_task(retry_on=(LockNotAcquiredException,))
+def _get_event_jobs(*, kwargs_list):
+    """
+    Gets and locks the jobs of the events, with one query per job model
+
+    Returns a list of the job for each event, or the error
+    if the job for the event does not exist.
+    """
+    event_job_params = []
+
+    for kwargs in kwargs_list:
+        Backend = import_string(kwargs["backend"])  # noqa: N806
+        event_job_params.append(
+            Backend.get_job_params(
+                job_name=Backend.get_job_name(event=kwargs["event"])
+            )
+        )
+
+    pks = defaultdict(set)
+
+    for p in event_job_params:
+        pks[(p.app_label, p.model_name)].add(uuid.UUID(str(p.pk)))
+
+    jobs = {}
+
+    for (app_label, model_name), model_pks in pks.items():
+        model = apps.get_model(app_label=app_label, model_name=model_name)
+
+        with check_lock_acquired():
+            for job in model.objects.select_for_update(nowait=True).filter(
+                pk__in=model_pks
+            ):
+                jobs[(app_label, model_name, job.pk, job.attempt)] = job
+
+    return [
+        jobs.get(
+            (p.app_label, p.model_name, uuid.UUID(str(p.pk)), p.attempt),
+            apps.get_model(
+                app_label=p.app_label, model_name=p.model_name
+            ).DoesNotExist(f"Job for event {p} does not exist"),
+        )
+        for p in event_job_params
+    ]
+
+
+@timed("JobStageDuration", Stage="handle_events")
+@transaction.atomic
+def handle_events(*, kwargs_list):
+    """
+    Handles a batch of `handle_event` invocations
+
+    The jobs of the events are fetched and locked together, and the
+    events are handled by the executors concurrently as this only
+    involves requests to the backend (e.g. for the logs and metrics).
+    The status of each job is then updated in its own savepoint, in the
+    same way as `handle_event`, so that the error of one job does not
+    affect the others.
+
+    Returns the error of each invocation, or None.
+    """
+    errors = [None] * len(kwargs_list)
+    executors = {}
+
+    for idx, (kwargs, job) in enumerate(
+        zip(kwargs_list, _get_event_jobs(kwargs_list=kwargs_list), strict=True)
+    ):
+        if isinstance(job, Exception):
+            errors[idx] = job
+        elif job.status == job.EXECUTING:
+            executors[idx] = (job, job.get_executor(backend=kwargs["backend"]))
+
+    for algorithm_image_pk in sorted(
+        {
+            job.algorithm_image_id
+            for job, _ in executors.values()
+            if hasattr(job, "algorithm_image")
+        }
+    ):
+        lock_for_utilization_update(algorithm_image_pk=algorithm_image_pk)
+
+    if not executors:
+        return errors
+
+    with ThreadPoolExecutor(max_workers=len(executors)) as pool:
+        futures = {
+            idx: pool.submit(
+                executor.handle_event, event=kwargs_list[idx]["event"]
+            )
+            for idx, (_, executor) in executors.items()
+        }
+
+    for idx, (job, executor) in executors.items():
+        try:
+            with transaction.atomic():
+                _update_job_from_event(
+                    job=job, executor=executor, handle=futures[idx].result
+                )
+        except Exception as error:
+            errors[idx] = error
+
+    return errors
+
+
+@acks_late_micro_short_task(
+    retry_on=(RetryStep, LockNotAcquiredException),
+    serialize_on=get_event_serialization_key,
+    batch_func=handle_events,
+)
+@timed("JobStageDuration", Stage="handle_event")
+@transaction.atomic
+def handle_event(*, event, backend):
+    """
+    Receives events when tasks have stops and determines what to do next.
+    In the case of transient failure the job could be scheduled again
+    on the backend. If the job is complete then sets stdout and stderr.
+    `handle_event` is expected to raise `ComponentException` in which case
+    the job will be marked as failed and the error returned to the user.
+
+    Job must be in the EXECUTING state.
+
+    Once the job has executed it will be in the EXECUTED or FAILURE states.
+
+    When run by a worker the serialized invocations are handled in
+    batches by `handle_events`.
+    """
+    Backend = import_string(backend)  # noqa: N806
+
+    job_name = Backend.get_job_name(event=event)
+    job_params = Backend.get_job_params(job_name=job_name)
+
+    model = apps.get_model(
+        app_label=job_params.app_label,
+        model_name=job_params.model_name,
+    )
+
+    with check_lock_acquired():
+        job = model.objects.select_for_update(nowait=True).get(
+            pk=job_params.pk, attempt=job_params.attempt
+        )
+
+    executor = job.get_executor(backend=backend)
+
+    if job.status != job.EXECUTING:
+        # Nothing to do
+        return
+
+    if hasattr(job, "algorithm_image"):
+        lock_for_utilization_update(algorithm_image_pk=job.algorithm_image_id)
+
+    _update_job_from_event(
+        job=job,
+        executor=executor,
+        handle=partial(executor.handle_event, event=event),
+    )
+
+
+@acks_late_2xlarge_task(
+    retry_on=(LockNotAcquiredException,),
+    serialize_on=get_job_serialization_key,
+)
+@timed("JobStageDuration", Stage="parse_job_outputs")
 @transaction.atomic
 def parse_job_outputs(
     *, job_pk: uuid.UUID, job_app_label: str, job_model_name: str, backend: str
@@ -1220,13 +1405,7 @@ def validate_voxel_values(*, civ_pk):
         civ.image.segments is None
         and first_file.image_type == ImageFile.IMAGE_TYPE_MHD
     ):
-        sitk_image = SimpleITKImage(
-            image=civ.image.sitk_image,
-            name=civ.image.name,
-            consumed_files=set(),
-            spacing_valid=True,
-        )
-        segments = sitk_image.segments
+        segments = civ.image.get_segments()
         if segments is not None:
             civ.image.segments = [int(segment) for segment in segments]
             civ.image.save()
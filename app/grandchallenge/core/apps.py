@@ -1,6 +1,9 @@
+import atexit
+
 from django.apps import AppConfig
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.signals import request_finished
 from django.db.models.signals import post_migrate
 
 
@@ -42,6 +45,18 @@ def rename_site(sender, **kwargs):
         s.save()
 
 
+def flush_metrics_after_request(sender, **kwargs):
+    from grandchallenge.core.metrics import flush_metrics
+
+    flush_metrics()
+
+
+def flush_metrics_at_exit():
+    from grandchallenge.core.metrics import flush_metrics
+
+    flush_metrics(force=True)
+
+
 class CoreConfig(AppConfig):
     name = "grandchallenge.core"
 
@@ -49,5 +64,10 @@ class CoreConfig(AppConfig):
         post_migrate.connect(init_users_groups, sender=self)
         post_migrate.connect(rename_site, sender=self)
 
+        # Web processes record metrics too, export them as requests finish
+        # and whatever is left when the process exits
+        request_finished.connect(flush_metrics_after_request)
+        atexit.register(flush_metrics_at_exit)
+
         # noinspection PyUnresolvedReferences
         import grandchallenge.core.signals  # noqa: F401
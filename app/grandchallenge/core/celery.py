@@ -1,7 +1,7 @@
 import logging
 import random
 import time
-from functools import wraps
+from functools import partial, wraps
 
 from celery import shared_task  # noqa: I251 Usage allowed here
 from celery.exceptions import MaxRetriesExceededError
@@ -10,9 +10,14 @@ from django.core.cache import cache
 from django.db.transaction import on_commit
 from redis.exceptions import LockError
 
+from grandchallenge.core.metrics import increment, observe
+from grandchallenge.core.profiling import profile_task
+from grandchallenge.core.serialized_tasks import SerializedTaskQueue
+
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 60 * 24 * 2  # 2 days assuming 1 minute delay
+SERIALIZED_TASKS_BATCH_SIZE = 10
 
 
 def _retry(*, task, signature_kwargs, retries, delayed=True):
@@ -49,6 +54,207 @@ def _retry(*, task, signature_kwargs, retries, delayed=True):
         raise MaxRetriesExceededError
 
 
+def _run_serialized(
+    *,
+    task,
+    run_batch,
+    batch_size,
+    serialize_on,
+    serialized_key,
+    kwargs,
+    retries,
+):
+    """
+    Queue the invocation by key and drain the queue if it is not owned
+
+    If serialized_key is set this is a continuation that only drains
+    the queue for that key.
+    """
+    if serialized_key is None:
+        queue = SerializedTaskQueue(
+            task_name=task.name, key=serialize_on(**kwargs)
+        )
+        own_item_id, depth = queue.enqueue(kwargs=kwargs, retries=retries)
+        observe(
+            "SerializedTaskQueueDepth",
+            value=depth,
+            unit="Count",
+            Task=task.name,
+        )
+    else:
+        queue = SerializedTaskQueue(task_name=task.name, key=serialized_key)
+        own_item_id = None
+
+    token = queue.acquire()
+
+    if token is None:
+        # The owner of the queue will run this invocation
+        increment("SerializedTasksDeferred", Task=task.name)
+        return
+
+    try:
+        own_error = _drain_serialized(
+            queue=queue,
+            token=token,
+            run_batch=run_batch,
+            batch_size=batch_size,
+            own_item_id=own_item_id,
+        )
+    except BaseException:
+        queue.release(token=token)
+        raise
+
+    if not queue.release_if_drained(token=token):
+        # Hand over to a new task so that the time limit is not exceeded
+        queue.release(token=token)
+        task.apply_async(kwargs={"_serialized_key": queue.key})
+
+    if own_error is not None:
+        raise own_error
+
+
+def _drain_serialized(*, queue, token, run_batch, batch_size, own_item_id):
+    """
+    Run the next SERIALIZED_TASKS_BATCH_SIZE invocations in the queue
+
+    The invocations are popped and run in batches of batch_size, and
+    are acknowledged once they have been run. The ownership of the queue
+    is renewed after each batch, draining stops if it has been lost.
+    Errors of the invocations of other tasks are logged, the error of
+    the callers own invocation is returned.
+    """
+    own_error = None
+
+    for _ in range(0, SERIALIZED_TASKS_BATCH_SIZE, batch_size):
+        items = []
+
+        while len(items) < batch_size:
+            item = queue.pop()
+
+            if item is None:
+                break
+
+            items.append(item)
+
+        if not items:
+            break
+
+        errors = run_batch(items=items)
+
+        for item, error in zip(items, errors, strict=True):
+            queue.ack(item=item)
+
+            if error is None:
+                continue
+            elif item.id == own_item_id:
+                own_error = error
+            else:
+                logger.error(
+                    f"Serialized invocation of {queue.task_name} failed",
+                    exc_info=error,
+                )
+
+        if not queue.renew(token=token):
+            logger.warning(
+                f"Lost the ownership of the serialized queue of "
+                f"{queue.task_name} for {queue.key}"
+            )
+            break
+
+    return own_error
+
+
+def _set_retry(*, task, args, kwargs, retries, delayed):
+    task._retry = lambda: _retry(
+        task=task,
+        signature_kwargs={
+            "args": args,
+            "kwargs": kwargs,
+            "immutable": True,
+        },
+        retries=retries,
+        delayed=delayed,
+    )
+
+
+def _handle_task_error(
+    *, task, error, retries, retry_on, ignore_errors, singleton
+):
+    """Ignore, retry or raise the error of a task invocation"""
+    if any(isinstance(error, e) for e in ignore_errors):
+        if task.request.id is not None:
+            logger.info(f"Ignoring error in task {task.name}: {repr(error)}")
+            return
+        else:
+            raise error
+    elif any(isinstance(error, e) for e in retry_on) or (
+        singleton and isinstance(error, LockError)
+    ):
+        logger.info(
+            f"Retrying task {task.name} due to error: {error}, {retries=}"
+        )
+        increment("TaskRetries", Task=task.name)
+        return task._retry()
+    else:
+        raise error
+
+
+def _run_each(*, run, items):
+    """Run the serialized invocations one at a time"""
+    errors = []
+
+    for item in items:
+        try:
+            run(_retries=item.retries, **item.kwargs)
+        except Exception as error:
+            errors.append(error)
+        else:
+            errors.append(None)
+
+    return errors
+
+
+def _run_batch(*, task, batch_func, items, delayed_retry, **error_handling):
+    """
+    Run the serialized invocations together with the batch function
+
+    The errors returned for each invocation are handled in the same
+    way as the errors of a single invocation. If the batch function
+    itself raises, the error applies to all of the invocations.
+    """
+    try:
+        with profile_task(name=task.name, task_id=task.request.id, retries=0):
+            errors = batch_func(kwargs_list=[item.kwargs for item in items])
+    except Exception as error:
+        errors = [error] * len(items)
+
+    results = []
+
+    for item, error in zip(items, errors, strict=True):
+        if error is not None:
+            _set_retry(
+                task=task,
+                args=(),
+                kwargs=item.kwargs,
+                retries=item.retries,
+                delayed=delayed_retry,
+            )
+            try:
+                _handle_task_error(
+                    task=task,
+                    error=error,
+                    retries=item.retries,
+                    **error_handling,
+                )
+            except Exception as unhandled_error:
+                results.append(unhandled_error)
+                continue
+
+        results.append(None)
+
+    return results
+
+
 def _cache_key_from_method(method):
     return f"lock.{method.__module__}.{method.__name__}"
 
@@ -72,6 +278,8 @@ class AcksLateTaskDecorator:
         delayed_retry=True,
         ignore_errors=(),
         singleton=False,
+        serialize_on=None,
+        batch_func=None,
     ):
         """
         Decorator for Celery tasks that sets the queue and acks_late options
@@ -87,6 +295,8 @@ class AcksLateTaskDecorator:
             delayed_retry: If the task should be retried after a delay
             ignore_errors: A tuple of exceptions that should be ignored when being run by celery
             singleton: If the task should be run as a singleton (only one concurrent execution at a time)
+            serialize_on: A function of the task kwargs that returns a key, invocations that share a key are queued and run in order by a single worker
+            batch_func: A function that takes the kwargs of a list of serialized invocations, runs them together and returns the error of each invocation or None, requires serialize_on
         """
         if func is None:
             # Called as @decorator(**extra_kwargs)
@@ -97,6 +307,8 @@ class AcksLateTaskDecorator:
                 delayed_retry=delayed_retry,
                 ignore_errors=ignore_errors,
                 singleton=singleton,
+                serialize_on=serialize_on,
+                batch_func=batch_func,
             )
         else:
             # Called as @decorator or @decorator(func)
@@ -107,6 +319,8 @@ class AcksLateTaskDecorator:
                 delayed_retry=delayed_retry,
                 ignore_errors=ignore_errors,
                 singleton=singleton,
+                serialize_on=serialize_on,
+                batch_func=batch_func,
             )
 
     def _decorator(
@@ -118,49 +332,77 @@ class AcksLateTaskDecorator:
         delayed_retry,
         ignore_errors,
         singleton,
+        serialize_on,
+        batch_func,
     ):
+        if batch_func is not None and serialize_on is None:
+            raise ValueError("batch_func requires serialize_on")
+
+        error_handling = {
+            "retry_on": retry_on,
+            "ignore_errors": ignore_errors,
+            "singleton": singleton,
+        }
+
         @wraps(func)
-        def wrapper(*args, _retries=0, **kwargs):
-            is_in_celery_context = task_func.request.id is not None
-            task_func._retry = lambda: _retry(
+        def wrapper(*args, _retries=0, _serialized_key=None, **kwargs):
+            if serialize_on is not None and task_func.request.id is not None:
+                if batch_func is None:
+                    run_batch = partial(_run_each, run=run)
+                    batch_size = 1
+                else:
+                    run_batch = partial(
+                        _run_batch,
+                        task=task_func,
+                        batch_func=batch_func,
+                        delayed_retry=delayed_retry,
+                        **error_handling,
+                    )
+                    batch_size = SERIALIZED_TASKS_BATCH_SIZE
+
+                return _run_serialized(
+                    task=task_func,
+                    run_batch=run_batch,
+                    batch_size=batch_size,
+                    serialize_on=serialize_on,
+                    serialized_key=_serialized_key,
+                    kwargs=kwargs,
+                    retries=_retries,
+                )
+            else:
+                return run(*args, _retries=_retries, **kwargs)
+
+        def run(*args, _retries=0, **kwargs):
+            _set_retry(
                 task=task_func,
-                signature_kwargs={
-                    "args": args,
-                    "kwargs": kwargs,
-                    "immutable": True,
-                },
+                args=args,
+                kwargs=kwargs,
                 retries=_retries,
                 delayed=delayed_retry,
             )
 
             try:
-                if singleton:
-                    with cache.lock(
-                        _cache_key_from_method(func),
-                        timeout=settings.CELERY_TASK_TIME_LIMIT,
-                        blocking_timeout=5,
-                    ):
+                with profile_task(
+                    name=task_func.name,
+                    task_id=task_func.request.id,
+                    retries=_retries,
+                ):
+                    if singleton:
+                        with cache.lock(
+                            _cache_key_from_method(func),
+                            timeout=settings.CELERY_TASK_TIME_LIMIT,
+                            blocking_timeout=5,
+                        ):
+                            return func(*args, **kwargs)
+                    else:
                         return func(*args, **kwargs)
-                else:
-                    return func(*args, **kwargs)
             except Exception as error:
-                if any(isinstance(error, e) for e in ignore_errors):
-                    if is_in_celery_context:
-                        logger.info(
-                            f"Ignoring error in task {task_func.name}: {repr(error)}"
-                        )
-                        return
-                    else:
-                        raise error
-                elif any(isinstance(error, e) for e in retry_on) or (
-                    singleton and isinstance(error, LockError)
-                ):
-                    logger.info(
-                        f"Retrying task {task_func.name} due to error: {error}, {_retries=}"
-                    )
-                    return task_func._retry()
-                else:
-                    raise error
+                return _handle_task_error(
+                    task=task_func,
+                    error=error,
+                    retries=_retries,
+                    **error_handling,
+                )
 
         task_func = shared_task(
             acks_late=True,
@@ -0,0 +1,357 @@
+"""
+In-process metrics for the hot paths of the job pipeline
+
+Counters and histograms are aggregated in memory, so recording a value
+is cheap, and are periodically flushed to the exporter that is
+configured with ``METRICS_EXPORTER``.
+"""
+
+import bisect
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import monotonic, perf_counter
+from typing import NamedTuple
+
+import boto3
+from django.conf import settings
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the duration histogram buckets, in seconds
+HISTOGRAM_BUCKETS = (
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1,
+    5,
+    10,
+    30,
+    60,
+    300,
+    600,
+    1800,
+    3600,
+    float("inf"),
+)
+
+
+class Metric(NamedTuple):
+    name: str
+    unit: str
+    dimensions: tuple[tuple[str, str], ...]
+
+
+@dataclass
+class Histogram:
+    count: int = 0
+    total: float = 0
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+    bucket_counts: list[int] = field(
+        default_factory=lambda: [0] * len(HISTOGRAM_BUCKETS)
+    )
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.bucket_counts[bisect.bisect_left(HISTOGRAM_BUCKETS, value)] += 1
+
+
+class MetricsSnapshot(NamedTuple):
+    counters: dict[Metric, float]
+    histograms: dict[Metric, Histogram]
+
+
+_lock = threading.Lock()
+_counters = Counter()
+_histograms = {}
+_last_flush = monotonic()
+
+
+def _get_metric(*, name, unit, dimensions):
+    return Metric(
+        name=name,
+        unit=unit,
+        dimensions=tuple(
+            sorted((key, str(value)) for key, value in dimensions.items())
+        ),
+    )
+
+
+def increment(name, *, value=1, unit="Count", **dimensions):
+    """Add value to the counter with the given name and dimensions"""
+    metric = _get_metric(name=name, unit=unit, dimensions=dimensions)
+
+    with _lock:
+        _counters[metric] += value
+
+
+def observe(name, *, value, unit="Seconds", **dimensions):
+    """Record a value in the histogram with the given name and dimensions"""
+    metric = _get_metric(name=name, unit=unit, dimensions=dimensions)
+
+    with _lock:
+        try:
+            histogram = _histograms[metric]
+        except KeyError:
+            histogram = _histograms[metric] = Histogram()
+
+        histogram.observe(value)
+
+
+@contextmanager
+def timed(name, **dimensions):
+    """Record the duration of a block or function, in seconds"""
+    start = perf_counter()
+
+    try:
+        yield
+    finally:
+        observe(name, value=perf_counter() - start, **dimensions)
+
+
+def collect():
+    """Return the metrics recorded since the last collection and reset them"""
+    global _counters, _histograms
+
+    with _lock:
+        snapshot = MetricsSnapshot(
+            counters=dict(_counters), histograms=_histograms
+        )
+        _counters = Counter()
+        _histograms = {}
+
+    return snapshot
+
+
+def get_metrics_exporter():
+    return import_string(settings.METRICS_EXPORTER)()
+
+
+def flush_metrics(*, force=False):
+    """
+    Export the recorded metrics if the flush interval has passed
+
+    Errors are logged rather than raised, as failing to export the
+    metrics must not fail the work that is being measured.
+    """
+    global _last_flush
+
+    with _lock:
+        if (
+            not force
+            and monotonic() - _last_flush
+            < settings.METRICS_FLUSH_INTERVAL.total_seconds()
+        ):
+            return
+
+        _last_flush = monotonic()
+
+    snapshot = collect()
+
+    if not (snapshot.counters or snapshot.histograms):
+        return
+
+    try:
+        get_metrics_exporter().export(snapshot=snapshot)
+    except Exception as error:
+        logger.warning(f"Could not export metrics: {error}")
+
+
+class NullMetricsExporter:
+    def export(self, *, snapshot):
+        pass
+
+
+class FileMetricsExporter:
+    """Appends each snapshot as a JSON line to ``METRICS_FILE_PATH``"""
+
+    def export(self, *, snapshot):
+        line = {
+            "timestamp": now().isoformat(),
+            "counters": [
+                {**metric._asdict(), "dimensions": dict(metric.dimensions)}
+                | {"value": value}
+                for metric, value in snapshot.counters.items()
+            ],
+            "histograms": [
+                {**metric._asdict(), "dimensions": dict(metric.dimensions)}
+                | {
+                    "count": histogram.count,
+                    "sum": histogram.total,
+                    "minimum": histogram.minimum,
+                    "maximum": histogram.maximum,
+                }
+                for metric, histogram in snapshot.histograms.items()
+            ],
+        }
+
+        with open(settings.METRICS_FILE_PATH, "a") as f:
+            f.write(f"{json.dumps(line)}\n")
+
+
+class CloudWatchMetricsExporter:
+    # Stay within the limits of a single put_metric_data call
+    MAX_METRIC_DATA = 20
+
+    def __init__(self):
+        self._client = boto3.client(
+            "cloudwatch", region_name=settings.AWS_CLOUDWATCH_REGION_NAME
+        )
+
+    def export(self, *, snapshot):
+        from django.contrib.sites.models import Site
+
+        site = Site.objects.get_current()
+
+        metric_data = [
+            {
+                "MetricName": metric.name,
+                "Dimensions": self._get_dimensions(metric=metric),
+                "Value": value,
+                "Unit": metric.unit,
+            }
+            for metric, value in snapshot.counters.items()
+        ] + [
+            {
+                "MetricName": metric.name,
+                "Dimensions": self._get_dimensions(metric=metric),
+                "StatisticValues": {
+                    "SampleCount": histogram.count,
+                    "Sum": histogram.total,
+                    "Minimum": histogram.minimum,
+                    "Maximum": histogram.maximum,
+                },
+                "Unit": metric.unit,
+            }
+            for metric, histogram in snapshot.histograms.items()
+        ]
+
+        for start in range(0, len(metric_data), self.MAX_METRIC_DATA):
+            self._client.put_metric_data(
+                Namespace=f"{site.domain}/Pipeline",
+                MetricData=metric_data[start : start + self.MAX_METRIC_DATA],
+            )
+
+    @staticmethod
+    def _get_dimensions(*, metric):
+        return [
+            {"Name": name, "Value": value} for name, value in metric.dimensions
+        ]
+
+
+def _to_snake_case(name):
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == float("inf") else f"{bound:g}"
+
+
+def _format_value(value):
+    # Counters can exceed the 6 significant digits of the "g" format
+    value = float(value)
+    return f"{value:.0f}" if value.is_integer() else repr(value)
+
+
+def _format_labels(labels):
+    formatted = ",".join(
+        f'{_to_snake_case(name)}="{json.dumps(value)[1:-1]}"'
+        for name, value in labels
+    )
+    return f"{{{formatted}}}" if formatted else ""
+
+
+class PrometheusMetricsExporter:
+    """
+    Aggregates the snapshots of all processes in redis
+
+    The totals are rendered in the Prometheus text format by the
+    metrics endpoint.
+    """
+
+    KEY = "metrics:prometheus"
+    PREFIX = "grandchallenge"
+
+    def _get_name(self, *, metric):
+        name = f"{self.PREFIX}_{_to_snake_case(metric.name)}"
+
+        if metric.unit != "Count":
+            name += f"_{_to_snake_case(metric.unit)}"
+
+        return name
+
+    def export(self, *, snapshot):
+        client = get_redis_connection("default")
+        pipeline = client.pipeline(transaction=False)
+
+        for metric, value in snapshot.counters.items():
+            pipeline.hincrbyfloat(
+                self.KEY,
+                json.dumps(
+                    ["counter", self._get_name(metric=metric), "_total"]
+                    + [metric.dimensions]
+                ),
+                value,
+            )
+
+        for metric, histogram in snapshot.histograms.items():
+            name = self._get_name(metric=metric)
+
+            cumulative_count = 0
+            for bound, count in zip(
+                HISTOGRAM_BUCKETS, histogram.bucket_counts, strict=True
+            ):
+                cumulative_count += count
+                pipeline.hincrbyfloat(
+                    self.KEY,
+                    json.dumps(
+                        ["histogram", name, "_bucket"]
+                        + [[*metric.dimensions, ("le", _format_bound(bound))]]
+                    ),
+                    cumulative_count,
+                )
+
+            pipeline.hincrbyfloat(
+                self.KEY,
+                json.dumps(["histogram", name, "_sum", metric.dimensions]),
+                histogram.total,
+            )
+            pipeline.hincrbyfloat(
+                self.KEY,
+                json.dumps(["histogram", name, "_count", metric.dimensions]),
+                histogram.count,
+            )
+
+        pipeline.execute()
+
+    def render(self):
+        client = get_redis_connection("default")
+        totals = client.hgetall(self.KEY)
+
+        samples = {}
+
+        for key, value in totals.items():
+            metric_type, name, suffix, labels = json.loads(key)
+            samples.setdefault((name, metric_type), []).append(
+                f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+            )
+
+        lines = []
+
+        for (name, metric_type), metric_samples in sorted(samples.items()):
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(sorted(metric_samples))
+
+        return "\n".join(lines) + "\n"
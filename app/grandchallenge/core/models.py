@@ -1,4 +1,5 @@
 import uuid
+from collections import Counter
 
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
@@ -10,6 +11,10 @@ from django_extensions.db.models import (
 )
 
 from grandchallenge.core import utils
+from grandchallenge.core.status_counters import (
+    STATUS_FIELD,
+    update_status_counters,
+)
 
 
 class TitleSlugDescriptionModel(BaseTitleSlugDescriptionModel):
@@ -138,3 +143,63 @@ class FieldChangeMixin:
         return self._current_value(field_name) != self.initial_value(
             field_name
         )
+
+
+class StatusCountersMixin:
+    """
+    Keeps the cached per-status counts of a model up to date
+
+    Creating, deleting or changing the status of an instance updates the
+    counters. Queryset updates and deletes do not, these are corrected
+    by the periodic reconciliation of the counters.
+    """
+
+    _STATUS_NOT_LOADED = object()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._counted_status = self.__dict__.get(
+            STATUS_FIELD, self._STATUS_NOT_LOADED
+        )
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        update_fields = kwargs.get("update_fields")
+
+        super().save(*args, **kwargs)
+
+        if update_fields is not None and STATUS_FIELD not in update_fields:
+            return
+
+        status = getattr(self, STATUS_FIELD)
+        deltas = Counter({status: 1})
+
+        if not adding:
+            if self._counted_status is self._STATUS_NOT_LOADED:
+                # The previous status is unknown, leave this
+                # to the reconciliation
+                deltas.clear()
+            else:
+                deltas[self._counted_status] -= 1
+
+        self._counted_status = status
+
+        update_status_counters(model=self.__class__, deltas=deltas)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+
+        if self._counted_status is not self._STATUS_NOT_LOADED:
+            update_status_counters(
+                model=self.__class__, deltas={self._counted_status: -1}
+            )
+
+        return result
+
+    @classmethod
+    def update_status_counters_for_created(cls, *, objs):
+        """Update the counters for objects created with bulk_create"""
+        update_status_counters(
+            model=cls,
+            deltas=Counter(getattr(obj, STATUS_FIELD) for obj in objs),
+        )
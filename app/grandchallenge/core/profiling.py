@@ -0,0 +1,147 @@
+import cProfile
+import logging
+import random
+import resource
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connection
+
+from grandchallenge.core.metrics import increment, observe
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRecorder:
+    """Database execute wrapper that counts and times the queries"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += perf_counter() - start
+
+
+@contextmanager
+def _sampled_dumps(*, name, options, dump_path):
+    """Dumps the cProfile stats and tracemalloc snapshot of the block"""
+    profile = None
+    tracing = False
+
+    if options.get("cprofile", False):
+        profile = cProfile.Profile()
+        profile.enable()
+
+    if options.get("tracemalloc", False) and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        tracing = True
+
+    try:
+        yield
+    finally:
+        dump_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if profile is not None:
+            profile.disable()
+            profile.dump_stats(f"{dump_path}.prof")
+
+        if tracing:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.take_snapshot().dump(f"{dump_path}.tracemalloc")
+            tracemalloc.stop()
+            logger.info(f"Peak traced memory of {dump_path.name}: {peak} B")
+            observe(
+                "TaskTracedMemoryPeak", value=peak, unit="Bytes", Task=name
+            )
+
+
+def _get_rss():
+    """The current resident set size of the process, in bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        # Not on Linux, fall back to the peak of the process lifetime
+        # which is in bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+@contextmanager
+def profile_task(*, name, task_id, retries):
+    """
+    Records the resource usage of a task invocation if profiling is enabled
+
+    Profiling is enabled per task with ``CELERY_TASK_PROFILING``, which
+    maps the task name to the profiling options:
+
+    ``dump_sample_rate``
+        The fraction of invocations for which a cProfile and/or
+        tracemalloc dump is written to
+        ``CELERY_TASK_PROFILING_DUMP_DIRECTORY``, defaults to 0
+    ``cprofile``
+        Whether to dump the cProfile stats of sampled invocations
+    ``tracemalloc``
+        Whether to dump a tracemalloc snapshot of sampled invocations
+
+    The wall time, number of database queries, database time, growth in
+    the RSS of the worker and the number of retries are logged and
+    recorded as metrics for every invocation. The peak traced memory of
+    sampled tracemalloc invocations is recorded too.
+    """
+    options = settings.CELERY_TASK_PROFILING.get(name)
+
+    if options is None:
+        yield
+        return
+
+    queries = QueryRecorder()
+
+    with ExitStack() as stack:
+        stack.enter_context(connection.execute_wrapper(queries))
+
+        if random.random() < options.get("dump_sample_rate", 0):
+            stack.enter_context(
+                _sampled_dumps(
+                    name=name,
+                    options=options,
+                    dump_path=Path(
+                        settings.CELERY_TASK_PROFILING_DUMP_DIRECTORY
+                    )
+                    / f"{name}-{task_id or 'local'}-{retries}",
+                )
+            )
+
+        start_rss = _get_rss()
+        start = perf_counter()
+
+        try:
+            yield
+        finally:
+            duration = perf_counter() - start
+            rss_growth = _get_rss() - start_rss
+
+            logger.info(
+                f"Task {name} took {duration:.3f} s, "
+                f"{queries.count} queries took {queries.duration:.3f} s, "
+                f"RSS grew by {rss_growth} B, {retries=}"
+            )
+
+            observe("TaskDuration", value=duration, Task=name)
+            observe("TaskDatabaseDuration", value=queries.duration, Task=name)
+            observe("TaskRSSGrowth", value=rss_growth, unit="Bytes", Task=name)
+            # Distinct from TaskRetries, which counts the scheduled retries
+            observe(
+                "TaskInvocationRetries", value=retries, unit="Count", Task=name
+            )
+            increment("TaskDatabaseQueries", value=queries.count, Task=name)
+            increment("TaskInvocations", Task=name)
@@ -0,0 +1,182 @@
+import secrets
+from typing import NamedTuple
+from uuid import uuid4
+
+from django_redis import get_redis_connection
+from kombu.utils.json import dumps, loads
+
+QUEUE_KEY_PREFIX = "serialized-tasks"
+PROCESSING_KEY_PREFIX = "serialized-tasks-processing"
+OWNER_KEY_PREFIX = "serialized-task-owners"
+
+# The ownership of a queue expires unless it is renewed within this time,
+# it is renewed after each batch of invocations so a lost owner only
+# blocks the queue for this long
+OWNER_LEASE_SECONDS = 600
+
+# Only release the ownership if the queue has been drained, and only
+# if it is still owned by the caller
+_RELEASE_IF_DRAINED_SCRIPT = """
+if redis.call("LLEN", KEYS[1]) ~= 0 then
+    return 0
+end
+if redis.call("GET", KEYS[2]) == ARGV[1] then
+    redis.call("DEL", KEYS[2])
+end
+return 1
+"""
+
+# Return the unacknowledged items to the end of the queue that is
+# popped next, keeping their order
+_REQUEUE_SCRIPT = """
+local items = redis.call("LRANGE", KEYS[1], 0, -1)
+for i = 1, #items do
+    redis.call("RPUSH", KEYS[2], items[i])
+end
+redis.call("DEL", KEYS[1])
+"""
+
+_RENEW_OWNED_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_OWNED_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    redis.call("DEL", KEYS[1])
+end
+"""
+
+
+class SerializedTaskItem(NamedTuple):
+    id: str
+    kwargs: dict
+    retries: int
+    raw: bytes
+
+
+class SerializedTaskQueue:
+    """
+    A queue of the invocations of a task that share a key
+
+    Invocations are added to the queue and are run in order by the
+    single worker that owns the queue, so they do not contend for the
+    same database locks. Popped invocations are kept in a processing
+    list until they are acknowledged, if the owner is lost they are
+    returned to the queue by the next owner.
+    """
+
+    def __init__(self, *, task_name, key):
+        self.task_name = task_name
+        self.key = key
+        self._client = get_redis_connection("default")
+
+    @property
+    def _queue_key(self):
+        return f"{QUEUE_KEY_PREFIX}:{self.task_name}:{self.key}"
+
+    @property
+    def _processing_key(self):
+        return f"{PROCESSING_KEY_PREFIX}:{self.task_name}:{self.key}"
+
+    @property
+    def _owner_key(self):
+        return f"{OWNER_KEY_PREFIX}:{self.task_name}:{self.key}"
+
+    def enqueue(self, *, kwargs, retries):
+        """Add an invocation to the queue, returning its id and the queue depth"""
+        item_id = uuid4().hex
+        # Items are pushed on the left and popped from the right
+        depth = self._client.lpush(
+            self._queue_key,
+            dumps({"id": item_id, "kwargs": kwargs, "retries": retries}),
+        )
+        return item_id, depth
+
+    def pop(self):
+        raw = self._client.rpoplpush(self._queue_key, self._processing_key)
+
+        if raw is None:
+            return None
+        else:
+            return SerializedTaskItem(**loads(raw), raw=raw)
+
+    def ack(self, *, item):
+        self._client.lrem(self._processing_key, 1, item.raw)
+
+    def _requeue_unacknowledged(self):
+        self._client.eval(
+            _REQUEUE_SCRIPT, 2, self._processing_key, self._queue_key
+        )
+
+    def acquire(self):
+        """Try to take ownership of the queue, returning the owner token"""
+        token = secrets.token_hex(16)
+
+        if self._client.set(
+            self._owner_key,
+            token,
+            nx=True,
+            # Expire the ownership if the worker is lost
+            ex=OWNER_LEASE_SECONDS,
+        ):
+            self._requeue_unacknowledged()
+            return token
+        else:
+            return None
+
+    def renew(self, *, token):
+        """Extend the ownership, returns False if it is no longer owned"""
+        return bool(
+            self._client.eval(
+                _RENEW_OWNED_SCRIPT,
+                1,
+                self._owner_key,
+                token,
+                OWNER_LEASE_SECONDS,
+            )
+        )
+
+    def release_if_drained(self, *, token):
+        """Release the ownership, unless items remain in the queue"""
+        return bool(
+            self._client.eval(
+                _RELEASE_IF_DRAINED_SCRIPT,
+                2,
+                self._queue_key,
+                self._owner_key,
+                token,
+            )
+        )
+
+    def release(self, *, token):
+        self._client.eval(_RELEASE_OWNED_SCRIPT, 1, self._owner_key, token)
+
+    @property
+    def is_owned(self):
+        return bool(self._client.exists(self._owner_key))
+
+
+def get_unowned_queues():
+    """
+    Get the queues with items that are not owned by a worker
+
+    These occur when a worker is lost while draining a queue.
+    """
+    client = get_redis_connection("default")
+    seen = set()
+
+    for prefix in (QUEUE_KEY_PREFIX, PROCESSING_KEY_PREFIX):
+        for redis_key in client.scan_iter(match=f"{prefix}:*"):
+            _, task_name, key = redis_key.decode("utf-8").split(":", 2)
+
+            if (task_name, key) in seen:
+                continue
+
+            seen.add((task_name, key))
+            queue = SerializedTaskQueue(task_name=task_name, key=key)
+
+            if not queue.is_owned:
+                yield queue
@@ -0,0 +1,140 @@
+import logging
+import uuid
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+STATUS_FIELD = "status"
+
+# Only increment counters that have been initialised by a reconciliation,
+# otherwise a partial hash would be reported as the full set of counts
+_INCREMENT_EXISTING_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    for i = 1, #ARGV, 2 do
+        redis.call("HINCRBY", KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+"""
+
+
+def _get_status_counters_key(*, model):
+    # The database name is included as several databases
+    # (e.g. test databases) can share the same redis instance
+    return cache.make_key(
+        f"status-counters:{connection.settings_dict['NAME']}:"
+        f"{model._meta.label_lower}"
+    )
+
+
+def update_status_counters(*, model, deltas):
+    """
+    Update the cached per-status counts of a model
+
+    The counters are updated immediately rather than when the current
+    transaction commits. If the transaction is rolled back the counters
+    drift until the next reconciliation.
+
+    Parameters
+    ----------
+    model
+        The model class that has a status field
+    deltas
+        A mapping of status value to the change in the number of objects
+        that have that status
+    """
+    deltas = {status: delta for status, delta in deltas.items() if delta != 0}
+
+    if deltas:
+        client = get_redis_connection("default")
+        client.eval(
+            _INCREMENT_EXISTING_SCRIPT,
+            1,
+            _get_status_counters_key(model=model),
+            *(
+                value
+                for status, delta in deltas.items()
+                for value in (str(status), delta)
+            ),
+        )
+
+
+def get_status_counts(*, model):
+    """
+    Get the cached per-status counts of a model
+
+    Returns
+    -------
+        A dictionary of status value to the number of objects with that
+        status, or None if the counters have not been initialised
+    """
+    client = get_redis_connection("default")
+    counters = client.hgetall(_get_status_counters_key(model=model))
+
+    if not counters:
+        return None
+
+    field = model._meta.get_field(STATUS_FIELD)
+
+    return {
+        field.to_python(status.decode("utf-8")): int(count)
+        for status, count in counters.items()
+    }
+
+
+def reconcile_status_counters(*, model):
+    """
+    Replace the cached per-status counts of a model with counts from the database
+
+    This initialises the counters and corrects any drift caused by
+    queryset updates and deletes, which do not update the counters.
+
+    Returns
+    -------
+        A dictionary of status value to the number of objects with that status
+    """
+    field = model._meta.get_field(STATUS_FIELD)
+
+    counts = Counter({choice: 0 for choice, _ in field.choices})
+    counts.update(
+        {
+            q[STATUS_FIELD]: q[f"{STATUS_FIELD}__count"]
+            for q in model.objects.values(STATUS_FIELD)
+            .annotate(Count(STATUS_FIELD))
+            .order_by(STATUS_FIELD)
+        }
+    )
+
+    previous_counts = get_status_counts(model=model)
+
+    if previous_counts is not None:
+        drift = {
+            status: count - previous_counts.get(status, 0)
+            for status, count in counts.items()
+            if count != previous_counts.get(status, 0)
+        }
+        if drift:
+            logger.warning(
+                f"Status counters for {model._meta.label} drifted by {drift}"
+            )
+
+    key = _get_status_counters_key(model=model)
+    # Write the complete counters to a new key and rename it over the
+    # current counters, so that they are replaced in a single operation
+    # and are never missing or partial while they are being written
+    tmp_key = f"{key}:reconciling:{uuid.uuid4()}"
+
+    client = get_redis_connection("default")
+    pipeline = client.pipeline(transaction=True)
+    pipeline.hset(
+        tmp_key,
+        mapping={str(status): count for status, count in counts.items()},
+    )
+    pipeline.rename(tmp_key, key)
+    pipeline.execute()
+
+    return dict(counts)
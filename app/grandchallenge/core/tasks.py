@@ -2,10 +2,10 @@ from datetime import timedelta
 
 import boto3
 from billiard.exceptions import SoftTimeLimitExceeded, TimeLimitExceeded
+from celery import current_app
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.db import transaction
-from django.db.models import Count
 from django.utils import timezone
 from django.utils.timezone import now
 from django_celery_results.models import TaskResult
@@ -17,6 +17,11 @@ from grandchallenge.cases.models import (
     RawImageUploadSession,
 )
 from grandchallenge.core.celery import acks_late_micro_short_task
+from grandchallenge.core.serialized_tasks import get_unowned_queues
+from grandchallenge.core.status_counters import (
+    get_status_counts,
+    reconcile_status_counters,
+)
 from grandchallenge.evaluation.models import Evaluation, Method
 from grandchallenge.workstations.models import Session
 
@@ -55,30 +60,62 @@ def put_cloudwatch_metrics():
             )
 
 
+@acks_late_micro_short_task(
+    ignore_result=True,
+    singleton=True,
+    # No need to retry here as the periodic task call this again
+    ignore_errors=(LockError,),
+)
+def drain_unowned_serialized_task_queues():
+    """Resumes the serialized task queues whose owner was lost"""
+    for queue in get_unowned_queues():
+        task = current_app.tasks.get(queue.task_name)
+
+        # The queues of tasks that no longer exist are left alone
+        if task is not None:
+            task.apply_async(kwargs={"_serialized_key": queue.key})
+
+
+STATUS_COUNTED_MODELS = (
+    Job,
+    Evaluation,
+    Session,
+    RawImageUploadSession,
+    PostProcessImageTask,
+)
+
+
+@acks_late_micro_short_task(
+    ignore_result=True,
+    singleton=True,
+    # No need to retry here as the periodic task call this again
+    ignore_errors=(LockError,),
+)
+def reconcile_all_status_counters():
+    """Corrects any drift in the cached per-status counts of the models"""
+    for model in STATUS_COUNTED_MODELS:
+        reconcile_status_counters(model=model)
+
+
 def _get_metrics():
     site = Site.objects.get_current()
     metric_data = []
 
-    # Create CloudWatch metrics for a choice field in a model
-    models = [
-        Job,
-        Evaluation,
-        Session,
-        RawImageUploadSession,
-        PostProcessImageTask,
-    ]
-    field = "status"
-
-    for model in models:
-        choice_to_display = dict(getattr(model, field).field.choices)
+    # Create CloudWatch metrics for the status field of each model
+    for model in STATUS_COUNTED_MODELS:
+        choice_to_display = dict(model._meta.get_field("status").choices)
 
         def choice_to_name(choice):
             return f"{model.__name__}s{choice_to_display[choice]}".translate(
                 {ord(c): None for c in " -."}
             )
 
-        qs = model.objects.values(field).annotate(Count(field)).order_by(field)
-        counts = {q[field]: q[f"{field}__count"] for q in qs}
+        counts = get_status_counts(model=model)
+
+        if counts is None:
+            # The counters are maintained as the statuses change,
+            # so they only need initialising here
+            counts = reconcile_status_counters(model=model)
 
         metric_data.append(
             {
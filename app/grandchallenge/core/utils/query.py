@@ -1,8 +1,9 @@
 from contextlib import contextmanager
 
-from django.db import OperationalError, connection
+from django.db import OperationalError
 
 from grandchallenge.core.exceptions import LockNotAcquiredException
+from grandchallenge.core.metrics import increment
 
 
 def index(queryset, obj):
@@ -17,20 +18,13 @@ def index(queryset, obj):
     return -1
 
 
-def set_seed(seed):
-    # Note: this only works for postgres, if we ever switch dbs, this
-    # may need changing.
-    cursor = connection.cursor()
-    cursor.execute(f"SELECT setseed({seed});")
-    cursor.close()
-
-
 @contextmanager
 def check_lock_acquired():
     try:
         yield
     except OperationalError as error:
         if "could not obtain lock" in str(error):
+            increment("LocksNotAcquired")
             raise LockNotAcquiredException from error
         else:
             raise error
@@ -0,0 +1,35 @@
+from threading import Lock
+from time import monotonic, sleep
+
+
+class TokenBucket:
+    """
+    A thread safe token bucket that limits calls to `rate` per second,
+    allowing bursts of up to `capacity` calls.
+    """
+
+    def __init__(self, *, rate, capacity=None):
+        self._rate = rate
+        self._capacity = capacity or rate
+        self._tokens = self._capacity
+        self._updated_at = monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        """Blocks until a token is available, then consumes it"""
+        while True:
+            with self._lock:
+                now = monotonic()
+                self._tokens = min(
+                    self._capacity,
+                    self._tokens + (now - self._updated_at) * self._rate,
+                )
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self._rate
+
+            sleep(wait)
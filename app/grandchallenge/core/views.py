@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from random import choice
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.messages.views import SuccessMessageMixin
 from django.core.exceptions import ImproperlyConfigured, ValidationError
@@ -15,6 +16,7 @@ from django.http import (
 from django.shortcuts import get_object_or_404, redirect
 from django.template import loader
 from django.templatetags.static import static
+from django.utils.crypto import constant_time_compare
 from django.views import View
 from django.views.generic import TemplateView, UpdateView
 from guardian.mixins import LoginRequiredMixin
@@ -23,6 +25,10 @@ from grandchallenge.algorithms.models import Algorithm
 from grandchallenge.blogs.models import Post
 from grandchallenge.challenges.models import Challenge
 from grandchallenge.core.guardian import ObjectPermissionRequiredMixin
+from grandchallenge.core.metrics import (
+    PrometheusMetricsExporter,
+    get_metrics_exporter,
+)
 from grandchallenge.subdomains.utils import reverse, reverse_lazy
 
 
@@ -226,6 +232,26 @@ def healthcheck(request):
     return HttpResponse("")
 
 
+def prometheus_metrics(request):
+    exporter = get_metrics_exporter()
+
+    if not (
+        isinstance(exporter, PrometheusMetricsExporter)
+        and settings.METRICS_PROMETHEUS_BEARER_TOKEN
+    ):
+        return HttpResponseNotFound()
+
+    if not constant_time_compare(
+        request.headers.get("Authorization", ""),
+        f"Bearer {settings.METRICS_PROMETHEUS_BEARER_TOKEN}",
+    ):
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        exporter.render(), content_type="text/plain; version=0.0.4"
+    )
+
+
 class RedirectPath(View):
     """Redirects all sub-paths to a different domain."""
 
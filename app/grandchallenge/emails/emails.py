@@ -3,6 +3,8 @@ from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 from django.utils.html import format_html
 
+from grandchallenge.core.templatetags.bleach import md2email_html
+
 
 def send_standard_email_batch(
     *,
@@ -16,6 +18,9 @@ def send_standard_email_batch(
     connection = get_connection()
     messages = []
 
+    # The message is the same for all recipients so only render it once
+    html_message = md2email_html(markdown_message)
+
     for recipient in recipients:
         try:
             messages.append(
@@ -27,6 +32,7 @@ def send_standard_email_batch(
                     subscription_type=subscription_type,
                     connection=connection,
                     user_email_override=user_email_override,
+                    html_message=html_message,
                 )
             )
         except ValueError:
@@ -56,7 +62,11 @@ def create_email_object(
     connection,
     subscription_type,
     user_email_override=None,
+    html_message=None,
 ):
+    if html_message is None:
+        html_message = md2email_html(markdown_message)
+
     unsubscribe_link = recipient.user_profile.get_unsubscribe_link(
         subscription_type=subscription_type
     )
@@ -67,7 +77,7 @@ def create_email_object(
         {
             "title": subject,
             "username": recipient.username,
-            "content": markdown_message,
+            "content": html_message,
             "unsubscribe_link": unsubscribe_link,
             "subscription_type": subscription_type,
             "site": site,
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.26 on 2026-10-17 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emails", "0004_rawemail_errored"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rawemail",
+            name="leased_until",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Until when the email is reserved for sending by a worker",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.26 on 2026-10-17 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emails", "0005_rawemail_leased_until"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="email",
+            name="status_report",
+            field=models.JSONField(
+                blank=True,
+                default=None,
+                help_text="This stores the progress of sending this email, used to resume sending.",
+                null=True,
+            ),
+        ),
+    ]
@@ -18,7 +18,7 @@ class Email(models.Model):
         blank=True,
         null=True,
         default=None,
-        help_text="This stores the page number of the last successfully sent email batch for this email.",
+        help_text="This stores the progress of sending this email, used to resume sending.",
     )
 
     class Meta:
@@ -52,6 +52,11 @@ class RawEmail(UUIDModel):
     message = models.TextField(editable=False)
     errored = models.BooleanField(default=False)
     sent_at = models.DateTimeField(blank=True, null=True)
+    leased_until = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="Until when the email is reserved for sending by a worker",
+    )
 
     class Meta:
         ordering = ("-created",)
@@ -1,4 +1,4 @@
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import timedelta
 
 import boto3
@@ -9,12 +9,13 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
 from django.core.exceptions import ObjectDoesNotExist
-from django.core.paginator import Paginator
 from django.db import transaction
+from django.db.models import Max, Q
 from django.utils.timezone import now
 from redis.exceptions import LockError
 
 from grandchallenge.core.celery import acks_late_micro_short_task
+from grandchallenge.core.utils.rate_limit import TokenBucket
 from grandchallenge.emails.emails import send_standard_email_batch
 from grandchallenge.emails.models import Email, RawEmail
 from grandchallenge.emails.utils import SendActionChoices
@@ -22,6 +23,11 @@ from grandchallenge.profiles.models import EmailSubscriptionTypes
 
 logger = get_task_logger(__name__)
 
+BULK_EMAIL_BATCH_SIZE = 100
+RAW_EMAILS_BATCH_SIZE = 100
+RAW_EMAILS_SEND_CONCURRENCY = 8
+RAW_EMAILS_LEASE_DURATION = timedelta(minutes=5)
+
 
 def get_receivers(action):
     if action == SendActionChoices.MAILING_LIST:
@@ -75,6 +81,35 @@ def get_receivers(action):
     return receivers
 
 
+def _get_bulk_email_status_report(*, email, receivers):
+    """
+    Returns the progress of sending a bulk email
+
+    The receivers are snapshotted when sending starts by recording the
+    highest receiver pk, users who join later are not sent the email.
+    The pk of the last receiver that was sent the email is the high-water
+    mark that sending resumes from.
+    """
+    if email.status_report and "max_receiver_pk" in email.status_report:
+        return email.status_report
+
+    if email.status_report and "last_processed_batch" in email.status_report:
+        # Resume sending that was started with offset pagination
+        skipped_receivers = receivers.values_list("pk", flat=True)[
+            : email.status_report["last_processed_batch"]
+            * BULK_EMAIL_BATCH_SIZE
+        ]
+        last_processed_receiver_pk = max(skipped_receivers, default=0)
+    else:
+        last_processed_receiver_pk = 0
+
+    return {
+        "last_processed_receiver_pk": last_processed_receiver_pk,
+        "max_receiver_pk": receivers.aggregate(max_pk=Max("pk"))["max_pk"]
+        or 0,
+    }
+
+
 @acks_late_micro_short_task(
     retry_on=(SoftTimeLimitExceeded, TimeLimitExceeded),
     singleton=True,
@@ -86,19 +121,31 @@ def send_bulk_email(*, action, email_pk):
         return
 
     receivers = get_receivers(action=action)
-    paginator = Paginator(receivers, 100)
     site = Site.objects.get_current()
 
-    if email.status_report:
-        start_page = email.status_report["last_processed_batch"]
-    else:
-        start_page = 0
+    status_report = _get_bulk_email_status_report(
+        email=email, receivers=receivers
+    )
+
+    # Materialize the remaining receivers once, the batches are then
+    # fetched by pk rather than with offset queries over the receivers
+    receiver_pks = list(
+        receivers.filter(
+            pk__gt=status_report["last_processed_receiver_pk"],
+            pk__lte=status_report["max_receiver_pk"],
+        ).values_list("pk", flat=True)
+    )
 
     # Transaction and locking unnecessary here as a cache lock is being used
-    for page_nr in paginator.page_range[start_page:]:
+    for start in range(0, len(receiver_pks), BULK_EMAIL_BATCH_SIZE):
+        batch_pks = receiver_pks[start : start + BULK_EMAIL_BATCH_SIZE]
+
         send_standard_email_batch(
             site=site,
-            recipients=paginator.page(page_nr).object_list,
+            recipients=get_user_model()
+            .objects.filter(pk__in=batch_pks)
+            .select_related("user_profile")
+            .order_by("pk"),
             subject=email.subject,
             markdown_message=email.body,
             subscription_type=(
@@ -107,8 +154,10 @@ def send_bulk_email(*, action, email_pk):
                 else EmailSubscriptionTypes.NEWSLETTER
             ),
         )
-        email.status_report = {"last_processed_batch": page_nr}
-        email.save()
+
+        status_report["last_processed_receiver_pk"] = batch_pks[-1]
+        email.status_report = status_report
+        email.save(update_fields=["status_report"])
 
     email.sent = True
     email.sent_at = now()
@@ -116,6 +165,72 @@ def send_bulk_email(*, action, email_pk):
     email.save()
 
 
+def _lease_raw_emails():
+    """Reserves the next batch of unsent emails for this worker"""
+    with transaction.atomic():
+        pks = list(
+            RawEmail.objects.filter(sent_at__isnull=True, errored=False)
+            .filter(Q(leased_until__isnull=True) | Q(leased_until__lt=now()))
+            .order_by("created")
+            .select_for_update(skip_locked=True)
+            .values_list("pk", flat=True)[:RAW_EMAILS_BATCH_SIZE]
+        )
+        RawEmail.objects.filter(pk__in=pks).update(
+            leased_until=now() + RAW_EMAILS_LEASE_DURATION
+        )
+
+    return RawEmail.objects.filter(pk__in=pks).only("pk", "message")
+
+
+def _send_raw_email(*, client, rate_limiter, raw_email):
+    rate_limiter.acquire()
+
+    if client is None:
+        return {"MessageId": "debug"}
+    else:
+        return client.send_raw_email(RawMessage={"Data": raw_email.message})
+
+
+def _update_sent_raw_emails(*, futures):
+    """
+    Records the outcome of each email as it is sent, returning whether
+    the batch was throttled
+
+    The outcomes are saved as the sends complete rather than once the
+    batch is done, so an email that was sent is not sent again if the
+    worker is lost or times out part way through a batch.
+    """
+    throttled = False
+
+    for future in as_completed(futures):
+        pk = futures[future]
+
+        try:
+            response = future.result()
+        except ClientError as error:
+            if error.response["Error"]["Code"] == "Throttling":
+                # Leave the email to be sent by the next worker
+                throttled = True
+                RawEmail.objects.filter(pk=pk).update(leased_until=None)
+                continue
+            logger.error(f"Error sending raw email {pk}: {error}")
+            RawEmail.objects.filter(pk=pk).update(
+                errored=True, leased_until=None
+            )
+        except BotoCoreError as error:
+            logger.error(f"Error sending raw email {pk}: {error}")
+            RawEmail.objects.filter(pk=pk).update(
+                errored=True, leased_until=None
+            )
+        else:
+            logger.info(f"Sent raw email {pk}: {response['MessageId']}")
+            RawEmail.objects.filter(pk=pk).update(
+                sent_at=now(), leased_until=None
+            )
+
+    return throttled
+
+
 @acks_late_micro_short_task(
     ignore_result=True,
     singleton=True,
@@ -123,44 +238,40 @@ def send_bulk_email(*, action, email_pk):
     ignore_errors=(LockError, SoftTimeLimitExceeded, TimeLimitExceeded),
 )
 def send_raw_emails():
+    """
+    Sends the unsent emails with SES
+
+    The emails are leased in batches and sent concurrently, limited
+    by a token bucket that is sized to the SES send quota. The leases
+    expire, so emails that were leased by a lost worker are sent again
+    by the next one. The task is a singleton as the token bucket limits
+    the send rate of a single process.
+    """
     if settings.DEBUG:
         client = None
-        min_send_duration = timedelta(seconds=1)
+        max_send_rate = 1
     else:
         client = boto3.client("ses", region_name=settings.AWS_SES_REGION_NAME)
-        min_send_duration = timedelta(
-            seconds=1 / int(client.get_send_quota()["MaxSendRate"])
-        )
+        max_send_rate = client.get_send_quota()["MaxSendRate"]
 
-    # Transaction and locking unnecessary here as a cache lock is being used
-    for raw_email in RawEmail.objects.filter(
-        sent_at__isnull=True, errored=False
-    ).iterator():
-        start = now()
-
-        try:
-            if settings.DEBUG:
-                response = {"MessageId": "debug"}
-            else:
-                response = client.send_raw_email(
-                    RawMessage={"Data": raw_email.message}
-                )
-        except (ClientError, BotoCoreError) as error:
-            raw_email.errored = True
-            raw_email.save()
-            logger.error(f"Error sending raw email {raw_email.pk}: {error}")
-            continue
-        else:
-            raw_email.sent_at = now()
-            raw_email.save()
-            logger.info(
-                f"Sent raw email {raw_email.pk}: {response['MessageId']}"
-            )
+    rate_limiter = TokenBucket(rate=max_send_rate)
 
-        elapsed = now() - start
+    with ThreadPoolExecutor(max_workers=RAW_EMAILS_SEND_CONCURRENCY) as pool:
+        while raw_emails := _lease_raw_emails():
+            futures = {
+                pool.submit(
+                    _send_raw_email,
+                    client=client,
+                    rate_limiter=rate_limiter,
+                    raw_email=raw_email,
+                ): raw_email.pk
+                for raw_email in raw_emails
+            }
 
-        if elapsed < min_send_duration:
-            time.sleep((min_send_duration - elapsed).total_seconds())
+            if _update_sent_raw_emails(futures=futures):
+                # Back off, the periodic task will send the rest
+                logger.warning("Sending raw emails was throttled")
+                break
 
 
 @acks_late_micro_short_task
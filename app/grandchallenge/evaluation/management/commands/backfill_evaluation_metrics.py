@@ -0,0 +1,51 @@
+from django.core.management import BaseCommand
+from django.db.transaction import on_commit
+
+from grandchallenge.evaluation.models import (
+    Evaluation,
+    Phase,
+    PhaseRankingIndex,
+)
+from grandchallenge.evaluation.tasks import calculate_ranks
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-extract the leaderboard metrics of the successful evaluations "
+        "from their outputs and recalculate the ranks of their phases"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--challenge",
+            type=str,
+            required=False,
+            help="Only backfill the phases of the challenge with this short name",
+        )
+
+    def handle(self, *args, **options):
+        phases = Phase.objects.filter(
+            submission__evaluation__status=Evaluation.SUCCESS
+        ).distinct()
+
+        if options["challenge"] is not None:
+            phases = phases.filter(
+                challenge__short_name__iexact=options["challenge"]
+            )
+
+        phase_pks = list(phases.values_list("pk", flat=True))
+
+        # Invalidating the extracted metric paths forces the full rebuild
+        # to read the metrics from the outputs again
+        PhaseRankingIndex.objects.filter(phase__pk__in=phase_pks).update(
+            metric_paths=[]
+        )
+
+        for phase_pk in phase_pks:
+            on_commit(
+                calculate_ranks.signature(
+                    kwargs={"phase_pk": phase_pk}
+                ).apply_async
+            )
+
+        self.stdout.write(f"Scheduled backfill for {len(phase_pks)} phases")
@@ -0,0 +1,107 @@
+# Generated by Django 4.2.26 on 2026-10-17 07:33
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        (
+            "evaluation",
+            "0101_evaluation_exec_duration_evaluation_invoke_duration",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PhaseRankingIndex",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                (
+                    "metrics",
+                    models.JSONField(
+                        default=list,
+                        editable=False,
+                        help_text="The metrics that the entries were extracted for",
+                    ),
+                ),
+                (
+                    "phase",
+                    models.OneToOneField(
+                        editable=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ranking_index",
+                        to="evaluation.phase",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="PhaseRankingEntry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(editable=False)),
+                (
+                    "metric_values",
+                    models.JSONField(
+                        editable=False,
+                        help_text="The values of the valid metrics of the phase",
+                        null=True,
+                    ),
+                ),
+                (
+                    "creator",
+                    models.ForeignKey(
+                        editable=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "evaluation",
+                    models.OneToOneField(
+                        editable=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="evaluation.evaluation",
+                    ),
+                ),
+                (
+                    "ranking_index",
+                    models.ForeignKey(
+                        editable=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="entries",
+                        to="evaluation.phaserankingindex",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.26 on 2026-10-17 07:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluation", "0102_phaserankingindex"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evaluation",
+            name="metrics",
+            field=models.JSONField(
+                default=dict,
+                editable=False,
+                help_text="The values from the metrics json file that are used by the leaderboard of the phase, keyed by path",
+            ),
+        ),
+        migrations.AddField(
+            model_name="phaserankingindex",
+            name="metric_paths",
+            field=models.JSONField(
+                default=list,
+                editable=False,
+                help_text="The metric paths that the evaluation metrics were extracted for",
+            ),
+        ),
+    ]
@@ -1,7 +1,9 @@
 import logging
 from datetime import timedelta
+from functools import partial
 from statistics import mean, median
 
+import numpy as np
 from actstream.actions import follow, is_following
 from django.conf import settings
 from django.contrib.auth.models import Group
@@ -70,14 +72,17 @@ from grandchallenge.evaluation.tasks import (
     calculate_ranks,
     check_prerequisites_for_evaluation_execution,
     update_combined_leaderboard,
+    update_ranks_for_evaluation,
 )
 from grandchallenge.evaluation.templatetags.evaluation_extras import (
     get_jsonpath,
 )
 from grandchallenge.evaluation.utils import (
     Metric,
+    RankingEntry,
     StatusChoices,
     SubmissionKindChoices,
+    get_metric_row,
 )
 from grandchallenge.hanging_protocols.models import HangingProtocolMixin
 from grandchallenge.notifications.models import (
@@ -192,33 +197,17 @@ def get_valid_jobs_for_interfaces_and_archive_items(
 
     jobs_per_interface = {}
     for interface in algorithm_interfaces:
-        jobs_per_interface[interface] = []
-        jobs_for_interface = (
+        # subset to jobs whose input set exactly matches
+        # one of the valid archive items' value sets
+        jobs_per_interface[interface] = list(
             jobs.filter(
                 algorithm_interface=interface,
-                inputs__archive_items__in=valid_archive_items_per_interface[
+                inputs_fingerprint__in=valid_archive_items_per_interface[
                     interface
-                ],
-            )
-            .distinct()
-            .prefetch_related("inputs")
-            .select_related("algorithm_image__algorithm")
+                ].values("values_fingerprint"),
+            ).select_related("algorithm_image__algorithm")
         )
 
-        archive_item_value_sets = {
-            frozenset(value.pk for value in item.values.all())
-            for item in valid_archive_items_per_interface[interface]
-        }
-
-        for job in jobs_for_interface:
-            # subset to jobs whose input set exactly matches
-            # one of the valid archive items' value sets
-            if (
-                frozenset(inpt.pk for inpt in job.inputs.all())
-                in archive_item_value_sets
-            ):
-                jobs_per_interface[interface].append(job)
-
     return jobs_per_interface
 
 
@@ -740,6 +729,7 @@ class Phase(FieldChangeMixin, HangingProtocolMixin, UUIDModel):
         if adding:
             self.set_default_interfaces()
             self.assign_permissions()
+            PhaseRankingIndex.objects.create(phase=self)
             for admin in self.challenge.get_admins():
                 if not is_following(admin, self):
                     follow(
@@ -896,12 +886,12 @@ class Phase(FieldChangeMixin, HangingProtocolMixin, UUIDModel):
         if self.scoring_method_choice == self.ABSOLUTE:
 
             def scoring_method(x):
-                return list(x)[0]
+                return x[:, 0]
 
         elif self.scoring_method_choice == self.MEAN:
-            scoring_method = mean
+            scoring_method = partial(np.mean, axis=1)
         elif self.scoring_method_choice == self.MEDIAN:
-            scoring_method = median
+            scoring_method = partial(np.median, axis=1)
         else:
             raise NotImplementedError
 
@@ -930,6 +920,16 @@ class Phase(FieldChangeMixin, HangingProtocolMixin, UUIDModel):
             ],
         )
 
+    @property
+    def metric_paths(self):
+        """The paths in the metrics json file used by the leaderboard"""
+        paths = {self.score_jsonpath, self.score_error_jsonpath}
+
+        for col in self.extra_results_columns:
+            paths.update({col["path"], col.get("error_path", "")})
+
+        return sorted(path for path in paths if path)
+
     @property
     def read_only_fields_for_dependent_phases(self):
         return ["submission_kind"]
@@ -1924,6 +1924,14 @@ class Evaluation(CIVForObjectMixin, ComponentJob):
     )
     rank_score = models.FloatField(default=0.0)
     rank_per_metric = models.JSONField(default=dict)
+    metrics = models.JSONField(
+        default=dict,
+        editable=False,
+        help_text=(
+            "The values from the metrics json file that are used by the "
+            "leaderboard of the phase, keyed by path"
+        ),
+    )
     claimed_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True,
@@ -1955,8 +1963,8 @@ class Evaluation(CIVForObjectMixin, ComponentJob):
         self.assign_permissions()
 
         on_commit(
-            calculate_ranks.signature(
-                kwargs={"phase_pk": self.submission.phase.pk}
+            update_ranks_for_evaluation.signature(
+                kwargs={"evaluation_pk": self.pk}
             ).apply_async
         )
 
@@ -2146,11 +2154,24 @@ class Evaluation(CIVForObjectMixin, ComponentJob):
         return {
             metric.path
             for metric in self.submission.phase.valid_metrics
-            if not isinstance(
-                get_jsonpath(self.metrics_json_file, metric.path), (int, float)
-            )
+            if not isinstance(self.metrics.get(metric.path), (int, float))
         }
 
+    def update_metrics(self):
+        """Extract the values used by the leaderboard from the outputs"""
+        self.__dict__.pop("metrics_json_file", None)
+        self.__dict__.pop("invalid_metrics", None)
+
+        metrics = {}
+
+        for path in self.submission.phase.metric_paths:
+            value = get_jsonpath(self.metrics_json_file, path)
+
+            if value != "":
+                metrics[path] = value
+
+        self.metrics = metrics
+
     def clean(self):
         if self.submission.phase != self.method.phase:
             raise ValidationError(
@@ -2220,6 +2241,147 @@ class EvaluationGroupObjectPermission(GroupObjectPermissionBase):
     content_object = models.ForeignKey(Evaluation, on_delete=models.CASCADE)
 
 
+class PhaseRankingIndex(UUIDModel):
+    """
+    The metric values of the evaluations that are ranked on a phase
+
+    Used to update the leaderboard when a single evaluation changes
+    without reading the metrics of every other evaluation of the phase.
+    """
+
+    phase = models.OneToOneField(
+        Phase,
+        on_delete=models.CASCADE,
+        editable=False,
+        related_name="ranking_index",
+    )
+    metrics = models.JSONField(
+        default=list,
+        editable=False,
+        help_text="The metrics that the entries were extracted for",
+    )
+    metric_paths = models.JSONField(
+        default=list,
+        editable=False,
+        help_text="The metric paths that the evaluation metrics were extracted for",
+    )
+
+    @property
+    def is_valid(self):
+        return self.metrics == self._phase_metrics and self.metrics_are_valid
+
+    @property
+    def metrics_are_valid(self):
+        return self.metric_paths == self.phase.metric_paths
+
+    @property
+    def _phase_metrics(self):
+        return [list(metric) for metric in self.phase.valid_metrics]
+
+    @property
+    def ranking_entries(self):
+        """The entries ordered from the most recent to the oldest"""
+        return [
+            RankingEntry(str(pk), creator, created.timestamp(), values)
+            for pk, creator, created, values in self.entries.order_by(
+                "-created"
+            ).values_list(
+                "evaluation_id", "creator_id", "created", "metric_values"
+            )
+        ]
+
+    def _get_entry(self, *, evaluation):
+        if evaluation.status == evaluation.SUCCESS and evaluation.published:
+            return PhaseRankingEntry(
+                ranking_index=self,
+                evaluation=evaluation,
+                creator_id=evaluation.submission.creator_id,
+                created=evaluation.created,
+                metric_values=get_metric_row(
+                    evaluation_metrics=evaluation.metrics,
+                    metrics=self.phase.valid_metrics,
+                ),
+            )
+        else:
+            return None
+
+    def set_entry(self, *, evaluation):
+        """
+        Add, update or remove the entry for an evaluation
+
+        Only the row of this evaluation is written.
+        """
+        entry = self._get_entry(evaluation=evaluation)
+
+        if entry is None:
+            self.entries.filter(evaluation=evaluation).delete()
+            return
+
+        current = (
+            self.entries.filter(evaluation=evaluation)
+            .values_list("creator_id", "created", "metric_values")
+            .first()
+        )
+
+        if current is None:
+            entry.save()
+        elif current != (entry.creator_id, entry.created, entry.metric_values):
+            self.entries.filter(evaluation=evaluation).update(
+                creator_id=entry.creator_id,
+                created=entry.created,
+                metric_values=entry.metric_values,
+            )
+
+    def rebuild(self, *, evaluations):
+        """Replace all of the entries with those of the evaluations"""
+        self.metrics = self._phase_metrics
+        self.metric_paths = self.phase.metric_paths
+        self.save()
+
+        self.entries.all().delete()
+        PhaseRankingEntry.objects.bulk_create(
+            (
+                entry
+                for evaluation in evaluations
+                if (entry := self._get_entry(evaluation=evaluation))
+                is not None
+            ),
+            batch_size=1000,
+        )
+
+
+class PhaseRankingEntry(models.Model):
+    """
+    The creator, created timestamp and metric values of a published,
+    successful evaluation of the phase of a ranking index
+    """
+
+    ranking_index = models.ForeignKey(
+        PhaseRankingIndex,
+        on_delete=models.CASCADE,
+        editable=False,
+        related_name="entries",
+    )
+    evaluation = models.OneToOneField(
+        Evaluation,
+        on_delete=models.CASCADE,
+        editable=False,
+        related_name="+",
+    )
+    creator = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        editable=False,
+        related_name="+",
+    )
+    created = models.DateTimeField(editable=False)
+    metric_values = models.JSONField(
+        null=True,
+        editable=False,
+        help_text="The values of the valid metrics of the phase",
+    )
+
+
 class CombinedLeaderboard(TitleSlugDescriptionModel, UUIDModel):
     class CombinationMethodChoices(models.TextChoices):
         MEAN = "MEAN", "Mean"
@@ -4,6 +4,7 @@ from django.dispatch import receiver
 from grandchallenge.evaluation.models import (
     CombinedLeaderboard,
     CombinedLeaderboardPhase,
+    Evaluation,
 )
 
 
@@ -24,3 +25,19 @@ def handle_combined_leaderboard_phase_change(
 
     for leaderboard in leaderboards:
         leaderboard.schedule_combined_ranks_update()
+
+
+@receiver(m2m_changed, sender=Evaluation.outputs.through)
+def update_evaluation_metrics_on_outputs_change(
+    *, instance, action, reverse, **_
+):
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        # nothing to do for the other actions
+        return
+
+    if reverse:
+        # Outputs are only ever added to evaluations from the forward side
+        return
+
+    instance.update_metrics()
+    Evaluation.objects.filter(pk=instance.pk).update(metrics=instance.metrics)
@@ -5,7 +5,7 @@ from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import Case, IntegerField, Value, When
+from django.db.models import Case, IntegerField, Q, Value, When
 from django.db.transaction import on_commit
 from django.utils.timezone import now
 
@@ -24,7 +24,11 @@ from grandchallenge.core.celery import (
 from grandchallenge.core.exceptions import LockNotAcquiredException
 from grandchallenge.core.utils.query import check_lock_acquired
 from grandchallenge.core.validators import get_file_mimetype
-from grandchallenge.evaluation.utils import SubmissionKindChoices, rank_results
+from grandchallenge.evaluation.utils import (
+    SubmissionKindChoices,
+    get_metric_values_for_entries,
+    rank_metric_values,
+)
 
 logger = get_task_logger(__name__)
 
@@ -474,7 +478,7 @@ def filter_by_creators_most_recent(*, evaluations):
     filtered_qs = []
 
     for e in evaluations:
-        creator = e.submission.creator
+        creator = e.creator
 
         if creator not in users_seen:
             users_seen.add(creator)
@@ -487,7 +491,7 @@ def filter_by_creators_best(*, evaluations, ranks):
     best_result_per_user = {}
 
     for e in evaluations:
-        creator = e.submission.creator
+        creator = e.creator
 
         try:
             this_rank = ranks[e.pk]
@@ -503,78 +507,207 @@ def filter_by_creators_best(*, evaluations, ranks):
     return [r for r in best_result_per_user.values()]
 
 
-# Use 2xlarge for memory use
-@acks_late_2xlarge_task(
-    retry_on=(LockNotAcquiredException,), delayed_retry=False
-)
-@transaction.atomic
-def calculate_ranks(*, phase_pk: uuid.UUID):
-    from grandchallenge.evaluation.models import Evaluation, Phase
-
-    phase = Phase.objects.get(pk=phase_pk)
-
-    with check_lock_acquired():
-        # Acquire locks
-        evaluations = list(
-            Evaluation.objects.filter(
-                submission__phase=phase,
-                status=Evaluation.SUCCESS,
-            )
-            .select_for_update(nowait=True, of=("self",))
-            .order_by("-created")
-            .select_related("submission__creator", "submission__phase")
-            .prefetch_related("outputs__interface")
-        )
+def get_positions(*, phase, entries):
+    """
+    Calculate the leaderboard positions of the ranking entries of a phase
 
-    valid_evaluations = [
-        e
-        for e in evaluations
-        if e.status == Evaluation.SUCCESS and e.published is True
-    ]
+    The entries must be ordered from the most recent to the oldest.
+    """
+    metric_values = get_metric_values_for_entries(
+        entries=entries, metrics=phase.valid_metrics
+    )
 
     if phase.result_display_choice == phase.MOST_RECENT:
-        valid_evaluations = filter_by_creators_most_recent(
-            evaluations=valid_evaluations
-        )
+        entries = filter_by_creators_most_recent(evaluations=entries)
+        metric_values = metric_values.subset(pks=(e.pk for e in entries))
     elif phase.result_display_choice == phase.BEST:
-        all_positions = rank_results(
-            evaluations=valid_evaluations,
+        all_positions = rank_metric_values(
+            metric_values=metric_values,
             metrics=phase.valid_metrics,
             score_method=phase.scoring_method,
         )
-        valid_evaluations = filter_by_creators_best(
-            evaluations=valid_evaluations, ranks=all_positions.ranks
+        entries = filter_by_creators_best(
+            evaluations=entries, ranks=all_positions.ranks
         )
+        metric_values = metric_values.subset(pks=(e.pk for e in entries))
 
-    final_positions = rank_results(
-        evaluations=valid_evaluations,
+    return rank_metric_values(
+        metric_values=metric_values,
         metrics=phase.valid_metrics,
         score_method=phase.scoring_method,
     )
 
+
+def _get_locked_ranking_index(*, phase_pk):
+    from grandchallenge.evaluation.models import PhaseRankingIndex
+
+    # Ranking updates for a phase are serialised on this single row
+    # rather than by locking each of the evaluations of the phase
+    ranking_index, _ = (
+        PhaseRankingIndex.objects.select_for_update(of=("self",))
+        .select_related("phase")
+        .get_or_create(phase_id=phase_pk)
+    )
+
+    return ranking_index
+
+
+def _get_changed_ranks(*, ranking_index, evaluations):
+    """Set the new ranks on the evaluations and return those that changed"""
+    final_positions = get_positions(
+        phase=ranking_index.phase, entries=ranking_index.ranking_entries
+    )
+
+    changed = []
+
     for e in evaluations:
+        pk = str(e.pk)
+
         try:
-            rank = final_positions.ranks[e.pk]
-            rank_score = final_positions.rank_scores[e.pk]
-            rank_per_metric = final_positions.rank_per_metric[e.pk]
+            rank = final_positions.ranks[pk]
+            rank_score = final_positions.rank_scores[pk]
+            rank_per_metric = final_positions.rank_per_metric[pk]
         except KeyError:
             # This result will be excluded from the display
             rank = 0
             rank_score = 0.0
             rank_per_metric = {}
 
-        e.rank = rank
-        e.rank_score = rank_score
-        e.rank_per_metric = rank_per_metric
+        if (
+            e.rank != rank
+            or e.rank_score != rank_score
+            or e.rank_per_metric != rank_per_metric
+        ):
+            e.rank = rank
+            e.rank_score = rank_score
+            e.rank_per_metric = rank_per_metric
+            changed.append(e)
+
+    return changed
+
+
+def _rebuild_ranks(*, ranking_index):
+    """
+    Rebuild the ranking index from the evaluations of the phase
+
+    If the metric paths of the phase have changed since the metrics were
+    extracted, the metrics of the evaluations are re-extracted from their
+    outputs in the same pass.
+    """
+    from grandchallenge.evaluation.models import Evaluation
+
+    update_metrics = not ranking_index.metrics_are_valid
+
+    evaluations = (
+        Evaluation.objects.filter(submission__phase=ranking_index.phase)
+        .filter(Q(status=Evaluation.SUCCESS) | Q(rank__gt=0))
+        .select_related("submission__phase")
+    )
+
+    if update_metrics:
+        evaluations = evaluations.prefetch_related("outputs__interface")
+
+    evaluations = list(evaluations)
+    changed_metrics = []
+
+    for evaluation in evaluations:
+        if update_metrics and evaluation.status == Evaluation.SUCCESS:
+            metrics = evaluation.metrics
+            evaluation.update_metrics()
+
+            if evaluation.metrics != metrics:
+                changed_metrics.append(evaluation)
+
+    ranking_index.rebuild(evaluations=evaluations)
+
+    changed_ranks = _get_changed_ranks(
+        ranking_index=ranking_index, evaluations=evaluations
+    )
 
     Evaluation.objects.bulk_update(
-        evaluations, ["rank", "rank_score", "rank_per_metric"]
+        {*changed_metrics, *changed_ranks},
+        ["rank", "rank_score", "rank_per_metric", "metrics"],
+        batch_size=1000,
+    )
+
+    return changed_ranks
+
+
+def _update_changed_ranks(*, ranking_index):
+    """Only write the ranks of the evaluations that have changed"""
+    from grandchallenge.evaluation.models import Evaluation
+
+    evaluations = (
+        Evaluation.objects.filter(submission__phase=ranking_index.phase)
+        .filter(Q(status=Evaluation.SUCCESS) | Q(rank__gt=0))
+        .only("pk", "rank", "rank_score", "rank_per_metric")
+    )
+
+    changed = _get_changed_ranks(
+        ranking_index=ranking_index, evaluations=evaluations
     )
 
-    for leaderboard in phase.combinedleaderboard_set.all():
+    Evaluation.objects.bulk_update(
+        changed, ["rank", "rank_score", "rank_per_metric"], batch_size=1000
+    )
+
+    return changed
+
+
+# Use 2xlarge for memory use
+@acks_late_2xlarge_task
+@transaction.atomic
+def calculate_ranks(*, phase_pk: uuid.UUID):
+    """Rebuild the ranking index of a phase and update all of the ranks"""
+    ranking_index = _get_locked_ranking_index(phase_pk=phase_pk)
+
+    _rebuild_ranks(ranking_index=ranking_index)
+
+    for leaderboard in ranking_index.phase.combinedleaderboard_set.all():
         leaderboard.schedule_combined_ranks_update()
 
 
+@acks_late_micro_short_task
+@transaction.atomic
+def update_ranks_for_evaluation(*, evaluation_pk: uuid.UUID):
+    """
+    Update the ranks of a phase after a change to one of its evaluations
+
+    The entry for this evaluation in the ranking index is updated, the
+    phase is re-ranked from the index, and only the evaluations whose
+    positions changed are written. If the index was built for different
+    metrics the full rebuild is left to calculate_ranks, which runs on a
+    queue with enough memory for it.
+    """
+    from grandchallenge.evaluation.models import Evaluation
+
+    ranking_index = _get_locked_ranking_index(
+        phase_pk=Evaluation.objects.values_list(
+            "submission__phase__pk", flat=True
+        ).get(pk=evaluation_pk)
+    )
+
+    # Only read the evaluation once the lock is held so that the
+    # index is never updated with stale values
+    evaluation = Evaluation.objects.select_related("submission").get(
+        pk=evaluation_pk
+    )
+
+    if not ranking_index.is_valid:
+        on_commit(
+            calculate_ranks.signature(
+                kwargs={"phase_pk": ranking_index.phase_id}
+            ).apply_async
+        )
+        return
+
+    ranking_index.set_entry(evaluation=evaluation)
+
+    if _update_changed_ranks(ranking_index=ranking_index):
+        for leaderboard in ranking_index.phase.combinedleaderboard_set.all():
+            leaderboard.schedule_combined_ranks_update()
+
+
 @acks_late_2xlarge_task
 @transaction.atomic
 def update_combined_leaderboard(*, pk):
@@ -1,14 +1,10 @@
-from collections import OrderedDict
 from collections.abc import Callable, Iterable
 from typing import NamedTuple
 
+import numpy as np
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 from django.db import models
 
-from grandchallenge.evaluation.templatetags.evaluation_extras import (
-    get_jsonpath,
-)
-
 
 class Metric(NamedTuple):
     path: str
@@ -31,99 +27,166 @@ def get(inputs):
         raise MultipleObjectsReturned
 
 
-def rank_results(
-    *, evaluations: list, metrics: tuple[Metric, ...], score_method: Callable
-) -> Positions:
-    """Determine the overall rank for each result."""
-    evaluations = _filter_valid_results(
-        evaluations=evaluations, metrics=metrics
-    )
+class MetricValues(NamedTuple):
+    """
+    The values of each metric for a set of evaluations
 
-    rank_per_metric = _get_rank_per_metric(
-        evaluations=evaluations, metrics=metrics
-    )
+    The rows of ``values`` correspond to the evaluation primary keys in
+    ``pks``, the columns to the metrics in the order they were given.
+    """
 
-    rank_scores = {
-        pk: score_method([m for m in metrics.values()])
-        for pk, metrics in rank_per_metric.items()
-    }
+    pks: tuple
+    values: np.ndarray
 
-    return Positions(
-        ranks=_scores_to_ranks(scores=rank_scores, reverse=False),
-        rank_scores=rank_scores,
-        rank_per_metric=rank_per_metric,
-    )
+    def subset(self, *, pks: Iterable) -> "MetricValues":
+        """Select the rows for the given evaluation primary keys"""
+        pks = set(pks)
+        mask = np.fromiter(
+            (pk in pks for pk in self.pks), dtype=bool, count=len(self.pks)
+        )
+        return MetricValues(
+            pks=tuple(
+                pk for pk, keep in zip(self.pks, mask, strict=True) if keep
+            ),
+            values=self.values[mask],
+        )
 
 
-def _filter_valid_results(
-    *, evaluations: Iterable, metrics: tuple[Metric, ...]
-) -> list:
-    """Ensure that all the metrics are in every result."""
-    return [e for e in evaluations if not e.invalid_metrics]
+class RankingEntry(NamedTuple):
+    """A published, successful evaluation that is a candidate for ranking"""
+
+    pk: str
+    creator: int
+    created: float
+    values: list[float] | None
 
 
-def _get_rank_per_metric(
+def get_metric_row(
+    *, evaluation_metrics: dict, metrics: tuple[Metric, ...]
+) -> list[float] | None:
+    """
+    Get the value of each metric from the metrics of an evaluation
+
+    Returns None if any of the metrics do not have a numeric value.
+    """
+    row = [evaluation_metrics.get(m.path) for m in metrics]
+
+    if all(isinstance(value, (int, float)) for value in row):
+        return row
+    else:
+        return None
+
+
+def get_metric_values(
     *, evaluations: Iterable, metrics: tuple[Metric, ...]
-) -> dict[str, dict[str, float]]:
+) -> MetricValues:
     """
-    Takes results and calculates the rank for each of the individual metrics
+    Extract the metric values of the valid evaluations into a matrix
 
-    Returns a dictionary where the key is the pk of the result, and the
-    values is another dictionary where the key is the path of the metric and
-    the value is the rank of this result for this metric
+    Evaluations that do not have a numeric value for every metric
+    are excluded.
     """
-    metric_rank = {}
-    for metric in metrics:
-        # Extract the value of the metric for this primary key and sort on the
-        # value of the metric
-        metric_scores = {
-            e.pk: get_jsonpath(
-                e.metrics_json_file,
-                metric.path,
+    return _get_metric_values_from_rows(
+        rows=(
+            (
+                e.pk,
+                get_metric_row(evaluation_metrics=e.metrics, metrics=metrics),
             )
             for e in evaluations
-        }
-        metric_rank[metric.path] = _scores_to_ranks(
-            scores=metric_scores, reverse=metric.reverse
-        )
+        ),
+        metrics=metrics,
+    )
 
-    return {
-        e.pk: {
-            metric_path: ranks[e.pk]
-            for metric_path, ranks in metric_rank.items()
-        }
-        for e in evaluations
-    }
 
+def get_metric_values_for_entries(
+    *, entries: Iterable[RankingEntry], metrics: tuple[Metric, ...]
+) -> MetricValues:
+    """Create the metric values matrix for the valid ranking entries"""
+    return _get_metric_values_from_rows(
+        rows=((entry.pk, entry.values) for entry in entries),
+        metrics=metrics,
+    )
 
-def _scores_to_ranks(
-    *, scores: dict, reverse: bool = False
-) -> dict[str, float]:
-    """
-    Go from a score (a scalar) to a rank (integer). If two scalars are the
-    same then they will have the same rank.
 
-    Takes a dictionary where the keys are the pk of the results and the values
-    are the scores.
+def _get_metric_values_from_rows(*, rows, metrics) -> MetricValues:
+    pks = []
+    values = []
+
+    for pk, row in rows:
+        if row is not None:
+            pks.append(pk)
+            values.append(row)
+
+    return MetricValues(
+        pks=tuple(pks),
+        values=np.array(values, dtype=np.float64).reshape(
+            len(values), len(metrics)
+        ),
+    )
+
 
-    Outputs a dictionary where they keys are the pk of the results and the
-    values are the ranks.
+def rank_metric_values(
+    *,
+    metric_values: MetricValues,
+    metrics: tuple[Metric, ...],
+    score_method: Callable,
+) -> Positions:
+    """
+    Determine the overall rank for each row of a metric values matrix
+
+    ``score_method`` reduces the matrix of ranks per metric (one row per
+    evaluation, one column per metric) to a vector of rank scores.
     """
-    scores = OrderedDict(
-        sorted(scores.items(), key=lambda t: t[1], reverse=reverse)
+    if not metric_values.pks:
+        return Positions(ranks={}, rank_scores={}, rank_per_metric={})
+
+    metric_ranks = np.column_stack(
+        [
+            _scores_to_ranks(
+                scores=metric_values.values[:, idx], reverse=metric.reverse
+            )
+            for idx, metric in enumerate(metrics)
+        ]
     )
+    rank_scores = np.asarray(score_method(metric_ranks), dtype=np.float64)
+    ranks = _scores_to_ranks(scores=rank_scores, reverse=False)
 
-    ranks = {}
-    current_score = current_rank = None
+    return Positions(
+        ranks=dict(zip(metric_values.pks, ranks.tolist(), strict=True)),
+        rank_scores=dict(
+            zip(metric_values.pks, rank_scores.tolist(), strict=True)
+        ),
+        rank_per_metric={
+            pk: {
+                metric.path: rank
+                for metric, rank in zip(metrics, row, strict=True)
+            }
+            for pk, row in zip(
+                metric_values.pks, metric_ranks.tolist(), strict=True
+            )
+        },
+    )
 
-    for idx, (pk, score) in enumerate(scores.items()):
-        if score != current_score:
-            current_score = score
-            current_rank = idx + 1
 
-        ranks[pk] = current_rank
+def _scores_to_ranks(*, scores: np.ndarray, reverse: bool = False):
+    """
+    Go from a score (a scalar) to a rank (integer). If two scalars are the
+    same then they will have the same rank.
+
+    Takes a vector of scores and outputs a vector of the same length
+    with the rank of each score. The rank of a score is one more than the
+    number of scores that are strictly better than it.
+    """
+    sorted_scores = np.sort(scores, kind="stable")
+
+    if reverse:
+        better = len(scores) - np.searchsorted(
+            sorted_scores, scores, side="right"
+        )
+    else:
+        better = np.searchsorted(sorted_scores, scores, side="left")
 
-    return ranks
+    return better + 1
 
 
 class StatusChoices(models.TextChoices):
@@ -849,22 +849,18 @@ class LeaderboardDetail(
     def get_queryset(self, *args, **kwargs):
         queryset = super().get_queryset(*args, **kwargs)
         queryset = self.filter_by_date(queryset=queryset)
-        queryset = (
-            queryset.filter(
-                # An index is added for these filters, ensure that it
-                # is kept up to date if modified here.
-                submission__phase=self.phase,
-                published=True,
-                status=Evaluation.SUCCESS,
-                rank__gt=0,
-            )
-            .select_related(
-                "submission__creator__user_profile",
-                "submission__creator__verification",
-                "submission__phase__challenge",
-                "submission__algorithm_image__algorithm",
-            )
-            .prefetch_related("outputs__interface")
+        queryset = queryset.filter(
+            # An index is added for these filters, ensure that it
+            # is kept up to date if modified here.
+            submission__phase=self.phase,
+            published=True,
+            status=Evaluation.SUCCESS,
+            rank__gt=0,
+        ).select_related(
+            "submission__creator__user_profile",
+            "submission__creator__verification",
+            "submission__phase__challenge",
+            "submission__algorithm_image__algorithm",
         )
 
         if self.additional_inputs_defined_on_phase:
@@ -1,11 +1,12 @@
-from actstream.actions import is_following
-from actstream.models import Follow, followers
+from actstream.models import Follow
 from django.conf import settings
+from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.humanize.templatetags.humanize import naturaltime
 from django.contrib.sites.models import Site
 from django.db import models
+from django.db.transaction import on_commit
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from guardian.shortcuts import assign_perm
@@ -16,6 +17,8 @@ from grandchallenge.core.guardian import (
 )
 from grandchallenge.core.models import UUIDModel
 from grandchallenge.core.utils.query import check_lock_acquired
+from grandchallenge.notifications.receivers import get_receivers
+from grandchallenge.notifications.tasks import send_notifications
 from grandchallenge.profiles.models import (
     NotificationEmailOptions,
     UserProfile,
@@ -57,6 +60,28 @@ class NotificationTypeChoices(models.TextChoices):
     )
 
 
+# The notifications that are sent to the followers of the target
+FAN_OUT_NOTIFICATION_TYPES = frozenset(
+    {
+        NotificationTypeChoices.FORUM_POST,
+        NotificationTypeChoices.FORUM_POST_REPLY,
+        NotificationTypeChoices.ACCESS_REQUEST,
+        NotificationTypeChoices.REQUEST_UPDATE,
+    }
+)
+
+
+def get_object_reference(*, obj):
+    if obj is None:
+        return None
+    else:
+        return {
+            "app_label": obj._meta.app_label,
+            "model_name": obj._meta.model_name,
+            "pk": str(obj.pk),
+        }
+
+
 class Notification(UUIDModel):
     Type = NotificationTypeChoices
 
@@ -156,92 +181,128 @@ class Notification(UUIDModel):
         description=None,
         context_class=None,
     ):
-        receivers = Notification.get_receivers(
-            action_object=action_object, actor=actor, kind=kind, target=target
-        )
-        site = Site.objects.get_current()
-
-        for receiver in receivers:
-            Notification.objects.create(
-                user=receiver,
-                type=kind,
-                message=message,
+        """
+        Sends a notification of this kind to its receivers
+
+        Notifications that are sent to the followers of the target can
+        have many receivers, so these are fanned out in a task once the
+        current transaction commits. The others are sent directly.
+        """
+        if kind in FAN_OUT_NOTIFICATION_TYPES:
+            on_commit(
+                send_notifications.signature(
+                    kwargs={
+                        "kind": kind,
+                        "actor": get_object_reference(obj=actor),
+                        "action_object": get_object_reference(
+                            obj=action_object
+                        ),
+                        "target": get_object_reference(obj=target),
+                        "message": message,
+                        "description": description,
+                        "context_class": context_class,
+                    }
+                ).apply_async
+            )
+        else:
+            Notification.send_to_receivers(
+                kind=kind,
                 actor=actor,
                 action_object=action_object,
                 target=target,
+                message=message,
                 description=description,
                 context_class=context_class,
             )
-            if (
-                receiver.user_profile.notification_email_choice
-                == NotificationEmailOptions.INSTANT
-            ):
-                with check_lock_acquired():
-                    user_profile = UserProfile.objects.select_for_update(
-                        nowait=True
-                    ).get(pk=receiver.user_profile.pk)
-
-                user_profile.dispatch_unread_notifications_email(
-                    site=site, unread_notification_count=1
-                )
 
     @staticmethod
-    def get_receivers(*, kind, actor, action_object, target):  # noqa: C901
-        if (
-            kind == NotificationTypeChoices.FORUM_POST
-            or kind == NotificationTypeChoices.FORUM_POST_REPLY
-            or kind == NotificationTypeChoices.ACCESS_REQUEST
-            and target._meta.model_name != "algorithm"
-            or kind == NotificationTypeChoices.REQUEST_UPDATE
-        ):
-            if actor:
-                return {
-                    follower
-                    for follower in followers(target)
-                    if follower != actor
-                }
-            else:
-                return followers(target)
-        elif (
-            kind == NotificationTypeChoices.ACCESS_REQUEST
-            and target._meta.model_name == "algorithm"
+    def send_to_receivers(
+        *,
+        kind,
+        actor=None,
+        action_object=None,
+        target=None,
+        message=None,
+        description=None,
+        context_class=None,
+    ):
+        """
+        Creates the notifications and their permissions in bulk
+
+        The receivers that want instant emails are sent a single batch
+        of emails.
+        """
+        site = Site.objects.get_current()
+        receivers = list(
+            get_receivers(
+                action_object=action_object,
+                actor=actor,
+                kind=kind,
+                target=target,
+            )
+        )
+        permissions = Permission.objects.filter(
+            content_type=ContentType.objects.get_for_model(Notification),
+            codename__in=NotificationUserObjectPermission.allowed_permissions,
+        )
+
+        for start in range(
+            0, len(receivers), settings.NOTIFICATIONS_BULK_CREATE_BATCH_SIZE
         ):
-            return {
-                follower
-                for follower in followers(target, flag="access_request")
-                if follower != actor
-            }
-        elif kind == NotificationTypeChoices.NEW_ADMIN:
-            return {action_object}
-        elif kind == NotificationTypeChoices.EVALUATION_STATUS:
-            receivers = {
-                admin
-                for admin in target.challenge.get_admins()
-                if is_following(admin, target)
-            }
-            if actor and is_following(actor, target):
-                receivers.add(actor)
-            return receivers
-        elif kind == NotificationTypeChoices.MISSING_METHOD:
-            return {
-                admin
-                for admin in target.challenge.get_admins()
-                if is_following(admin, target)
-            }
-        elif kind == NotificationTypeChoices.JOB_STATUS:
-            if actor and is_following(actor, target, flag="job-active"):
-                return {actor}
-            else:
-                return set()
-        elif kind == NotificationTypeChoices.IMAGE_IMPORT_STATUS:
-            return followers(action_object)
-        elif kind in [
-            NotificationTypeChoices.FILE_COPY_STATUS,
-            NotificationTypeChoices.CIV_VALIDATION,
-        ]:
-            return {actor}
-        else:
-            raise RuntimeError(f"Unhandled notification type {kind!r}")
+            notifications = Notification.objects.bulk_create(
+                [
+                    Notification(
+                        user_id=receiver.user_id,
+                        type=kind,
+                        message=message,
+                        actor=actor,
+                        action_object=action_object,
+                        target=target,
+                        description=description,
+                        context_class=context_class,
+                    )
+                    for receiver in receivers[
+                        start : start
+                        + settings.NOTIFICATIONS_BULK_CREATE_BATCH_SIZE
+                    ]
+                ]
+            )
+            NotificationUserObjectPermission.objects.bulk_create(
+                [
+                    NotificationUserObjectPermission(
+                        user_id=notification.user_id,
+                        permission=permission,
+                        content_object=notification,
+                    )
+                    for notification in notifications
+                    for permission in permissions
+                ]
+            )
+
+        instant_email_user_ids = [
+            receiver.user_id
+            for receiver in receivers
+            if receiver.notification_email_choice
+            == NotificationEmailOptions.INSTANT
+        ]
+
+        if instant_email_user_ids:
+            with check_lock_acquired():
+                instant_email_profiles = list(
+                    UserProfile.objects.filter(
+                        user_id__in=instant_email_user_ids,
+                        # The cached receivers may have stale preferences
+                        notification_email_choice=NotificationEmailOptions.INSTANT,
+                    )
+                    .select_related("user")
+                    .select_for_update(nowait=True, of=("self",))
+                )
+
+            UserProfile.dispatch_unread_notifications_emails(
+                profiles=instant_email_profiles,
+                site=site,
+                unread_notification_count=1,
+            )
 
     def print_notification(self, user):  # noqa: C901
         if self.type == NotificationTypeChoices.FORUM_POST:
@@ -0,0 +1,184 @@
+"""
+Resolution of the receivers of notifications
+
+The receivers of each kind of notification are resolved with a single
+query over the follows (joined with the group memberships where
+needed), which returns the user ids and their notification email
+preferences rather than the full user objects.
+
+The receivers that are resolved from all of the followers of an
+object, or from those with a flag, are cached for
+NOTIFICATIONS_RECEIVERS_CACHE_TIMEOUT seconds. The cache of an object
+is invalidated when it is followed or unfollowed. Changes to the email
+preferences are picked up once the cache expires, so the preferences
+are checked again before instant emails are sent. The receivers that
+are restricted to other users (e.g. the members of the admins group)
+are not cached, as changes to those users would not invalidate them.
+"""
+
+from typing import NamedTuple
+from uuid import uuid4
+
+from actstream.models import Follow
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models import Q
+
+from grandchallenge.profiles.models import UserProfile
+
+
+class Receiver(NamedTuple):
+    user_id: int
+    notification_email_choice: str
+
+
+def _get_cache_version_key(*, content_type_id, object_id):
+    return f"notification-receivers-version:{content_type_id}:{object_id}"
+
+
+def invalidate_receivers_cache(*, content_type_id, object_id):
+    """Invalidates the cached receivers of the followers of an object"""
+    cache.delete(
+        _get_cache_version_key(
+            content_type_id=content_type_id, object_id=object_id
+        )
+    )
+
+
+def _get_cache_version(*, content_type_id, object_id):
+    # The version is replaced on invalidation, so receivers that were
+    # resolved before the invalidation are never read again
+    key = _get_cache_version_key(
+        content_type_id=content_type_id, object_id=object_id
+    )
+    cache.add(
+        key,
+        uuid4().hex,
+        timeout=settings.NOTIFICATIONS_RECEIVERS_CACHE_TIMEOUT,
+    )
+    return cache.get(key)
+
+
+def _get_followers(*, obj, flag="", exclude_user=None, among=None):
+    """
+    Returns the receivers that follow the object
+
+    Parameters
+    ----------
+    obj
+        The followed object
+    flag
+        Only include the follows with this flag, if set
+    exclude_user
+        A user who is not a receiver, if set
+    among
+        A Q object of follows, only these follows are included if set.
+        The receivers are not cached if this is set.
+    """
+    content_type_id = ContentType.objects.get_for_model(obj).pk
+    object_id = str(obj.pk)
+
+    cache_version = (
+        _get_cache_version(
+            content_type_id=content_type_id, object_id=object_id
+        )
+        if settings.NOTIFICATIONS_RECEIVERS_CACHE_TIMEOUT and among is None
+        else None
+    )
+    cache_key = (
+        f"notification-receivers:{content_type_id}:{object_id}:"
+        f"{cache_version}:{flag}:{getattr(exclude_user, 'pk', None)}"
+    )
+
+    if cache_version is not None:
+        receivers = cache.get(cache_key)
+        if receivers is not None:
+            return receivers
+
+    follows = Follow.objects.filter(
+        content_type_id=content_type_id, object_id=object_id
+    )
+
+    if flag:
+        follows = follows.filter(flag=flag)
+
+    if exclude_user is not None:
+        follows = follows.exclude(user=exclude_user)
+
+    if among is not None:
+        follows = follows.filter(among)
+
+    receivers = frozenset(
+        Receiver(*values)
+        for values in follows.values_list(
+            "user_id", "user__user_profile__notification_email_choice"
+        ).distinct()
+    )
+
+    if cache_version is not None:
+        cache.set(
+            cache_key,
+            receivers,
+            timeout=settings.NOTIFICATIONS_RECEIVERS_CACHE_TIMEOUT,
+        )
+
+    return receivers
+
+
+def _get_users(*, users):
+    return frozenset(
+        Receiver(*values)
+        for values in UserProfile.objects.filter(
+            user__in=[user for user in users if user is not None]
+        ).values_list("user_id", "notification_email_choice")
+    )
+
+
+def get_receivers(*, kind, actor, action_object, target):  # noqa: C901
+    """Returns the set of receivers for a kind of notification"""
+    from grandchallenge.notifications.models import NotificationTypeChoices
+
+    if (
+        kind == NotificationTypeChoices.FORUM_POST
+        or kind == NotificationTypeChoices.FORUM_POST_REPLY
+        or kind == NotificationTypeChoices.ACCESS_REQUEST
+        and target._meta.model_name != "algorithm"
+        or kind == NotificationTypeChoices.REQUEST_UPDATE
+    ):
+        return _get_followers(obj=target, exclude_user=actor)
+    elif (
+        kind == NotificationTypeChoices.ACCESS_REQUEST
+        and target._meta.model_name == "algorithm"
+    ):
+        return _get_followers(
+            obj=target, flag="access_request", exclude_user=actor
+        )
+    elif kind == NotificationTypeChoices.NEW_ADMIN:
+        return _get_users(users=[action_object])
+    elif kind == NotificationTypeChoices.EVALUATION_STATUS:
+        among = Q(user__groups__pk=target.challenge.admins_group_id)
+        if actor:
+            among |= Q(user__pk=actor.pk)
+        return _get_followers(obj=target, among=among)
+    elif kind == NotificationTypeChoices.MISSING_METHOD:
+        return _get_followers(
+            obj=target,
+            among=Q(user__groups__pk=target.challenge.admins_group_id),
+        )
+    elif kind == NotificationTypeChoices.JOB_STATUS:
+        if actor:
+            return _get_followers(
+                obj=target, flag="job-active", among=Q(user__pk=actor.pk)
+            )
+        else:
+            return frozenset()
+    elif kind == NotificationTypeChoices.IMAGE_IMPORT_STATUS:
+        return _get_followers(obj=action_object)
+    elif kind in [
+        NotificationTypeChoices.FILE_COPY_STATUS,
+        NotificationTypeChoices.CIV_VALIDATION,
+    ]:
+        return _get_users(users=[actor])
+    else:
+        raise RuntimeError(f"Unhandled notification type {kind!r}")
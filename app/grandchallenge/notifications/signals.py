@@ -3,7 +3,12 @@ from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
 from django.db.models import Q
-from django.db.models.signals import post_save, pre_delete, pre_save
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 from django.utils.timezone import now
 from guardian.shortcuts import assign_perm
@@ -25,6 +30,7 @@ from grandchallenge.discussion_forums.models import (
 )
 from grandchallenge.evaluation.models import Evaluation, Phase, Submission
 from grandchallenge.notifications.models import Notification
+from grandchallenge.notifications.receivers import invalidate_receivers_cache
 from grandchallenge.participants.models import RegistrationRequest
 from grandchallenge.reader_studies.models import (
     ReaderStudy,
@@ -52,6 +58,15 @@ def add_permissions(*, instance, created, **_):
         assign_perm("view_follow", instance.user, instance)
 
 
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_notification_receivers(*, instance, **_):
+    invalidate_receivers_cache(
+        content_type_id=instance.content_type_id,
+        object_id=instance.object_id,
+    )
+
+
 @receiver(pre_delete, sender=AlgorithmPermissionRequest)
 @receiver(pre_delete, sender=ReaderStudyPermissionRequest)
 @receiver(pre_delete, sender=ArchivePermissionRequest)
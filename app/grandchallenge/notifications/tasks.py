@@ -1,12 +1,19 @@
+from celery.utils.log import get_task_logger
+from django.apps import apps
 from django.contrib.sites.models import Site
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from django.db.models import Count, F, Q
 
 from grandchallenge.core.celery import acks_late_micro_short_task
+from grandchallenge.core.exceptions import LockNotAcquiredException
 from grandchallenge.profiles.models import (
     NotificationEmailOptions,
     UserProfile,
 )
 
+logger = get_task_logger(__name__)
+
 
 @acks_late_micro_short_task
 def send_unread_notification_emails():
@@ -42,3 +49,51 @@ def send_unread_notification_emails():
             site=site,
             unread_notification_count=profile.unread_notification_count,
         )
+
+
+def _get_referenced_object(*, reference):
+    if reference is None:
+        return None
+
+    model = apps.get_model(
+        app_label=reference["app_label"], model_name=reference["model_name"]
+    )
+
+    return model.objects.get(pk=reference["pk"])
+
+
+@acks_late_micro_short_task(retry_on=(LockNotAcquiredException,))
+@transaction.atomic
+def send_notifications(
+    *,
+    kind,
+    actor,
+    action_object,
+    target,
+    message,
+    description,
+    context_class,
+):
+    """Sends a notification to all of its receivers, see `Notification.send`"""
+    from grandchallenge.notifications.models import Notification
+
+    try:
+        referenced_objects = {
+            name: _get_referenced_object(reference=reference)
+            for name, reference in (
+                ("actor", actor),
+                ("action_object", action_object),
+                ("target", target),
+            )
+        }
+    except ObjectDoesNotExist:
+        logger.info(f"Not sending {kind} notification, object was deleted")
+        return
+
+    Notification.send_to_receivers(
+        kind=kind,
+        message=message,
+        description=description,
+        context_class=context_class,
+        **referenced_objects,
+    )
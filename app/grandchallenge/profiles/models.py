@@ -201,6 +201,31 @@ class UserProfile(models.Model):
         self.notification_email_last_sent_at = now()
         self.save(update_fields=["notification_email_last_sent_at"])
 
+        self._send_unread_notifications_email(
+            site=site,
+            recipients=[self.user],
+            unread_notification_count=unread_notification_count,
+        )
+
+    @classmethod
+    def dispatch_unread_notifications_emails(
+        cls, *, profiles, site, unread_notification_count
+    ):
+        """Sends the same unread notifications email to many users at once"""
+        cls.objects.filter(pk__in=[p.pk for p in profiles]).update(
+            notification_email_last_sent_at=now()
+        )
+
+        cls._send_unread_notifications_email(
+            site=site,
+            recipients=[p.user for p in profiles],
+            unread_notification_count=unread_notification_count,
+        )
+
+    @staticmethod
+    def _send_unread_notifications_email(
+        *, site, recipients, unread_notification_count
+    ):
         subject = format_html(
             ("You have {unread_notification_count} new notification{suffix}"),
             unread_notification_count=unread_notification_count,
@@ -221,7 +246,7 @@ class UserProfile(models.Model):
             site=site,
             subject=subject,
             markdown_message=msg,
-            recipients=[self.user],
+            recipients=recipients,
             subscription_type=EmailSubscriptionTypes.NOTIFICATION,
         )
 
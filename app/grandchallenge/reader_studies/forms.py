@@ -74,6 +74,7 @@ from grandchallenge.reader_studies.models import (
     Question,
     ReaderStudy,
     ReaderStudyPermissionRequest,
+    ReaderStudyUserProgress,
 )
 from grandchallenge.reader_studies.tasks import (
     answers_from_ground_truth,
@@ -767,6 +768,11 @@ class GroundTruthFromAnswersForm(SaveFormInitMixin, Form):
         )
         answers.update(is_ground_truth=True)
 
+        # The answers of the user are no longer counted for their progress
+        ReaderStudyUserProgress.recalculate(
+            reader_study=self._reader_study, user=self.cleaned_data["user"]
+        )
+
         # Unassign all scores: some are invalid now
         Answer.objects.filter(
             question__reader_study=self._reader_study
@@ -0,0 +1,97 @@
+# Generated by Django 4.2.26 on 2026-10-17 11:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("reader_studies", "0072_alter_readerstudy_logo_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReaderStudyUserProgress",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "answer_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="The number of answers the user has given in the reader study",
+                    ),
+                ),
+                (
+                    "completed_display_set_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="The number of display sets for which the user has answered all answerable questions",
+                    ),
+                ),
+                (
+                    "reader_study",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="user_progress",
+                        to="reader_studies.readerstudy",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("reader_study", "user")},
+            },
+        ),
+        migrations.CreateModel(
+            name="DisplaySetUserAnswerCount",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("answer_count", models.PositiveIntegerField(default=0)),
+                (
+                    "display_set",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="user_answer_counts",
+                        to="reader_studies.displayset",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("display_set", "user")},
+            },
+        ),
+    ]
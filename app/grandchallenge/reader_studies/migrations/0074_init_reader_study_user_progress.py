@@ -0,0 +1,74 @@
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def init_reader_study_user_progress(apps, _schema_editor):
+    ReaderStudy = apps.get_model("reader_studies", "ReaderStudy")  # noqa: N806
+    Question = apps.get_model("reader_studies", "Question")  # noqa: N806
+    Answer = apps.get_model("reader_studies", "Answer")  # noqa: N806
+    DisplaySetUserAnswerCount = apps.get_model(  # noqa: N806
+        "reader_studies", "DisplaySetUserAnswerCount"
+    )
+    ReaderStudyUserProgress = apps.get_model(  # noqa: N806
+        "reader_studies", "ReaderStudyUserProgress"
+    )
+
+    for reader_study in ReaderStudy.objects.all().iterator():
+        answerable_question_count = (
+            Question.objects.filter(reader_study=reader_study)
+            .exclude(answer_type="HEAD")
+            .count()
+        )
+
+        counters = DisplaySetUserAnswerCount.objects.bulk_create(
+            (
+                DisplaySetUserAnswerCount(
+                    display_set_id=answer_count["display_set"],
+                    user_id=answer_count["creator"],
+                    answer_count=answer_count["answer_count"],
+                )
+                for answer_count in Answer.objects.filter(
+                    question__reader_study=reader_study,
+                    is_ground_truth=False,
+                    display_set__isnull=False,
+                )
+                .values("display_set", "creator")
+                .annotate(answer_count=Count("pk"))
+                .order_by()
+            ),
+            batch_size=1000,
+        )
+
+        progress = defaultdict(
+            lambda: {"answer_count": 0, "completed_display_set_count": 0}
+        )
+        for counter in counters:
+            progress[counter.user_id]["answer_count"] += counter.answer_count
+            progress[counter.user_id]["completed_display_set_count"] += (
+                counter.answer_count >= answerable_question_count
+            )
+
+        ReaderStudyUserProgress.objects.bulk_create(
+            (
+                ReaderStudyUserProgress(
+                    reader_study=reader_study, user_id=user_id, **counts
+                )
+                for user_id, counts in progress.items()
+            ),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "reader_studies",
+            "0073_readerstudyuserprogress_displaysetuseranswercount",
+        ),
+    ]
+
+    operations = [
+        migrations.RunPython(init_reader_study_user_progress, elidable=True),
+    ]
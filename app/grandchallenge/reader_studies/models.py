@@ -1,4 +1,6 @@
+from functools import lru_cache
 from math import ceil
+from random import Random
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -11,8 +13,9 @@ from django.core.validators import (
     MinValueValidator,
     RegexValidator,
 )
-from django.db import models
-from django.db.models import Avg, Count, Q, Sum
+from django.db import models, transaction
+from django.db.models import Avg, Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
 from django.utils.functional import cached_property
@@ -603,37 +606,47 @@ class ReaderStudy(
         """The number of answerable questions for this ``ReaderStudy``."""
         return self.answerable_questions.count()
 
+    def get_hanging_list(self, *, user):
+        """
+        The pks of the display sets in the order they are presented to ``user``
+
+        If the hanging list is shuffled each user gets their own
+        permutation of the display sets, which is stable between requests.
+        """
+        pks = [
+            *self.display_sets.order_by("order", "created", "pk").values_list(
+                "pk", flat=True
+            )
+        ]
+
+        if self.shuffle_hanging_list:
+            permutation = _get_hanging_list_permutation(
+                seed=f"{self.pk}:{user.pk}", length=len(pks)
+            )
+            pks = [pks[idx] for idx in permutation]
+
+        return pks
+
     def get_progress_for_user(self, user):
         """Returns the percentage of completed hangings and questions for ``user``."""
-        if self.display_sets.count() == 0:
-            return {"questions": 0.0, "hangings": 0.0, "diff": 0.0}
-
         n_display_sets = self.display_sets.count()
         expected = n_display_sets * self.answerable_question_count
 
-        answers = Answer.objects.filter(
-            question__in=self.answerable_questions,
-            creator_id=user.id,
-            is_ground_truth=False,
-        ).distinct()
-        answer_count = answers.count()
+        if expected == 0:
+            return {"questions": 0.0, "hangings": 0.0, "diff": 0.0}
 
-        if expected == 0 or answer_count == 0:
+        try:
+            progress = ReaderStudyUserProgress.objects.get(
+                reader_study=self, user=user
+            )
+        except ObjectDoesNotExist:
             return {"questions": 0.0, "hangings": 0.0, "diff": 0.0}
 
-        completed_hangings = (
-            self.display_sets.annotate(
-                answers_for_user=Count(
-                    "answers",
-                    filter=Q(
-                        answers__creator=user,
-                        answers__is_ground_truth=False,
-                    ),
-                )
-            ).filter(answers_for_user=self.answerable_question_count)
-        ).count()
-        questions = answer_count / expected * 100
-        hangings = completed_hangings / n_display_sets * 100
+        if progress.answer_count == 0:
+            return {"questions": 0.0, "hangings": 0.0, "diff": 0.0}
+
+        questions = progress.answer_count / expected * 100
+        hangings = progress.completed_display_set_count / n_display_sets * 100
         return {
             "questions": questions,
             "hangings": hangings,
@@ -871,6 +884,13 @@ class ReaderStudy(
         return self.questions.exclude(interactive_algorithm="")
 
 
+@lru_cache(maxsize=128)
+def _get_hanging_list_permutation(*, seed, length):
+    permutation = [*range(length)]
+    Random(seed).shuffle(permutation)
+    return tuple(permutation)
+
+
 class ReaderStudyUserObjectPermission(UserObjectPermissionBase):
     allowed_permissions = frozenset()
 
@@ -1017,7 +1037,12 @@ class DisplaySet(
 
     @property
     def standard_index(self) -> int:
-        return [*self.reader_study.display_sets.all()].index(self)
+        return DisplaySet.objects.filter(
+            Q(order__lt=self.order)
+            | Q(order=self.order, created__lt=self.created)
+            | Q(order=self.order, created=self.created, pk__lt=self.pk),
+            reader_study_id=self.reader_study_id,
+        ).count()
 
     @property
     def update_url(self):
@@ -1574,6 +1599,12 @@ class Question(UUIDModel, OverlaySegmentsMixin):
         if adding:
             self.assign_permissions()
 
+        # The answer type determines if the question is answerable,
+        # which changes when display sets are completed
+        ReaderStudyUserProgress.update_completed_display_set_counts(
+            reader_study_id=self.reader_study_id
+        )
+
     def assign_permissions(self):
         # Allow the editors and readers groups to view this question
         assign_perm(
@@ -1910,6 +1941,19 @@ class Answer(UUIDModel):
             ("creator", "display_set", "question", "is_ground_truth"),
         )
 
+    _NOT_LOADED = object()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Deferred fields are not loaded here as that would query the
+        # database, they are fetched if needed when the answer is saved
+        if {"is_ground_truth", "display_set_id", "creator_id"} <= set(
+            self.__dict__
+        ):
+            self._counted_display_set_user = self._display_set_user
+        else:
+            self._counted_display_set_user = self._NOT_LOADED
+
     def __str__(self):
         return f"{self.question.question_text} {self.answer} ({self.creator})"
 
@@ -2021,6 +2065,48 @@ class Answer(UUIDModel):
         self.score = self.question.calculate_score(self.answer, ground_truth)
         return self.score
 
+    @property
+    def _display_set_user(self):
+        """The display set and user this answer is counted for, if any"""
+        if self.is_ground_truth or self.display_set_id is None:
+            return None
+        else:
+            return self.display_set_id, self.creator_id
+
+    def _get_counted_display_set_user(self):
+        if self._counted_display_set_user is self._NOT_LOADED:
+            return (
+                Answer.objects.only(
+                    "is_ground_truth", "display_set", "creator"
+                )
+                .get(pk=self.pk)
+                ._counted_display_set_user
+            )
+        else:
+            return self._counted_display_set_user
+
+    def _update_answer_counts(self, *, previous, current):
+        if previous == current:
+            return
+
+        if previous is not None:
+            ReaderStudyUserProgress.update_answer_count(
+                reader_study_id=self.question.reader_study_id,
+                display_set_id=previous[0],
+                user_id=previous[1],
+                delta=-1,
+            )
+
+        if current is not None:
+            ReaderStudyUserProgress.update_answer_count(
+                reader_study_id=self.question.reader_study_id,
+                display_set_id=current[0],
+                user_id=current[1],
+                delta=1,
+            )
+
+        self._counted_display_set_user = current
+
     def save(self, *args, calculate_score=True, **kwargs):
         adding = self._state.adding
 
@@ -2036,11 +2122,26 @@ class Answer(UUIDModel):
             else:
                 self.calculate_score(ground_truth=ground_truth.answer)
 
-        super().save(*args, **kwargs)
+        previous = None if adding else self._get_counted_display_set_user()
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._update_answer_counts(
+                previous=previous, current=self._display_set_user
+            )
 
         if adding:
             self.assign_permissions()
 
+    def delete(self, *args, **kwargs):
+        previous = self._get_counted_display_set_user()
+
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            self._update_answer_counts(previous=previous, current=None)
+
+        return result
+
     def assign_permissions(self):
         # Allow the editors and creator to view this answer
         assign_perm(
@@ -2069,6 +2170,164 @@ class AnswerGroupObjectPermission(GroupObjectPermissionBase):
     content_object = models.ForeignKey(Answer, on_delete=models.CASCADE)
 
 
+class ReaderStudyUserProgress(models.Model):
+    """
+    The progress of a reader in a ``ReaderStudy``
+
+    The counters are maintained by ``Answer.save`` and ``Answer.delete``.
+    Queryset updates and deletes of answers must call ``recalculate``.
+    """
+
+    reader_study = models.ForeignKey(
+        ReaderStudy, related_name="user_progress", on_delete=models.CASCADE
+    )
+    user = models.ForeignKey(
+        get_user_model(), related_name="+", on_delete=models.CASCADE
+    )
+    answer_count = models.PositiveIntegerField(
+        default=0,
+        help_text="The number of answers the user has given in the reader study",
+    )
+    completed_display_set_count = models.PositiveIntegerField(
+        default=0,
+        help_text=(
+            "The number of display sets for which the user has answered "
+            "all answerable questions"
+        ),
+    )
+
+    class Meta:
+        unique_together = (("reader_study", "user"),)
+
+    @staticmethod
+    def _get_answerable_question_count(*, reader_study_id):
+        return (
+            Question.objects.filter(reader_study_id=reader_study_id)
+            .exclude(answer_type__in=AnswerType.get_non_answerable_types())
+            .count()
+        )
+
+    @classmethod
+    def update_answer_count(
+        cls, *, reader_study_id, display_set_id, user_id, delta
+    ):
+        """Adds ``delta`` to the number of answers of a user for a display set"""
+        answerable_question_count = cls._get_answerable_question_count(
+            reader_study_id=reader_study_id
+        )
+
+        with transaction.atomic():
+            # Locking the display set counter serializes concurrent
+            # answers of the user, so completions are counted once
+            counters = DisplaySetUserAnswerCount.objects.select_for_update()
+            counter, _ = counters.get_or_create(
+                display_set_id=display_set_id, user_id=user_id
+            )
+
+            was_completed = counter.answer_count >= answerable_question_count
+            counter.answer_count += delta
+            counter.save(update_fields=["answer_count"])
+            is_completed = counter.answer_count >= answerable_question_count
+
+            cls.objects.get_or_create(
+                reader_study_id=reader_study_id, user_id=user_id
+            )
+            cls.objects.filter(
+                reader_study_id=reader_study_id, user_id=user_id
+            ).update(
+                answer_count=F("answer_count") + delta,
+                completed_display_set_count=F("completed_display_set_count")
+                + int(is_completed)
+                - int(was_completed),
+            )
+
+    @classmethod
+    def update_completed_display_set_counts(cls, *, reader_study_id):
+        """Updates the completed display sets after the questions change"""
+        answerable_question_count = cls._get_answerable_question_count(
+            reader_study_id=reader_study_id
+        )
+
+        cls.objects.filter(reader_study_id=reader_study_id).update(
+            completed_display_set_count=Coalesce(
+                Subquery(
+                    DisplaySetUserAnswerCount.objects.filter(
+                        display_set__reader_study_id=reader_study_id,
+                        user=OuterRef("user"),
+                        answer_count__gte=answerable_question_count,
+                    )
+                    .values("user")
+                    .annotate(count=Count("pk"))
+                    .values("count")
+                ),
+                0,
+            )
+        )
+
+    @classmethod
+    def recalculate(cls, *, reader_study, user):
+        """Recalculates the progress of a user from their answers"""
+        answerable_question_count = cls._get_answerable_question_count(
+            reader_study_id=reader_study.pk
+        )
+
+        with transaction.atomic():
+            DisplaySetUserAnswerCount.objects.filter(
+                display_set__reader_study=reader_study, user=user
+            ).delete()
+
+            counters = DisplaySetUserAnswerCount.objects.bulk_create(
+                DisplaySetUserAnswerCount(
+                    display_set_id=answer_count["display_set"],
+                    user=user,
+                    answer_count=answer_count["answer_count"],
+                )
+                for answer_count in Answer.objects.filter(
+                    question__reader_study=reader_study,
+                    creator=user,
+                    is_ground_truth=False,
+                    display_set__isnull=False,
+                )
+                .values("display_set")
+                .annotate(answer_count=Count("pk"))
+                .order_by()
+            )
+
+            cls.objects.update_or_create(
+                reader_study=reader_study,
+                user=user,
+                defaults={
+                    "answer_count": sum(c.answer_count for c in counters),
+                    "completed_display_set_count": sum(
+                        c.answer_count >= answerable_question_count
+                        for c in counters
+                    ),
+                },
+            )
+
+
+class DisplaySetUserAnswerCount(models.Model):
+    """The number of answers that a reader has given for a ``DisplaySet``"""
+
+    display_set = models.ForeignKey(
+        DisplaySet, related_name="user_answer_counts", on_delete=models.CASCADE
+    )
+    user = models.ForeignKey(
+        get_user_model(), related_name="+", on_delete=models.CASCADE
+    )
+    answer_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = (("display_set", "user"),)
+
+
+@receiver(post_delete, sender=Question)
+def update_completed_display_set_counts_hook(*_, instance: Question, **__):
+    ReaderStudyUserProgress.update_completed_display_set_counts(
+        reader_study_id=instance.reader_study_id
+    )
+
+
 class ReaderStudyPermissionRequest(RequestBase):
     """
     When a user wants to read a reader study, editors have the option of
@@ -137,12 +137,15 @@ class DisplaySetSerializer(HyperlinkedModelSerializer):
     title_safe = SerializerMethodField()
 
     def get_index(self, obj) -> int | None:
-        if obj.reader_study.shuffle_hanging_list:
-            try:
-                return self.context["view"].randomized_qs.index(obj)
-            except ValueError:
-                # The list is empty if no reader study is specified.
-                return None
+        hanging_list_index = getattr(
+            self.context.get("view"), "hanging_list_index", {}
+        )
+
+        if obj.pk in hanging_list_index:
+            return hanging_list_index[obj.pk]
+        elif obj.reader_study.shuffle_hanging_list:
+            # The hanging list is unknown if no reader study is specified.
+            return None
         else:
             return obj.standard_index
 
@@ -11,7 +11,7 @@ from django.contrib.auth.mixins import (
 )
 from django.contrib.messages.views import SuccessMessageMixin
 from django.core.exceptions import PermissionDenied, ValidationError
-from django.db.models import Count, Q
+from django.db import transaction
 from django.db.transaction import on_commit
 from django.forms import Form
 from django.forms.utils import ErrorList
@@ -75,7 +75,6 @@ from grandchallenge.core.renderers import PaginatedCSVRenderer
 from grandchallenge.core.templatetags.bleach import clean
 from grandchallenge.core.templatetags.random_encode import random_encode
 from grandchallenge.core.utils import strtobool
-from grandchallenge.core.utils.query import set_seed
 from grandchallenge.core.views import PermissionRequestUpdate
 from grandchallenge.datatables.views import Column
 from grandchallenge.groups.forms import EditorsForm
@@ -101,9 +100,11 @@ from grandchallenge.reader_studies.models import (
     Answer,
     CategoricalOption,
     DisplaySet,
+    DisplaySetUserAnswerCount,
     Question,
     ReaderStudy,
     ReaderStudyPermissionRequest,
+    ReaderStudyUserProgress,
 )
 from grandchallenge.reader_studies.serializers import (
     AnswerSerializer,
@@ -796,7 +797,19 @@ class AnswerBatchDelete(LoginRequiredMixin, FormView):
 
     def form_valid(self, *args, **kwargs):
         objects = self.check_permissions(self.request)
-        objects.delete()
+        readers = [
+            *get_user_model()
+            .objects.filter(answer__in=objects.filter(is_ground_truth=False))
+            .distinct()
+        ]
+
+        with transaction.atomic():
+            objects.delete()
+
+            for reader in readers:
+                ReaderStudyUserProgress.recalculate(
+                    reader_study=self.reader_study, user=reader
+                )
 
         messages.success(self.request, self.success_message)
 
@@ -1020,7 +1033,6 @@ class DisplaySetViewSet(
         .prefetch_related(
             "values__image",
             "values__interface",
-            "reader_study__display_sets",
             "reader_study__optional_hanging_protocols",
         )
     )
@@ -1031,7 +1043,7 @@ class DisplaySetViewSet(
         *api_settings.DEFAULT_RENDERER_CLASSES,
         PaginatedCSVRenderer,
     )
-    randomized_qs = []
+    hanging_list_index = {}
 
     @property
     def reader_study(self):
@@ -1047,13 +1059,12 @@ class DisplaySetViewSet(
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         # Note: if more fields besides 'reader_study' are added to the
-        # filter_set fields, we cannot call super anymore before randomizing
-        # as we only want to filter out the display sets for a specific
-        # reader study.
+        # filter_set fields, we cannot call super anymore before ordering
+        # by the hanging list as we only want to filter out the display
+        # sets for a specific reader study.
         reader_study = self.reader_study
-        if reader_study and reader_study.shuffle_hanging_list:
-            queryset = queryset.filter(reader_study=reader_study)
-            queryset = self.create_randomized_qs(queryset=queryset)
+        if reader_study:
+            hanging_list = self.set_hanging_list(reader_study=reader_study)
         unanswered_by_user = strtobool(
             self.request.query_params.get("unanswered_by_user", "False")
         )
@@ -1067,7 +1078,7 @@ class DisplaySetViewSet(
         if username:
             user = get_user_model().objects.filter(username=username).get()
             if user != self.request.user and not self.request.user.has_perm(
-                "change_readerstudy", self.reader_study
+                "change_readerstudy", reader_study
             ):
                 raise PermissionDenied(
                     "You do not have permission to retrieve this user's unanswered"
@@ -1082,30 +1093,33 @@ class DisplaySetViewSet(
                     "Please provide a reader study when filtering for "
                     "unanswered display_sets."
                 )
-            answerable_question_count = reader_study.answerable_question_count
-            queryset = (
-                queryset.annotate(
-                    answer_count=Count(
-                        "answers",
-                        filter=Q(
-                            answers__is_ground_truth=False,
-                            answers__creator=user,
-                        ),
-                    )
-                )
-                .exclude(
-                    answer_count__gte=answerable_question_count,
+            queryset = queryset.exclude(
+                pk__in=DisplaySetUserAnswerCount.objects.filter(
+                    display_set__reader_study=reader_study,
+                    user=user,
+                    answer_count__gte=reader_study.answerable_question_count,
+                ).values("display_set")
+            ).order_by("order", "created")
+
+        if reader_study and reader_study.shuffle_hanging_list:
+            # The shuffled order cannot be expressed in SQL, so the pks
+            # are paginated in the order of the hanging list and only the
+            # display sets on the page are fetched
+            queryset = queryset.filter(reader_study=reader_study)
+            pks = {*queryset.values_list("pk", flat=True)}
+            hanging_list = [pk for pk in hanging_list if pk in pks]
+
+            page = self.paginate_queryset(hanging_list)
+            if page is not None:
+                serializer = self.get_serializer(
+                    self.in_hanging_list_order(queryset=queryset, pks=page),
+                    many=True,
                 )
-                .order_by("order", "created")
+                return self.get_paginated_response(serializer.data)
+
+            queryset = self.in_hanging_list_order(
+                queryset=queryset, pks=hanging_list
             )
-            # Because the filtering has changed the list, we can no longer
-            # reapply .order_by("?"), as the ordering would not be consistent
-            # with the ordering of the full list. Instead, we use the
-            # previously saved randomized_qs and filter the proper items
-            # out of it.
-            if reader_study and reader_study.shuffle_hanging_list:
-                pks = queryset.values_list("pk", flat=True)
-                queryset = [x for x in self.randomized_qs if x.pk in pks]
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -1117,21 +1131,23 @@ class DisplaySetViewSet(
 
     def get_object(self):
         obj = super().get_object()
-        # retrieve the full queryset and save its shuffled version to later
-        # determine the shuffled index for this object
+        # Save the shuffled hanging list to determine the index of this object
         if obj.reader_study.shuffle_hanging_list:
-            queryset = self.get_queryset()
-            queryset = super().filter_queryset(queryset)
-            queryset = queryset.filter(reader_study=obj.reader_study)
-            self.create_randomized_qs(queryset=queryset)
+            self.set_hanging_list(reader_study=obj.reader_study)
         return obj
 
-    def create_randomized_qs(self, queryset):
-        set_seed(1 / int(self.request.user.pk))
-        queryset = queryset.order_by("?")
-        # Save the queryset to determine each item's index in the serializer
-        self.randomized_qs = list(queryset)
-        return queryset
+    def set_hanging_list(self, *, reader_study):
+        hanging_list = reader_study.get_hanging_list(user=self.request.user)
+        # Save the index of each item for the serializer
+        self.hanging_list_index = {
+            pk: idx for idx, pk in enumerate(hanging_list)
+        }
+        return hanging_list
+
+    @staticmethod
+    def in_hanging_list_order(*, queryset, pks):
+        display_sets = queryset.in_bulk(pks)
+        return [display_sets[pk] for pk in pks]
 
 
 class QuestionViewSet(ReadOnlyModelViewSet):
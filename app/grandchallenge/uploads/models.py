@@ -111,7 +111,7 @@ class UserUpload(UUIDModel):
     def creators_key_prefix(self):
         # Prefix to objects that the user has uploaded
         # Do not change this
-        return f"uploads/{self.creator.pk}/"
+        return f"uploads/{self.creator_id}/"
 
     @property
     def can_upload_more(self):
@@ -1,11 +1,14 @@
+from collections import Counter
 from datetime import timedelta
+from functools import partial
 from math import ceil
 
 from django.conf import settings
 from django.db import models
 from django.db.models import Avg
+from django.db.transaction import on_commit
 
-from grandchallenge.core.models import UUIDModel
+from grandchallenge.core.models import FieldChangeMixin, UUIDModel
 from grandchallenge.core.validators import JSONValidator
 from grandchallenge.reader_studies.interactive_algorithms import (
     InteractiveAlgorithmChoices,
@@ -111,7 +114,50 @@ class ComponentJobUtilizationManager(models.QuerySet):
         )["duration__avg"]
 
 
-class ComponentJobUtilization(UUIDModel):
+def update_compute_cost_ledger(*, utilizations, adding):
+    """
+    Apply the change in compute cost of the saved utilizations to the
+    running totals of their challenges and phases once the transaction
+    commits.
+
+    The totals are reconciled by update_challenge_compute_costs.
+    """
+    from grandchallenge.challenges.costs import apply_compute_cost_deltas
+
+    challenge_deltas = Counter()
+    phase_deltas = Counter()
+
+    for utilization in utilizations:
+        challenge_delta, phase_delta = utilization._get_compute_cost_deltas(
+            adding=adding
+        )
+        challenge_deltas.update(challenge_delta)
+        phase_deltas.update(phase_delta)
+
+    challenge_deltas = {
+        pk: delta
+        for pk, delta in challenge_deltas.items()
+        if pk is not None and delta
+    }
+    phase_deltas = {
+        pk: delta
+        for pk, delta in phase_deltas.items()
+        if pk is not None and delta
+    }
+
+    if challenge_deltas or phase_deltas:
+        on_commit(
+            partial(
+                apply_compute_cost_deltas,
+                challenge_deltas=challenge_deltas,
+                phase_deltas=phase_deltas,
+            ),
+            # Any missed updates are fixed by the reconciliation
+            robust=True,
+        )
+
+
+class ComponentJobUtilization(FieldChangeMixin, UUIDModel):
     creator = models.ForeignKey(
         settings.AUTH_USER_MODEL, null=True, on_delete=models.SET_NULL
     )
@@ -138,6 +184,35 @@ class ComponentJobUtilization(UUIDModel):
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs) -> None:
+        adding = self._state.adding
+
+        super().save(*args, **kwargs)
+
+        update_compute_cost_ledger(utilizations=[self], adding=adding)
+
+    def _get_costed_phase_id(self, *, get_value):
+        return get_value("phase")
+
+    def _get_compute_cost_deltas(self, *, adding):
+        states = [(1, self._current_value)]
+        if not adding:
+            states.append((-1, self.initial_value))
+
+        challenge_deltas = Counter()
+        phase_deltas = Counter()
+
+        for sign, get_value in states:
+            cost = sign * (get_value("compute_cost_euro_millicents") or 0)
+            challenge_deltas[get_value("challenge")] += cost
+            phase_deltas[
+                self._get_costed_phase_id(get_value=get_value)
+            ] += cost
+
+        self._initial_state = self._current_state
+
+        return challenge_deltas, phase_deltas
+
 
 class JobUtilization(ComponentJobUtilization):
     job = models.OneToOneField(
@@ -223,3 +298,10 @@ class EvaluationUtilization(ComponentJobUtilization):
                 )
 
         super().save(*args, **kwargs)
+
+    def _get_costed_phase_id(self, *, get_value):
+        # The costs of external evaluations are not attributed to the phase
+        if get_value("external_evaluation"):
+            return None
+        else:
+            return get_value("phase")
@@ -1,6 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
 
@@ -9,41 +11,82 @@ from grandchallenge.components.backends.base import duration_to_millicents
 from grandchallenge.core.celery import acks_late_2xlarge_task
 from grandchallenge.core.exceptions import LockNotAcquiredException
 from grandchallenge.core.utils.query import check_lock_acquired
-from grandchallenge.utilization.models import JobWarmPoolUtilization
+from grandchallenge.core.utils.rate_limit import TokenBucket
+from grandchallenge.utilization.models import (
+    JobWarmPoolUtilization,
+    update_compute_cost_ledger,
+)
+
+WARM_POOL_UTILIZATION_BATCH_SIZE = 100
+WARM_POOL_DESCRIBE_CONCURRENCY = 8
+WARM_POOL_DESCRIBE_RATE_PER_SECOND = 10
+WARM_POOL_DESCRIBE_CACHE_TIMEOUT = timedelta(hours=1)
 
 
 @acks_late_2xlarge_task(retry_on=(LockNotAcquiredException,))
-@transaction.atomic
 def create_job_warm_pool_utilizations():
-    with check_lock_acquired():
+    """
+    Creates the warm pool utilizations of completed jobs in batches.
+
+    The backend is queried for each batch concurrently, outside of any
+    transaction, and the jobs are only locked while the utilizations are
+    created.
+    """
+    rate_limiter = TokenBucket(rate=WARM_POOL_DESCRIBE_RATE_PER_SECOND)
+    last_pk = None
+
+    while True:
+        jobs = Job.objects.only_completed().filter(
+            use_warm_pool=True, job_warm_pool_utilization__isnull=True
+        )
+
+        if last_pk is not None:
+            jobs = jobs.filter(pk__gt=last_pk)
+
         jobs = list(
-            Job.objects.only_completed()
-            .filter(use_warm_pool=True, job_warm_pool_utilization__isnull=True)
-            .select_related(
+            jobs.select_related(
                 "job_utilization",
                 "algorithm_image",
                 "algorithm_image__algorithm",
-            )
-            .select_for_update(
-                # Lock the algorithm and algorithm_image to avoid conflicts when updating later
-                of=(
-                    "self",
-                    "algorithm_image",
-                    "algorithm_image__algorithm",
-                ),
-                nowait=True,
-                no_key=True,
-            )
+                "algorithm_model",
+            ).order_by("pk")[:WARM_POOL_UTILIZATION_BATCH_SIZE]
         )
 
-    for job in jobs:
-        executor = job.get_executor(
-            backend=settings.COMPONENTS_DEFAULT_BACKEND
+        if not jobs:
+            break
+
+        _create_job_warm_pool_utilizations(
+            jobs=jobs,
+            billable_times=_get_warm_pool_retained_billable_times(
+                jobs=jobs, rate_limiter=rate_limiter
+            ),
         )
 
+        if len(jobs) < WARM_POOL_UTILIZATION_BATCH_SIZE:
+            break
+
+        last_pk = jobs[-1].pk
+
+
+def _get_warm_pool_retained_billable_times(*, jobs, rate_limiter):
+    cache_keys = {
+        job.pk: f"warm-pool-retained-billable-time-{job.pk}" for job in jobs
+    }
+    cached = cache.get_many(cache_keys.values())
+
+    billable_times = {
+        job.pk: cached[cache_keys[job.pk]]
+        for job in jobs
+        if cache_keys[job.pk] in cached
+    }
+
+    def get_billable_time(job, executor):
+        rate_limiter.acquire()
+
         try:
-            warm_pool_retained_billable_time_in_seconds = (
-                executor.warm_pool_retained_billable_time_in_seconds
+            return (
+                executor.warm_pool_retained_billable_time_in_seconds,
+                executor.usd_cents_per_hour,
             )
         except ObjectDoesNotExist:
             if job.status == job.CANCELLED or (
@@ -51,19 +94,92 @@ def create_job_warm_pool_utilizations():
                 and "was not ready to be used" in job.error_message
             ):
                 # The job was never started
-                warm_pool_retained_billable_time_in_seconds = 0
+                return 0, executor.usd_cents_per_hour
             else:
                 raise
 
-        if warm_pool_retained_billable_time_in_seconds is not None:
-            duration = timedelta(
-                seconds=warm_pool_retained_billable_time_in_seconds
+    uncached_jobs = [job for job in jobs if job.pk not in billable_times]
+
+    # The executors are created here as creating them reads related
+    # objects, which must not open database connections in the threads
+    job_executors = [
+        job.get_executor(backend=settings.COMPONENTS_DEFAULT_BACKEND)
+        for job in uncached_jobs
+    ]
+
+    with ThreadPoolExecutor(
+        max_workers=WARM_POOL_DESCRIBE_CONCURRENCY
+    ) as executor:
+        for job, (seconds, usd_cents_per_hour) in zip(
+            uncached_jobs,
+            executor.map(get_billable_time, uncached_jobs, job_executors),
+            strict=True,
+        ):
+            if seconds is not None:
+                billable_times[job.pk] = (seconds, usd_cents_per_hour)
+
+    cache.set_many(
+        {
+            cache_keys[pk]: billable_time
+            for pk, billable_time in billable_times.items()
+        },
+        timeout=WARM_POOL_DESCRIBE_CACHE_TIMEOUT.total_seconds(),
+    )
+
+    return billable_times
+
+
+@transaction.atomic
+def _create_job_warm_pool_utilizations(*, jobs, billable_times):
+    with check_lock_acquired():
+        locked_jobs = (
+            Job.objects.filter(
+                pk__in=billable_times,
+                job_warm_pool_utilization__isnull=True,
             )
-            JobWarmPoolUtilization.objects.create(
+            .select_related(
+                "algorithm_image",
+                "algorithm_image__algorithm",
+            )
+            .select_for_update(
+                # Lock the algorithm and algorithm_image to avoid conflicts when updating later
+                of=(
+                    "self",
+                    "algorithm_image",
+                    "algorithm_image__algorithm",
+                ),
+                nowait=True,
+                no_key=True,
+            )
+        )
+        locked_pks = {job.pk for job in locked_jobs}
+
+    utilizations = []
+
+    for job in jobs:
+        if job.pk not in locked_pks:
+            continue
+
+        seconds, usd_cents_per_hour = billable_times[job.pk]
+        duration = timedelta(seconds=seconds)
+
+        # Mirrors JobWarmPoolUtilization.save for new instances
+        utilizations.append(
+            JobWarmPoolUtilization(
                 job=job,
                 duration=duration,
                 compute_cost_euro_millicents=duration_to_millicents(
                     duration=duration,
-                    usd_cents_per_hour=executor.usd_cents_per_hour,
+                    usd_cents_per_hour=usd_cents_per_hour,
                 ),
+                creator_id=job.job_utilization.creator_id,
+                phase_id=job.job_utilization.phase_id,
+                challenge_id=job.job_utilization.challenge_id,
+                archive_id=job.job_utilization.archive_id,
+                algorithm_image_id=job.job_utilization.algorithm_image_id,
+                algorithm_id=job.job_utilization.algorithm_id,
             )
+        )
+
+    JobWarmPoolUtilization.objects.bulk_create(utilizations)
+    update_compute_cost_ledger(utilizations=utilizations, adding=True)
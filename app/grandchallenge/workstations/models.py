@@ -31,7 +31,11 @@ from grandchallenge.core.guardian import (
     GroupObjectPermissionBase,
     UserObjectPermissionBase,
 )
-from grandchallenge.core.models import FieldChangeMixin, UUIDModel
+from grandchallenge.core.models import (
+    FieldChangeMixin,
+    StatusCountersMixin,
+    UUIDModel,
+)
 from grandchallenge.core.storage import (
     get_logo_path,
     protected_s3_storage,
@@ -348,7 +352,7 @@ class SessionManager(models.QuerySet):
         )
 
 
-class Session(FieldChangeMixin, UUIDModel):
+class Session(StatusCountersMixin, FieldChangeMixin, UUIDModel):
     """
     Tracks who has launched workstation images. The ``WorkstationImage`` will
     be launched as a ``Service``. The ``Session`` is responsible for starting
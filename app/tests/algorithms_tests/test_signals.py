@@ -2,6 +2,10 @@ import pytest
 from django.contrib.auth.models import Group
 from guardian.shortcuts import get_perms
 
+from grandchallenge.components.models import (
+    EMPTY_CIV_SET_FINGERPRINT,
+    get_civ_set_fingerprint,
+)
 from tests.algorithms_tests.factories import AlgorithmJobFactory
 from tests.algorithms_tests.utils import TwoAlgorithms
 from tests.components_tests.factories import ComponentInterfaceValueFactory
@@ -310,3 +314,37 @@ def test_permissions_removed_on_job_deletion(settings):
     job.delete()
 
     assert get_groups_with_set_perms(image) == {}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("reverse", [True, False])
+def test_job_inputs_fingerprint_signal(reverse):
+    j1, j2 = AlgorithmJobFactory.create_batch(2, time_limit=60)
+    civ1, civ2, civ3 = ComponentInterfaceValueFactory.create_batch(3)
+
+    # Remove the inputs created by the factory
+    j1.inputs.clear()
+    j2.inputs.clear()
+
+    if reverse:
+        for civ in [civ1, civ2, civ3]:
+            civ.algorithms_jobs_as_input.add(j1, j2)
+        civ3.algorithms_jobs_as_input.remove(j1)
+        civ2.algorithms_jobs_as_input.clear()
+    else:
+        j1.inputs.add(civ1, civ2, civ3)
+        j1.inputs.remove(civ2, civ3)
+        j2.inputs.set([civ1, civ3])
+
+    j1.refresh_from_db()
+    j2.refresh_from_db()
+
+    assert j1.inputs_fingerprint == get_civ_set_fingerprint(civ_pks=[civ1.pk])
+    assert j2.inputs_fingerprint == get_civ_set_fingerprint(
+        civ_pks=[civ3.pk, civ1.pk]
+    )
+
+    j2.inputs.clear()
+    j2.refresh_from_db()
+
+    assert j2.inputs_fingerprint == EMPTY_CIV_SET_FINGERPRINT
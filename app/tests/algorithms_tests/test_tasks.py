@@ -5,8 +5,9 @@ import pytest
 from actstream.models import Follow
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.timezone import now
-from guardian.shortcuts import assign_perm
+from guardian.shortcuts import assign_perm, get_group_perms
 
+from grandchallenge.algorithms.exceptions import TooManyJobsScheduled
 from grandchallenge.algorithms.models import AlgorithmImage, Job
 from grandchallenge.algorithms.tasks import (
     create_algorithm_jobs,
@@ -233,6 +234,77 @@ class TestCreateAlgorithmJobs:
         for g in groups:
             assert jobs[0].viewer_groups.filter(pk=g.pk).exists()
 
+    def test_bulk_created_jobs_match_created_jobs(
+        self, settings, django_assert_max_num_queries
+    ):
+        settings.ALGORITHMS_MAX_ACTIVE_JOBS_PER_ALGORITHM = 1
+
+        ai = AlgorithmImageFactory()
+        ci = ComponentInterface.objects.get(slug="generic-medical-image")
+        interface = AlgorithmInterfaceFactory(inputs=[ci])
+        ai.algorithm.interfaces.set([interface])
+        archive = ArchiveFactory()
+        images = ImageFactory.create_batch(3)
+
+        for image in images:
+            item = ArchiveItemFactory(archive=archive)
+            item.values.add(
+                ComponentInterfaceValueFactory(image=image, interface=ci)
+            )
+
+        viewers, logs_viewers = GroupFactory(), GroupFactory()
+
+        with django_assert_max_num_queries(30):
+            jobs = create_algorithm_jobs(
+                algorithm_image=ai,
+                archive_items=ArchiveItem.objects.all(),
+                extra_viewer_groups=[viewers],
+                extra_logs_viewer_groups=[logs_viewers],
+                time_limit=ai.algorithm.time_limit,
+                requires_gpu_type=GPUTypeChoices.A10G,
+                requires_memory_gb=4,
+                max_jobs=16,
+            )
+
+        assert len(jobs) == 3
+        assert [j.use_warm_pool for j in jobs] == [True, True, False]
+
+        for job in Job.objects.all():
+            assert job.credits_consumed > 0
+            assert job.is_complimentary is False
+            assert job.utilization.archive == archive
+            assert job.utilization.algorithm == ai.algorithm
+            assert job.utilization.algorithm_image == ai
+            assert {*job.viewer_groups.all()} == {viewers}
+            assert {*get_group_perms(viewers, job)} == {"view_job"}
+            assert {*get_group_perms(logs_viewers, job)} == {"view_logs"}
+
+        for image in images:
+            assert {*get_group_perms(viewers, image)} == {"view_image"}
+            assert not get_group_perms(logs_viewers, image)
+
+    def test_too_many_jobs_keeps_created_jobs(self):
+        ai = AlgorithmImageFactory()
+        ci = ComponentInterface.objects.get(slug="generic-medical-image")
+        interface = AlgorithmInterfaceFactory(inputs=[ci])
+        ai.algorithm.interfaces.set([interface])
+
+        for _ in range(3):
+            item = ArchiveItemFactory()
+            item.values.add(ComponentInterfaceValueFactory(interface=ci))
+
+        with pytest.raises(TooManyJobsScheduled):
+            create_algorithm_jobs(
+                algorithm_image=ai,
+                archive_items=ArchiveItem.objects.all(),
+                time_limit=ai.algorithm.time_limit,
+                requires_gpu_type=ai.algorithm.job_requires_gpu_type,
+                requires_memory_gb=ai.algorithm.job_requires_memory_gb,
+                max_jobs=2,
+            )
+
+        assert Job.objects.count() == 2
+
 
 @pytest.mark.django_db
 def test_no_jobs_workflow(django_capture_on_commit_callbacks):
@@ -271,7 +343,8 @@ def test_jobs_workflow(django_capture_on_commit_callbacks):
             requires_memory_gb=ai.algorithm.job_requires_memory_gb,
             max_jobs=16,
         )
-    assert len(callbacks) == 2
+    # The execution of all of the jobs is dispatched at once
+    assert len(callbacks) == 1
 
 
 @pytest.mark.django_db
@@ -1,5 +1,9 @@
 import pytest
 
+from grandchallenge.components.models import (
+    EMPTY_CIV_SET_FINGERPRINT,
+    get_civ_set_fingerprint,
+)
 from tests.archives_tests.factories import ArchiveFactory, ArchiveItemFactory
 from tests.components_tests.factories import ComponentInterfaceValueFactory
 from tests.evaluation_tests.test_permissions import get_groups_with_set_perms
@@ -108,3 +112,33 @@ def test_changing_archive_updates_permissions():
         a2.uploaders_group: {"view_image"},
         a2.users_group: {"view_image"},
     }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("reverse", [True, False])
+def test_archive_item_values_fingerprint_signal(reverse):
+    ai1, ai2 = ArchiveItemFactory.create_batch(2)
+    civ1, civ2, civ3 = ComponentInterfaceValueFactory.create_batch(3)
+
+    if reverse:
+        for civ in [civ1, civ2, civ3]:
+            civ.archive_items.add(ai1, ai2)
+        civ3.archive_items.remove(ai1)
+        civ2.archive_items.clear()
+    else:
+        ai1.values.add(civ1, civ2, civ3)
+        ai1.values.remove(civ2, civ3)
+        ai2.values.set([civ1, civ3])
+
+    ai1.refresh_from_db()
+    ai2.refresh_from_db()
+
+    assert ai1.values_fingerprint == get_civ_set_fingerprint(civ_pks=[civ1.pk])
+    assert ai2.values_fingerprint == get_civ_set_fingerprint(
+        civ_pks=[civ3.pk, civ1.pk]
+    )
+
+    ai2.values.clear()
+    ai2.refresh_from_db()
+
+    assert ai2.values_fingerprint == EMPTY_CIV_SET_FINGERPRINT
@@ -13,10 +13,15 @@ from panimg.image_builders.metaio_utils import (
 )
 
 from grandchallenge.cases.models import Image, RawImageUploadSession
-from grandchallenge.cases.tasks import check_compressed_and_extract
+from grandchallenge.cases.tasks import (
+    DuplicateFilesException,
+    check_compressed_and_extract,
+    download_and_extract_uploads,
+)
 from grandchallenge.notifications.models import Notification
 from tests.cases_tests import RESOURCE_PATH
-from tests.factories import UploadSessionFactory
+from tests.factories import UploadSessionFactory, UserFactory
+from tests.uploads_tests.factories import create_upload_from_file
 from tests.utils import create_raw_upload_image_session
 
 
@@ -340,3 +345,52 @@ def test_failed_image_import_notification(
         Notification.objects.get().user
         == RawImageUploadSession.objects.get().creator
     )
+
+
+def test_check_compressed_and_extract_skips_non_zip_files(tmp_path):
+    src = tmp_path / "not_a_zip.zip"
+    src.write_bytes(b"not a zip file")
+
+    check_compressed_and_extract(src_path=src, checked_paths=set())
+
+    assert src.read_bytes() == b"not a zip file"
+    assert [*tmp_path.iterdir()] == [src]
+
+
+@pytest.mark.django_db
+def test_download_and_extract_uploads(tmp_path):
+    creator = UserFactory()
+    uploads = [
+        create_upload_from_file(file_path=RESOURCE_PATH / f, creator=creator)
+        for f in ("test.zip", "image10x10x10.mha")
+    ]
+
+    download_and_extract_uploads(uploads, tmp_path)
+
+    assert sorted(
+        str(p.relative_to(tmp_path))
+        for p in tmp_path.rglob("*")
+        if p.is_file()
+    ) == [
+        "image10x10x10.mha",
+        "test.zip/file-0.txt",
+        "test.zip/folder-1/file-1.txt",
+        "test.zip/folder-1/folder-2/file-2.txt",
+        "test.zip/folder-1/folder-2/folder-3.zip/file-3.txt",
+    ]
+
+
+@pytest.mark.django_db
+def test_download_and_extract_uploads_duplicate_files(tmp_path):
+    creator = UserFactory()
+    uploads = [
+        create_upload_from_file(
+            file_path=RESOURCE_PATH / "image10x10x10.mha", creator=creator
+        )
+        for _ in range(2)
+    ]
+
+    with pytest.raises(DuplicateFilesException):
+        download_and_extract_uploads(uploads, tmp_path)
+
+    assert [*tmp_path.iterdir()] == []
@@ -6,12 +6,16 @@ from pathlib import Path
 from unittest.mock import MagicMock
 
 import factory
+import numpy as np
 import pytest
 from actstream.actions import is_following
 from botocore.stub import Stubber
 from django.conf import settings
 from django.core.exceptions import MultipleObjectsReturned
 from django.core.files import File
+from panimg.image_builders.metaio_utils import load_sitk_image, parse_mh_header
+from panimg.models import SimpleITKImage
+from SimpleITK import GetArrayViewFromImage
 
 from grandchallenge.cases.models import (
     DICOMImageSet,
@@ -20,12 +24,14 @@ from grandchallenge.cases.models import (
     generate_dicom_id_suffix,
 )
 from grandchallenge.notifications.models import Notification
+from tests.cases_tests import RESOURCE_PATH
 from tests.cases_tests.factories import (
     DICOMImageSetFactory,
     DICOMImageSetUploadFactory,
     ImageFactory,
     ImageFactoryWithImageFile,
     ImageFactoryWithImageFile4D,
+    ImageFactoryWithoutImageFile,
     ImageFileFactoryWithMHDFile,
     ImageFileFactoryWithRAWFile,
     fake_dicom_instance_uid,
@@ -128,6 +134,42 @@ class TestGetSitkImage:
         )
 
 
+@pytest.mark.parametrize(
+    "resources",
+    (
+        ("mask.mha",),
+        ("1x2int16.mha",),
+        ("image10x11x12x13.mha",),
+        ("image3x4.mhd", "image3x4.zraw"),
+        ("image10x10x10.mhd", "image10x10x10.zraw"),
+    ),
+)
+@pytest.mark.django_db
+def test_streamed_metaimage(resources):
+    image = ImageFactoryWithoutImageFile()
+    for resource in resources:
+        ImageFileFactory(
+            image=image,
+            file=factory.django.FileField(from_path=RESOURCE_PATH / resource),
+        )
+
+    expected = SimpleITKImage(
+        image=load_sitk_image(RESOURCE_PATH / resources[0]),
+        name=resources[0],
+        consumed_files=set(),
+        spacing_valid=True,
+    )
+
+    assert image.metaimage_header == parse_mh_header(
+        RESOURCE_PATH / resources[0]
+    )
+    assert np.array_equal(
+        np.concatenate([*image.iter_voxel_chunks()]),
+        GetArrayViewFromImage(expected.image).ravel(),
+    )
+    assert image.get_segments() == expected.segments
+
+
 @pytest.mark.django_db
 def test_image_file_cleanup(uploaded_image):
     filename = f"{uuid.uuid4()}.zraw"
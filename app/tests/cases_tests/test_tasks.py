@@ -198,6 +198,64 @@ def test_post_processing(
     )
 
 
+@pytest.mark.django_db
+def test_import_images_bulk_creates(
+    tmpdir_factory, django_assert_max_num_queries
+):
+    input_directory = tmpdir_factory.mktemp("temp")
+    for filename in (
+        "image10x10x10.mha",
+        "image10x11x12x13.mha",
+        "image16bit.mha",
+        "valid_tiff.tif",
+        "no_dzi.tif",
+    ):
+        shutil.copy(RESOURCE_PATH / filename, input_directory / filename)
+
+    # The number of queries must not depend on the number of images
+    with django_assert_max_num_queries(5):
+        imported_images = import_images(input_directory=input_directory)
+
+    assert len(imported_images.new_images) == 5
+    assert len(imported_images.consumed_files) == 5
+    assert Image.objects.count() == 5
+    assert ImageFile.objects.count() == 5
+    assert PostProcessImageTask.objects.count() == 2
+
+    for image_file in ImageFile.objects.all():
+        assert protected_s3_storage.exists(image_file.file.name)
+        assert image_file.size_in_storage > 0
+
+
+@pytest.mark.django_db
+def test_import_images_deletes_files_if_insert_fails(tmpdir_factory):
+    input_directory = tmpdir_factory.mktemp("temp")
+    shutil.copy(
+        RESOURCE_PATH / "image10x10x10.mha",
+        input_directory / "image10x10x10.mha",
+    )
+
+    saved_files = []
+    save_files = ImageFile.save_files
+
+    def save_and_record_files(self):
+        save_files(self)
+        saved_files.append(self.file.name)
+
+    with (
+        patch.object(ImageFile, "save_files", save_and_record_files),
+        patch.object(
+            ImageFile.objects, "bulk_create", side_effect=IntegrityError
+        ),
+        pytest.raises(IntegrityError),
+    ):
+        import_images(input_directory=input_directory)
+
+    assert len(saved_files) == 1
+    assert not protected_s3_storage.exists(saved_files[0])
+    assert not Image.objects.exists()
+
+
 @pytest.mark.django_db
 def test_unique_post_processing():
     image = ImageFactory()
@@ -332,6 +332,50 @@ def test_challenge_budget_alert_no_budget():
     assert "Budget Consumed Alert" in mail.outbox[0].subject
 
 
+@pytest.mark.django_db
+def test_challenge_compute_costs_reconciled(
+    django_capture_on_commit_callbacks,
+):
+    phase = PhaseFactory()
+    evaluation = EvaluationFactory(submission__phase=phase, time_limit=60)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        evaluation.utilization.compute_cost_euro_millicents = 100
+        evaluation.utilization.save()
+
+    Challenge.objects.filter(pk=phase.challenge.pk).update(
+        compute_cost_euro_millicents=1
+    )
+
+    update_challenge_compute_costs()
+
+    phase.refresh_from_db()
+    phase.challenge.refresh_from_db()
+
+    assert phase.compute_cost_euro_millicents == 100
+    assert phase.challenge.compute_cost_euro_millicents == 100
+
+
+@pytest.mark.django_db
+def test_challenge_compute_costs_num_queries(django_assert_num_queries):
+    for cost in (100, 200, 300):
+        evaluation = EvaluationFactory(time_limit=60)
+        evaluation.utilization.compute_cost_euro_millicents = cost
+        evaluation.utilization.save()
+
+    # Nothing changes after the first reconciliation
+    update_challenge_compute_costs()
+
+    with django_assert_num_queries(9):
+        update_challenge_compute_costs()
+
+    assert sorted(
+        Challenge.objects.values_list(
+            "compute_cost_euro_millicents", flat=True
+        )
+    ) == [0, 0, 0, 100, 200, 300]
+
+
 _fixed_now = datetime(2025, 1, 29, 11, 0, 0, tzinfo=ZoneInfo("UTC"))
 
 
@@ -450,6 +450,66 @@ def test_set_task_logs(settings):
     assert executor.stderr == "2022-06-08T10:23:58+00:00 hello from stderr"
 
 
+def test_set_task_logs_stops_at_loglines(settings, monkeypatch):
+    settings.COMPONENTS_AMAZON_ECR_REGION = "us-east-1"
+    monkeypatch.setattr(
+        "grandchallenge.components.backends.amazon_sagemaker_base.LOGLINES", 1
+    )
+
+    pk = uuid4()
+    executor = AmazonSageMakerTrainingExecutor(
+        job_id=f"algorithms-job-{pk}",
+        exec_image_repo_tag="",
+        memory_limit=4,
+        time_limit=60,
+        requires_gpu_type=GPUTypeChoices.NO_GPU,
+        use_warm_pool=False,
+        signing_key=b"",
+    )
+
+    with Stubber(executor._logs_client) as logs:
+        logs.add_response(
+            method="describe_log_streams",
+            service_response={
+                "logStreams": [
+                    {"logStreamName": f"localhost-A-{pk}/i-whatever"},
+                ]
+            },
+        )
+        logs.add_response(
+            method="get_log_events",
+            service_response={
+                "events": [
+                    {
+                        "message": json.dumps(
+                            {
+                                "log": f"hello from {source}",
+                                "source": source,
+                                "internal": False,
+                            }
+                        ),
+                        "timestamp": 1654683838000,
+                    }
+                    for source in ("stdout", "stderr")
+                ],
+                "nextBackwardToken": "foo",
+            },
+        )
+
+        executor._set_task_logs(
+            event={
+                "TrainingStartTime": 1654767467000,
+                "TrainingEndTime": 1654767481000,
+            }
+        )
+
+        # The older pages are not requested
+        logs.assert_no_pending_responses()
+
+    assert executor.stdout == "2022-06-08T10:23:58+00:00 hello from stdout"
+    assert executor.stderr == "2022-06-08T10:23:58+00:00 hello from stderr"
+
+
 def test_set_runtime_metrics(settings):
     settings.COMPONENTS_AMAZON_ECR_REGION = "us-east-1"
 
@@ -1,10 +1,12 @@
 import asyncio
+import functools
 import hashlib
 import hmac
 import io
 import json
 import os
 from datetime import timedelta
+from pathlib import Path
 from unittest.mock import Mock
 from uuid import uuid4
 from zipfile import ZipInfo
@@ -20,7 +22,10 @@ from grandchallenge.components.backends.base import (
     ASYNC_BOTO_CONFIG,
     ASYNC_CONCURRENCY,
     InferenceResult,
+    delete_expired_objects_from_input_cache,
+    run_s3_tasks,
     s3_stream_response,
+    s3_upload_content,
 )
 from grandchallenge.components.backends.docker_client import _get_cpuset_cpus
 from grandchallenge.components.backends.exceptions import ComponentException
@@ -30,6 +35,7 @@ from grandchallenge.components.backends.utils import (
 )
 from grandchallenge.components.models import InterfaceKindChoices
 from grandchallenge.components.schemas import GPUTypeChoices
+from grandchallenge.core.metrics import collect
 from tests.cases_tests.factories import DICOMImageSetFactory
 from tests.components_tests.factories import (
     ComponentInterfaceFactory,
@@ -450,6 +456,31 @@ async def test_s3_stream_response_aborts_on_stream_error(settings):
         assert status_code == 404
 
 
+@pytest.mark.asyncio
+async def test_run_s3_tasks_records_bytes_uploaded(settings):
+    collect()
+
+    # The larger content is sent as a multipart upload
+    contents = [b"h" * 10, b"w" * 10 * settings.MEGABYTE]
+
+    await run_s3_tasks(
+        tasks=[
+            functools.partial(
+                s3_upload_content,
+                content=content,
+                bucket=settings.COMPONENTS_INPUT_BUCKET_NAME,
+                key=f"test-{uuid4()}",
+            )
+            for content in contents
+        ],
+        concurrency=ASYNC_CONCURRENCY,
+    )
+
+    assert {
+        metric.name: value for metric, value in collect().counters.items()
+    }["S3BytesUploaded"] == sum(len(content) for content in contents)
+
+
 def normalize_partial(partial):
     keywords = dict(partial.keywords)
 
@@ -831,3 +862,156 @@ def test_invocation_results_signature_verified(settings):
     )
 
     assert executor._get_inference_result() == inference_result
+
+
+@pytest.mark.django_db
+def test_get_outputs(settings):
+    # A single connection checks that listing the image prefix
+    # does not block the downloads of the files it contains
+    settings.COMPONENTS_OUTPUT_DOWNLOAD_CONCURRENCY = 1
+
+    executor = IOCopyExecutor(
+        job_id=f"test-test-{uuid4()}",
+        exec_image_repo_tag="test",
+        memory_limit=4,
+        time_limit=100,
+        requires_gpu_type=GPUTypeChoices.NO_GPU,
+        use_warm_pool=False,
+        signing_key=b"",
+    )
+
+    image_interface = ComponentInterfaceFactory(
+        kind=InterfaceKindChoices.PANIMG_IMAGE,
+        relative_path="images/test-image",
+    )
+    json_interface = ComponentInterfaceFactory(
+        kind=InterfaceKindChoices.ANY,
+        relative_path="test.json",
+        store_in_database=True,
+    )
+    file_interface = ComponentInterfaceFactory(
+        kind=InterfaceKindChoices.CSV,
+        relative_path="test.csv",
+        store_in_database=False,
+    )
+
+    resources = Path(__file__).parent.parent / "cases_tests" / "resources"
+    for filename in ("image10x10x10.mhd", "image10x10x10.zraw"):
+        executor._s3_client.upload_file(
+            Filename=resources / filename,
+            Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
+            Key=f"{executor._io_prefix}/images/test-image/{filename}",
+        )
+    for key, content in (("test.json", b'{"foo": 1}'), ("test.csv", b"a,b")):
+        executor._s3_client.upload_fileobj(
+            Fileobj=io.BytesIO(content),
+            Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
+            Key=f"{executor._io_prefix}/{key}",
+        )
+
+    image_civ, json_civ, file_civ = executor.get_outputs(
+        output_interfaces=[image_interface, json_interface, file_interface]
+    )
+
+    assert image_civ.interface == image_interface
+    assert image_civ.image.width == 10
+    assert json_civ.value == {"foo": 1}
+    with file_civ.file.open("rb") as f:
+        assert f.read() == b"a,b"
+
+
+@pytest.mark.django_db
+def test_get_outputs_errors_in_interface_order():
+    executor = IOCopyExecutor(
+        job_id=f"test-test-{uuid4()}",
+        exec_image_repo_tag="test",
+        memory_limit=4,
+        time_limit=100,
+        requires_gpu_type=GPUTypeChoices.NO_GPU,
+        use_warm_pool=False,
+        signing_key=b"",
+    )
+
+    image_interface = ComponentInterfaceFactory(
+        kind=InterfaceKindChoices.PANIMG_IMAGE,
+        relative_path="images/test-image",
+    )
+    json_interface = ComponentInterfaceFactory(
+        kind=InterfaceKindChoices.ANY,
+        relative_path="test.json",
+        store_in_database=True,
+    )
+
+    with pytest.raises(ComponentException) as error:
+        executor.get_outputs(
+            output_interfaces=[json_interface, image_interface]
+        )
+
+    assert str(error.value) == "Output file 'test.json' was not produced"
+
+    with pytest.raises(ComponentException) as error:
+        executor.get_outputs(
+            output_interfaces=[image_interface, json_interface]
+        )
+
+    assert str(error.value) == "Output directory 'images/test-image' is empty"
+
+
+@pytest.mark.django_db
+def test_input_cache(settings):
+    settings.COMPONENTS_INPUT_CACHE_ENABLED = True
+
+    def provision():
+        executor = IOCopyExecutor(
+            job_id=f"test-test-{uuid4()}",
+            exec_image_repo_tag="test",
+            memory_limit=4,
+            time_limit=100,
+            requires_gpu_type=GPUTypeChoices.NO_GPU,
+            use_warm_pool=False,
+            signing_key=b"",
+        )
+        executor.provision(input_civs=[file_civ], input_prefixes={})
+
+        with io.BytesIO() as fileobj:
+            executor._s3_client.download_fileobj(
+                Fileobj=fileobj,
+                Bucket=settings.COMPONENTS_INPUT_BUCKET_NAME,
+                Key=executor._invocation_key,
+            )
+            fileobj.seek(0)
+            invocation = json.loads(fileobj.read().decode("utf-8"))
+
+        return executor, {
+            i["relative_path"]: i["bucket_key"]
+            for i in invocation[0]["inputs"]
+        }
+
+    file_interface = ComponentInterfaceFactory(
+        kind=InterfaceKindChoices.ANY,
+        relative_path="file.json",
+        store_in_database=False,
+    )
+    file_civ = file_interface.create_instance(value=1337)
+
+    executor, inputs = provision()
+    cache_key = inputs["file.json"]
+
+    assert cache_key.startswith("/inputs-cache/")
+    assert inputs["inputs.json"].startswith(executor._io_prefix)
+    assert executor._input_cache_prefixes == {str(Path(cache_key).parent)}
+
+    # The source is no longer needed as the cached copy is used
+    file_civ.file.storage.delete(file_civ.file.name)
+
+    _, inputs = provision()
+
+    assert inputs["file.json"] == cache_key
+
+    settings.COMPONENTS_INPUT_CACHE_TTL = timedelta(0)
+    delete_expired_objects_from_input_cache(s3_client=executor._s3_client)
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        executor._s3_client.head_object(
+            Bucket=settings.COMPONENTS_INPUT_BUCKET_NAME, Key=cache_key
+        )
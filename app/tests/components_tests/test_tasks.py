@@ -17,6 +17,10 @@ from grandchallenge.cases.models import (
     DICOMImageSetUploadStatusChoices,
     RawImageUploadSession,
 )
+from grandchallenge.components.backends.exceptions import (
+    ComponentException,
+    RetryStep,
+)
 from grandchallenge.components.exceptions import InstanceInUse
 from grandchallenge.components.models import (
     ComponentInterfaceValue,
@@ -32,8 +36,11 @@ from grandchallenge.components.tasks import (
     assign_tarball_from_upload,
     civ_value_to_file,
     delete_container_image,
+    deprovision_job,
     encode_b64j,
     execute_job,
+    handle_events,
+    parse_job_outputs,
     preload_interactive_algorithms,
     remove_container_image_from_registry,
     remove_inactive_container_images,
@@ -64,6 +71,7 @@ from tests.components_tests.factories import (
     ComponentInterfaceFactory,
     ComponentInterfaceValueFactory,
 )
+from tests.components_tests.resources.backends import IOCopyExecutor
 from tests.evaluation_tests.factories import (
     EvaluationFactory,
     EvaluationGroundTruthFactory,
@@ -1352,3 +1360,76 @@ def test_workstation_image_protected_from_deletion():
 
     workstation.refresh_from_db()
     assert workstation.is_removed is True
+
+
+class EventOutcomeExecutor(IOCopyExecutor):
+    def handle_event(self, *, event):
+        if event["outcome"] == "failed":
+            raise ComponentException("Job failed")
+        elif event["outcome"] == "retry":
+            raise RetryStep
+        elif event["outcome"] == "error":
+            raise RuntimeError
+        else:
+            self._stdout = ["Job completed"]
+
+
+@pytest.mark.django_db
+def test_handle_events(django_capture_on_commit_callbacks, settings):
+    backend = "tests.components_tests.test_tasks.EventOutcomeExecutor"
+    settings.COMPONENTS_DEFAULT_BACKEND = backend
+
+    algorithm_image = AlgorithmImageFactory()
+    outcomes = ("completed", "failed", "retry", "error", "skipped")
+    jobs = [
+        AlgorithmJobFactory(
+            algorithm_image=algorithm_image,
+            status=(Job.SUCCESS if outcome == "skipped" else Job.EXECUTING),
+            time_limit=60,
+        )
+        for outcome in outcomes
+    ]
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        errors = handle_events(
+            kwargs_list=[
+                {
+                    "event": {
+                        "_job_id": job.get_executor(backend=backend)._job_id,
+                        "outcome": outcome,
+                    },
+                    "backend": backend,
+                }
+                for job, outcome in zip(jobs, outcomes, strict=True)
+            ]
+        )
+
+    assert [type(error) for error in errors] == [
+        type(None),
+        type(None),
+        RetryStep,
+        RuntimeError,
+        type(None),
+    ]
+
+    for job in jobs:
+        job.refresh_from_db()
+
+    assert [job.status for job in jobs] == [
+        Job.EXECUTED,
+        Job.FAILURE,
+        # The updates of jobs with errors are rolled back
+        Job.EXECUTING,
+        Job.EXECUTING,
+        Job.SUCCESS,
+    ]
+    assert jobs[0].stdout == "Job completed"
+    assert jobs[1].error_message == "Job failed"
+    assert {
+        (callback.__self__.task, callback.__self__.kwargs["job_pk"])
+        for callback in callbacks
+        if hasattr(getattr(callback, "__self__", None), "task")
+    } == {
+        (parse_job_outputs.name, str(jobs[0].pk)),
+        (deprovision_job.name, str(jobs[1].pk)),
+    }
@@ -1,7 +1,17 @@
+from uuid import uuid4
+
 import pytest
+from django.contrib.auth.models import User
 from django.db.transaction import on_commit
+from django_redis import get_redis_connection
 
 from grandchallenge.core.celery import acks_late_micro_short_task
+from grandchallenge.core.metrics import collect
+from grandchallenge.core.serialized_tasks import (
+    OWNER_LEASE_SECONDS,
+    SerializedTaskQueue,
+)
+from grandchallenge.core.tasks import drain_unowned_serialized_task_queues
 
 
 @pytest.mark.django_db
@@ -31,3 +41,212 @@ def test_task_errors_raised_when_invoked(
 
     assert result.status == "SUCCESS"
     assert counter == 2
+
+
+@pytest.mark.django_db
+def test_task_profiling(settings, tmp_path):
+    @acks_late_micro_short_task
+    def profiled_task():
+        User.objects.exists()
+        User.objects.exists()
+        return "done"
+
+    settings.CELERY_TASK_PROFILING = {
+        profiled_task.name: {
+            "dump_sample_rate": 1,
+            "cprofile": True,
+            "tracemalloc": True,
+        }
+    }
+    settings.CELERY_TASK_PROFILING_DUMP_DIRECTORY = tmp_path
+
+    collect()
+
+    assert profiled_task() == "done"
+
+    metrics = collect()
+    counters = {
+        metric.name: value for metric, value in metrics.counters.items()
+    }
+    assert counters == {"TaskDatabaseQueries": 2, "TaskInvocations": 1}
+    assert {metric.name for metric in metrics.histograms} == {
+        "TaskDuration",
+        "TaskDatabaseDuration",
+        "TaskRSSGrowth",
+        "TaskInvocationRetries",
+        "TaskTracedMemoryPeak",
+    }
+    assert {path.suffix for path in tmp_path.iterdir()} == {
+        ".prof",
+        ".tracemalloc",
+    }
+
+
+def test_task_profiling_disabled(settings):
+    @acks_late_micro_short_task
+    def unprofiled_task():
+        return "done"
+
+    settings.CELERY_TASK_PROFILING = {}
+
+    collect()
+
+    assert unprofiled_task() == "done"
+    assert collect() == ({}, {})
+
+
+def test_serialized_task(settings, monkeypatch):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
+    monkeypatch.setattr(
+        "grandchallenge.core.celery.SERIALIZED_TASKS_BATCH_SIZE", 2
+    )
+
+    key = uuid4().hex
+    calls = []
+
+    @acks_late_micro_short_task(serialize_on=lambda *, key, **__: key)
+    def serialized_task(*, key, value):
+        calls.append(value)
+        if value == "error":
+            raise ValueError
+
+    queue = SerializedTaskQueue(task_name=serialized_task.name, key=key)
+
+    # Simulate another worker draining the queue
+    token = queue.acquire()
+
+    for value in (1, "error", 3):
+        serialized_task.apply_async(kwargs={"key": key, "value": value})
+
+    assert calls == []
+
+    queue.release(token=token)
+
+    serialized_task.apply_async(kwargs={"key": key, "value": 4})
+
+    # The queue is drained in order, in batches of 2, and the errors
+    # of other invocations are not raised
+    assert calls == [1, "error", 3, 4]
+    assert queue.pop() is None
+    assert not queue.is_owned
+
+    with pytest.raises(ValueError):
+        serialized_task.apply_async(kwargs={"key": key, "value": "error"})
+
+    assert not queue.is_owned
+
+    # Direct calls are not serialized
+    serialized_task(key=key, value=5)
+    assert calls[-1] == 5
+
+
+def test_drain_unowned_serialized_task_queues(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
+
+    key = uuid4().hex
+    calls = []
+
+    @acks_late_micro_short_task(serialize_on=lambda *, key, **__: key)
+    def lost_task(*, key, value):
+        calls.append(value)
+
+    queue = SerializedTaskQueue(task_name=lost_task.name, key=key)
+    queue.enqueue(kwargs={"key": key, "value": 1}, retries=0)
+
+    drain_unowned_serialized_task_queues()
+
+    assert calls == [1]
+    assert queue.pop() is None
+
+
+def test_serialized_batch_task(settings, monkeypatch):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
+    monkeypatch.setattr(
+        "grandchallenge.core.celery.SERIALIZED_TASKS_BATCH_SIZE", 2
+    )
+
+    key = uuid4().hex
+    batches = []
+
+    def batch_func(*, kwargs_list):
+        values = [kwargs["value"] for kwargs in kwargs_list]
+        batches.append(values)
+        if "ignored" in values:
+            raise KeyError
+        return [ValueError() if value == "error" else None for value in values]
+
+    @acks_late_micro_short_task(
+        serialize_on=lambda *, key, **__: key,
+        batch_func=batch_func,
+        ignore_errors=(KeyError,),
+    )
+    def batched_task(*, key, value):
+        raise NotImplementedError
+
+    queue = SerializedTaskQueue(task_name=batched_task.name, key=key)
+
+    token = queue.acquire()
+
+    for value in (1, "error", 3):
+        batched_task.apply_async(kwargs={"key": key, "value": value})
+
+    queue.release(token=token)
+
+    batched_task.apply_async(kwargs={"key": key, "value": 4})
+
+    # The invocations are run together and the errors of other
+    # invocations are not raised
+    assert batches == [[1, "error"], [3, 4]]
+    assert queue.pop() is None
+
+    with pytest.raises(ValueError):
+        batched_task.apply_async(kwargs={"key": key, "value": "error"})
+
+    # Errors of the batch function apply to all invocations
+    batched_task.apply_async(kwargs={"key": key, "value": "ignored"})
+
+    assert not queue.is_owned
+
+
+def test_serialized_task_unacknowledged_items_requeued():
+    queue = SerializedTaskQueue(task_name="test", key=uuid4().hex)
+
+    for value in (1, 2, 3):
+        queue.enqueue(kwargs={"value": value}, retries=0)
+
+    token = queue.acquire()
+    first = queue.pop()
+    queue.ack(item=first)
+    queue.pop()
+
+    # Simulate the owner being lost
+    queue.release(token=token)
+
+    token = queue.acquire()
+
+    assert [queue.pop().kwargs["value"] for _ in range(2)] == [2, 3]
+    assert queue.pop() is None
+
+    queue.release(token=token)
+
+
+def test_serialized_task_ownership_renewed():
+    queue = SerializedTaskQueue(task_name="test", key=uuid4().hex)
+    client = get_redis_connection("default")
+
+    token = queue.acquire()
+
+    assert 0 < client.ttl(queue._owner_key) <= OWNER_LEASE_SECONDS
+
+    client.expire(queue._owner_key, 1)
+
+    assert queue.renew(token=token)
+    assert client.ttl(queue._owner_key) > 1
+
+    queue.release(token=token)
+
+    assert not queue.renew(token=token)
+    assert not queue.is_owned
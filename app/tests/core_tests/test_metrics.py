@@ -0,0 +1,173 @@
+import json
+
+import pytest
+from django.db import OperationalError
+from django_redis import get_redis_connection
+
+from grandchallenge.core.exceptions import LockNotAcquiredException
+from grandchallenge.core.metrics import (
+    PrometheusMetricsExporter,
+    collect,
+    flush_metrics,
+    increment,
+    observe,
+    timed,
+)
+from grandchallenge.core.utils.query import check_lock_acquired
+
+
+@pytest.fixture(autouse=True)
+def empty_metrics():
+    collect()
+    yield
+    collect()
+
+
+def test_collect_aggregates_and_resets():
+    increment("S3Requests", Operation="GetObject")
+    increment("S3Requests", Operation="GetObject")
+    increment("S3Requests", Operation="PutObject")
+    observe("JobStageDuration", value=2, Stage="execute_job")
+    observe("JobStageDuration", value=4, Stage="execute_job")
+
+    snapshot = collect()
+
+    assert {
+        (metric.name, metric.dimensions): value
+        for metric, value in snapshot.counters.items()
+    } == {
+        ("S3Requests", (("Operation", "GetObject"),)): 2,
+        ("S3Requests", (("Operation", "PutObject"),)): 1,
+    }
+
+    (histogram,) = snapshot.histograms.values()
+    assert histogram.count == 2
+    assert histogram.total == 6
+    assert histogram.minimum == 2
+    assert histogram.maximum == 4
+    assert sum(histogram.bucket_counts) == 2
+
+    assert collect() == ({}, {})
+
+
+def test_timed():
+    @timed("JobStageDuration", Stage="test")
+    def stage():
+        return "done"
+
+    assert stage() == "done"
+
+    with pytest.raises(ValueError):
+        with timed("JobStageDuration", Stage="test"):
+            raise ValueError
+
+    (histogram,) = collect().histograms.values()
+    assert histogram.count == 2
+
+
+def test_lock_not_acquired_counted():
+    with pytest.raises(LockNotAcquiredException):
+        with check_lock_acquired():
+            raise OperationalError("could not obtain lock on row")
+
+    ((metric, value),) = collect().counters.items()
+    assert metric.name == "LocksNotAcquired"
+    assert value == 1
+
+
+def test_file_exporter(settings, tmp_path):
+    settings.METRICS_EXPORTER = (
+        "grandchallenge.core.metrics.FileMetricsExporter"
+    )
+    settings.METRICS_FILE_PATH = tmp_path / "metrics.jsonl"
+
+    increment("S3BytesUploaded", value=10, unit="Bytes")
+    flush_metrics(force=True)
+
+    # Nothing to flush
+    flush_metrics(force=True)
+
+    # Not flushed within the interval
+    increment("S3BytesUploaded", value=10, unit="Bytes")
+    flush_metrics()
+
+    (line,) = settings.METRICS_FILE_PATH.read_text().splitlines()
+    assert json.loads(line)["counters"] == [
+        {
+            "name": "S3BytesUploaded",
+            "unit": "Bytes",
+            "dimensions": {},
+            "value": 10,
+        }
+    ]
+
+
+@pytest.mark.django_db
+def test_prometheus_endpoint(client, settings):
+    settings.METRICS_EXPORTER = (
+        "grandchallenge.core.metrics.PrometheusMetricsExporter"
+    )
+    settings.METRICS_PROMETHEUS_BEARER_TOKEN = "secret"
+
+    get_redis_connection("default").delete(PrometheusMetricsExporter.KEY)
+
+    for _ in range(2):
+        increment("S3Requests", Operation="GetObject")
+        observe("JobStageDuration", value=0.2, Stage="execute_job")
+        flush_metrics(force=True)
+
+    assert client.get("/metrics/").status_code == 403
+
+    response = client.get("/metrics/", HTTP_AUTHORIZATION="Bearer secret")
+
+    assert response.status_code == 200
+    lines = response.content.decode("utf-8").splitlines()
+    assert "# TYPE grandchallenge_s3_requests counter" in lines
+    assert 'grandchallenge_s3_requests_total{operation="GetObject"} 2' in lines
+    assert (
+        "# TYPE grandchallenge_job_stage_duration_seconds histogram" in lines
+    )
+    assert (
+        'grandchallenge_job_stage_duration_seconds_bucket{stage="execute_job",le="0.1"} 0'
+        in lines
+    )
+    assert (
+        'grandchallenge_job_stage_duration_seconds_bucket{stage="execute_job",le="+Inf"} 2'
+        in lines
+    )
+    assert (
+        'grandchallenge_job_stage_duration_seconds_count{stage="execute_job"} 2'
+        in lines
+    )
+
+
+@pytest.mark.django_db
+def test_prometheus_large_values_not_truncated(client, settings):
+    settings.METRICS_EXPORTER = (
+        "grandchallenge.core.metrics.PrometheusMetricsExporter"
+    )
+    settings.METRICS_PROMETHEUS_BEARER_TOKEN = "secret"
+
+    get_redis_connection("default").delete(PrometheusMetricsExporter.KEY)
+
+    increment("S3BytesUploaded", value=123456789, unit="Bytes")
+    observe("JobStageDuration", value=1234567.25, Stage="execute_job")
+    flush_metrics(force=True)
+
+    response = client.get("/metrics/", HTTP_AUTHORIZATION="Bearer secret")
+
+    lines = response.content.decode("utf-8").splitlines()
+    assert "grandchallenge_s3_bytes_uploaded_bytes_total 123456789" in lines
+    assert (
+        'grandchallenge_job_stage_duration_seconds_sum{stage="execute_job"} 1234567.25'
+        in lines
+    )
+
+
+@pytest.mark.django_db
+def test_prometheus_endpoint_disabled(client, settings):
+    settings.METRICS_PROMETHEUS_BEARER_TOKEN = "secret"
+
+    response = client.get("/metrics/", HTTP_AUTHORIZATION="Bearer secret")
+
+    assert response.status_code == 404
@@ -236,8 +236,17 @@ def test_permission_request_workflow(
     ),
 )
 def test_permission_request_notifications_flow_for_manual_review(
-    client, factory, namespace, request_model, request_attr
+    client,
+    settings,
+    django_capture_on_commit_callbacks,
+    factory,
+    namespace,
+    request_model,
+    request_attr,
 ):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
+
     base_object = factory(
         access_request_handling=AccessRequestHandlingOptions.MANUAL_REVIEW
     )
@@ -265,18 +274,19 @@ def test_permission_request_notifications_flow_for_manual_review(
     assert is_following(user=editor, obj=base_object)
 
     # Create the permission request
-    _ = get_view_for_user(
-        client=client,
-        user=user,
-        url=permission_create_url,
-        method=client.post,
-        data={
-            "registration_question_answers-TOTAL_FORMS": "0",
-            "registration_question_answers-INITIAL_FORMS": "0",
-            "registration_question_answers-MIN_NUM_FORMS": "0",
-            "registration_question_answers-MAX_NUM_FORMS": "0",
-        },
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        _ = get_view_for_user(
+            client=client,
+            user=user,
+            url=permission_create_url,
+            method=client.post,
+            data={
+                "registration_question_answers-TOTAL_FORMS": "0",
+                "registration_question_answers-INITIAL_FORMS": "0",
+                "registration_question_answers-MIN_NUM_FORMS": "0",
+                "registration_question_answers-MAX_NUM_FORMS": "0",
+            },
+        )
 
     pr = request_model.objects.get()
     assert pr.status == request_model.PENDING
@@ -309,13 +319,14 @@ def test_permission_request_notifications_flow_for_manual_review(
         )
 
     # accepting the permission request
-    _ = get_view_for_user(
-        client=client,
-        user=editor,
-        url=permission_update_url,
-        method=client.post,
-        data={"status": pr.ACCEPTED},
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        _ = get_view_for_user(
+            client=client,
+            user=editor,
+            url=permission_update_url,
+            method=client.post,
+            data={"status": pr.ACCEPTED},
+        )
 
     pr.refresh_from_db()
     assert pr.status == request_model.ACCEPTED
@@ -330,13 +341,14 @@ def test_permission_request_notifications_flow_for_manual_review(
     )
 
     # reject permission request
-    _ = get_view_for_user(
-        client=client,
-        user=editor,
-        url=permission_update_url,
-        method=client.post,
-        data={"status": pr.REJECTED},
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        _ = get_view_for_user(
+            client=client,
+            user=editor,
+            url=permission_update_url,
+            method=client.post,
+            data={"status": pr.REJECTED},
+        )
 
     pr.refresh_from_db()
     assert pr.status == request_model.REJECTED
@@ -440,8 +452,17 @@ def test_permission_request_notifications_flow_for_accept_all(
     ),
 )
 def test_permission_request_notifications_flow_for_accept_verified_users(
-    client, factory, namespace, request_model, request_attr
+    client,
+    settings,
+    django_capture_on_commit_callbacks,
+    factory,
+    namespace,
+    request_model,
+    request_attr,
 ):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
+
     base_object = factory(
         access_request_handling=AccessRequestHandlingOptions.ACCEPT_VERIFIED_USERS
     )
@@ -468,18 +489,19 @@ def test_permission_request_notifications_flow_for_accept_verified_users(
     Verification.objects.create(user=verified_user, is_verified=True)
 
     # the verified users gets accepted automatically, no follows and no notifcations
-    _ = get_view_for_user(
-        client=client,
-        user=verified_user,
-        url=permission_create_url,
-        method=client.post,
-        data={
-            "registration_question_answers-TOTAL_FORMS": "0",
-            "registration_question_answers-INITIAL_FORMS": "0",
-            "registration_question_answers-MIN_NUM_FORMS": "0",
-            "registration_question_answers-MAX_NUM_FORMS": "0",
-        },
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        _ = get_view_for_user(
+            client=client,
+            user=verified_user,
+            url=permission_create_url,
+            method=client.post,
+            data={
+                "registration_question_answers-TOTAL_FORMS": "0",
+                "registration_question_answers-INITIAL_FORMS": "0",
+                "registration_question_answers-MIN_NUM_FORMS": "0",
+                "registration_question_answers-MAX_NUM_FORMS": "0",
+            },
+        )
     pr = request_model.objects.get()
     assert pr.status == request_model.ACCEPTED
     assert pr.user == verified_user
@@ -489,18 +511,19 @@ def test_permission_request_notifications_flow_for_accept_verified_users(
 
     # for the not verified user, a follow is created, the request is pending and
     # the admin gets a notification
-    _ = get_view_for_user(
-        client=client,
-        user=not_verified_user,
-        url=permission_create_url,
-        method=client.post,
-        data={
-            "registration_question_answers-TOTAL_FORMS": "0",
-            "registration_question_answers-INITIAL_FORMS": "0",
-            "registration_question_answers-MIN_NUM_FORMS": "0",
-            "registration_question_answers-MAX_NUM_FORMS": "0",
-        },
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        _ = get_view_for_user(
+            client=client,
+            user=not_verified_user,
+            url=permission_create_url,
+            method=client.post,
+            data={
+                "registration_question_answers-TOTAL_FORMS": "0",
+                "registration_question_answers-INITIAL_FORMS": "0",
+                "registration_question_answers-MIN_NUM_FORMS": "0",
+                "registration_question_answers-MAX_NUM_FORMS": "0",
+            },
+        )
     pr = request_model.objects.get()
     assert pr.status == request_model.PENDING
     assert pr.user == not_verified_user
@@ -510,7 +533,12 @@ def test_permission_request_notifications_flow_for_accept_verified_users(
 
 
 @pytest.mark.django_db
-def test_algorithm_permission_request_notification_for_admins_only(client):
+def test_algorithm_permission_request_notification_for_admins_only(
+    client, settings, django_capture_on_commit_callbacks
+):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
+
     base_object = AlgorithmFactory()
     editor = UserFactory()
     user = UserFactory()
@@ -527,18 +555,19 @@ def test_algorithm_permission_request_notification_for_admins_only(client):
     )
 
     # Create the permission request
-    _ = get_view_for_user(
-        client=client,
-        user=user,
-        url=permission_create_url,
-        method=client.post,
-        data={
-            "registration_question_answers-TOTAL_FORMS": "0",
-            "registration_question_answers-INITIAL_FORMS": "0",
-            "registration_question_answers-MIN_NUM_FORMS": "0",
-            "registration_question_answers-MAX_NUM_FORMS": "0",
-        },
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        _ = get_view_for_user(
+            client=client,
+            user=user,
+            url=permission_create_url,
+            method=client.post,
+            data={
+                "registration_question_answers-TOTAL_FORMS": "0",
+                "registration_question_answers-INITIAL_FORMS": "0",
+                "registration_question_answers-MIN_NUM_FORMS": "0",
+                "registration_question_answers-MAX_NUM_FORMS": "0",
+            },
+        )
 
     assert Notification.objects.count() == 1
     assert Notification.objects.get().user == editor
@@ -1,7 +1,13 @@
 import pytest
+from django_redis import get_redis_connection
 
-from grandchallenge.algorithms.models import AlgorithmImage
-from grandchallenge.core.tasks import _get_metrics
+from grandchallenge.algorithms.models import AlgorithmImage, Job
+from grandchallenge.core.status_counters import (
+    _get_status_counters_key,
+    get_status_counts,
+    reconcile_status_counters,
+)
+from grandchallenge.core.tasks import STATUS_COUNTED_MODELS, _get_metrics
 from grandchallenge.evaluation.models import Method
 from tests.algorithms_tests.factories import (
     AlgorithmImageFactory,
@@ -11,8 +17,18 @@ from tests.evaluation_tests.factories import EvaluationFactory, MethodFactory
 from tests.factories import SessionFactory, UploadSessionFactory
 
 
+@pytest.fixture
+def uninitialised_status_counters():
+    get_redis_connection("default").delete(
+        *(
+            _get_status_counters_key(model=model)
+            for model in STATUS_COUNTED_MODELS
+        )
+    )
+
+
 @pytest.mark.django_db
-def test_get_metrics():
+def test_get_metrics(uninitialised_status_counters):
     ai = AlgorithmImageFactory(
         import_status=AlgorithmImage.ImportStatusChoices.COMPLETED
     )
@@ -262,3 +278,48 @@ def test_get_metrics():
             ],
         },
     ]
+
+
+@pytest.mark.django_db
+def test_status_counters_updated(
+    uninitialised_status_counters, django_capture_on_commit_callbacks
+):
+    assert get_status_counts(model=Job) is None
+
+    # Counters are not created by the increments
+    AlgorithmJobFactory(time_limit=60)
+
+    assert get_status_counts(model=Job) is None
+
+    reconcile_status_counters(model=Job)
+
+    assert get_status_counts(model=Job)[Job.PENDING] == 1
+
+    with django_capture_on_commit_callbacks(execute=False):
+        job = AlgorithmJobFactory(time_limit=60)
+
+        # The counters are updated in the transaction, not on commit
+        assert get_status_counts(model=Job)[Job.PENDING] == 2
+
+    job = Job.objects.get(pk=job.pk)
+    job.update_status(status=Job.SUCCESS)
+
+    counts = get_status_counts(model=Job)
+    assert counts[Job.PENDING] == 1
+    assert counts[Job.SUCCESS] == 1
+
+    # Saves that do not change the status do not change the counters
+    job.save()
+
+    assert get_status_counts(model=Job) == counts
+
+    job.delete()
+
+    counts = get_status_counts(model=Job)
+    assert counts[Job.PENDING] == 1
+    assert counts[Job.SUCCESS] == 0
+
+    Job.objects.update(status=Job.CANCELLED)
+
+    assert reconcile_status_counters(model=Job)[Job.CANCELLED] == 1
+    assert get_status_counts(model=Job)[Job.CANCELLED] == 1
@@ -1,6 +1,7 @@
 import pytest
 
 from grandchallenge.core.utils import strtobool
+from grandchallenge.core.utils.rate_limit import TokenBucket
 
 
 @pytest.mark.parametrize(
@@ -37,3 +38,25 @@ def test_strtobool(val, result):
 def test_strtobool_exception():
     with pytest.raises(ValueError):
         strtobool("foobar")
+
+
+def test_token_bucket_limits_rate(mocker):
+    clock = mocker.patch("grandchallenge.core.utils.rate_limit.monotonic")
+    sleep = mocker.patch("grandchallenge.core.utils.rate_limit.sleep")
+    clock.return_value = 0
+
+    bucket = TokenBucket(rate=2)
+
+    bucket.acquire()
+    bucket.acquire()
+
+    assert sleep.call_count == 0
+
+    def advance(seconds):
+        clock.return_value += seconds
+
+    sleep.side_effect = advance
+
+    bucket.acquire()
+
+    sleep.assert_called_once_with(0.5)
@@ -1,4 +1,5 @@
 import pytest
+from botocore.exceptions import ClientError
 from django.contrib.sites.models import Site
 from django.core import mail
 from django.core.mail import get_connection
@@ -110,6 +111,30 @@ def test_email_content(settings):
     assert len(mail.outbox) == 0
 
 
+@pytest.mark.django_db
+def test_send_bulk_email_resumes_from_last_processed_receiver():
+    u1, u2, u3 = UserFactory.create_batch(3)
+    for user in [u1, u2, u3]:
+        user.user_profile.receive_newsletter = True
+        user.user_profile.save()
+
+    email = EmailFactory(
+        status_report={
+            "last_processed_receiver_pk": u1.pk,
+            "max_receiver_pk": u2.pk,
+        }
+    )
+
+    send_bulk_email(action=SendActionChoices.MAILING_LIST, email_pk=email.pk)
+
+    # Only the receivers in the snapshot who were not yet sent the email
+    assert [m.to for m in mail.outbox] == [[u2.email]]
+
+    email.refresh_from_db()
+    assert email.sent
+    assert email.status_report is None
+
+
 @pytest.mark.parametrize(
     "subscription_type, unsubscribe_viewname",
     [
@@ -378,3 +403,70 @@ def test_send_raw_emails(settings):
 
     assert RawEmail.objects.filter(sent_at__isnull=True).count() == 0
     assert RawEmail.objects.get(pk=e1.pk).sent_at == sent_at_time
+
+
+class FakeSESClient:
+    def __init__(self, *, throttled_messages=(), failed_messages=()):
+        self.throttled_messages = throttled_messages
+        self.failed_messages = failed_messages
+        self.sent_messages = []
+
+    def get_send_quota(self):
+        return {"MaxSendRate": 100.0}
+
+    def send_raw_email(self, *, RawMessage):  # noqa: N803
+        message = RawMessage["Data"]
+
+        if message in self.throttled_messages:
+            code = "Throttling"
+        elif message in self.failed_messages:
+            code = "MessageRejected"
+        else:
+            self.sent_messages.append(message)
+            return {"MessageId": message}
+
+        raise ClientError({"Error": {"Code": code}}, "SendRawEmail")
+
+
+@pytest.mark.django_db
+def test_send_raw_emails_with_ses(settings, mocker):
+    settings.DEBUG = False
+
+    sent, failed, leased, throttled = (
+        RawEmailFactory(message=message)
+        for message in ("sent", "failed", "leased", "throttled")
+    )
+    RawEmail.objects.filter(pk=leased.pk).update(
+        leased_until=timezone.now() + timezone.timedelta(minutes=1)
+    )
+
+    client = FakeSESClient(
+        throttled_messages=(throttled.message,),
+        failed_messages=(failed.message,),
+    )
+    mocker.patch(
+        "grandchallenge.emails.tasks.boto3.client", return_value=client
+    )
+
+    send_raw_emails()
+
+    assert client.sent_messages == [sent.message]
+
+    sent.refresh_from_db()
+    assert sent.sent_at is not None
+    assert sent.leased_until is None
+
+    failed.refresh_from_db()
+    assert failed.errored
+    assert failed.sent_at is None
+
+    # Leased by another worker
+    leased.refresh_from_db()
+    assert leased.sent_at is None
+    assert leased.leased_until is not None
+
+    # Released to be sent later
+    throttled.refresh_from_db()
+    assert throttled.sent_at is None
+    assert not throttled.errored
+    assert throttled.leased_until is None
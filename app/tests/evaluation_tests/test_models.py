@@ -906,6 +906,84 @@ def test_evaluation_invalid_metrics(
     assert evaluation.invalid_metrics == expected_invalid_metrics
 
 
+@pytest.mark.django_db
+def test_evaluation_metrics_extracted_from_outputs():
+    phase = PhaseFactory(
+        score_jsonpath="acc.mean",
+        score_error_jsonpath="acc.std",
+        extra_results_columns=[
+            {
+                "path": "dice.mean",
+                "error_path": "dice.std",
+                "order": "asc",
+                "title": "Dice mean",
+            }
+        ],
+    )
+    evaluation = EvaluationFactory(
+        submission__phase=phase, time_limit=phase.evaluation_time_limit
+    )
+    civ = ComponentInterfaceValueFactory(
+        interface=ComponentInterface.objects.get(slug="metrics-json-file"),
+        value={
+            "acc": {"std": 0.1, "mean": 0.0},
+            "dice": {"mean": 0.5},
+            "unused": {"mean": 0.2},
+        },
+    )
+
+    assert phase.metric_paths == [
+        "acc.mean",
+        "acc.std",
+        "dice.mean",
+        "dice.std",
+    ]
+    assert evaluation.metrics == {}
+
+    evaluation.outputs.add(civ)
+
+    expected = {"acc.mean": 0.0, "acc.std": 0.1, "dice.mean": 0.5}
+    assert evaluation.metrics == expected
+    evaluation.refresh_from_db()
+    assert evaluation.metrics == expected
+
+    evaluation.outputs.clear()
+
+    evaluation.refresh_from_db()
+    assert evaluation.metrics == {}
+
+
+@pytest.mark.django_db
+def test_evaluation_metrics_reextracted_when_phase_paths_change():
+    phase = PhaseFactory(score_jsonpath="acc.mean")
+    evaluation = EvaluationFactory(
+        submission__phase=phase,
+        status=Evaluation.SUCCESS,
+        time_limit=phase.evaluation_time_limit,
+    )
+    evaluation.outputs.add(
+        ComponentInterfaceValueFactory(
+            interface=ComponentInterface.objects.get(slug="metrics-json-file"),
+            value={"acc": {"mean": 0.3}, "dice": {"mean": 0.5}},
+        )
+    )
+
+    calculate_ranks(phase_pk=phase.pk)
+
+    evaluation.refresh_from_db()
+    assert evaluation.metrics == {"acc.mean": 0.3}
+    assert evaluation.rank == 1
+
+    phase.score_jsonpath = "dice.mean"
+    phase.save()
+
+    calculate_ranks(phase_pk=phase.pk)
+
+    evaluation.refresh_from_db()
+    assert evaluation.metrics == {"dice.mean": 0.5}
+    assert evaluation.rank_per_metric == {"dice.mean": 1}
+
+
 @pytest.mark.django_db
 def test_valid_archive_items_per_interface():
     archive = ArchiveFactory()
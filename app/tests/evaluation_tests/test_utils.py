@@ -1,11 +1,27 @@
+from collections import namedtuple
+
+import numpy as np
 import pytest
 
 from grandchallenge.components.models import (
     ComponentInterface,
     ComponentInterfaceValue,
 )
-from grandchallenge.evaluation.models import Evaluation, Phase
-from grandchallenge.evaluation.tasks import calculate_ranks
+from grandchallenge.evaluation.models import (
+    Evaluation,
+    Phase,
+    PhaseRankingIndex,
+)
+from grandchallenge.evaluation.tasks import (
+    calculate_ranks,
+    update_ranks_for_evaluation,
+)
+from grandchallenge.evaluation.utils import (
+    Metric,
+    MetricValues,
+    get_metric_values,
+    rank_metric_values,
+)
 from tests.evaluation_tests.factories import EvaluationFactory, PhaseFactory
 from tests.factories import UserFactory
 
@@ -437,6 +453,200 @@ def test_null_results():
     assert_ranks(queryset, expected_ranks)
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "result_display_choice", (Phase.ALL, Phase.MOST_RECENT, Phase.BEST)
+)
+def test_update_ranks_for_evaluation_matches_full_rebuild(
+    django_assert_max_num_queries, result_display_choice
+):
+    phase = PhaseFactory(
+        score_jsonpath="a",
+        result_display_choice=result_display_choice,
+        scoring_method_choice=Phase.MEAN,
+        extra_results_columns=[
+            {"path": "b", "title": "b", "order": Phase.ASCENDING}
+        ],
+    )
+    users = UserFactory.create_batch(2)
+    interface = ComponentInterface.objects.get(slug="metrics-json-file")
+
+    def create_evaluation(*, creator, result):
+        evaluation = EvaluationFactory(
+            submission__phase=phase,
+            submission__creator=creator,
+            status=Evaluation.SUCCESS,
+            time_limit=phase.evaluation_time_limit,
+        )
+        evaluation.outputs.add(
+            ComponentInterfaceValue.objects.create(
+                interface=interface, value=result
+            )
+        )
+        return evaluation
+
+    evaluations = [
+        create_evaluation(creator=users[0], result={"a": 0.5, "b": 0.2}),
+        create_evaluation(creator=users[1], result={"a": 0.7, "b": 0.4}),
+        create_evaluation(creator=users[0], result={"a": 0.1, "b": 0.1}),
+    ]
+
+    calculate_ranks(phase_pk=phase.pk)
+
+    def get_ranks():
+        return [
+            (e.rank, e.rank_score, e.rank_per_metric)
+            for e in Evaluation.objects.filter(
+                pk__in=[e.pk for e in evaluations]
+            ).order_by("created")
+        ]
+
+    # Add a new result
+    evaluations.append(
+        create_evaluation(creator=users[1], result={"a": 0.9, "b": 0.3})
+    )
+
+    with django_assert_max_num_queries(12):
+        update_ranks_for_evaluation(evaluation_pk=evaluations[-1].pk)
+
+    incremental_ranks = get_ranks()
+    calculate_ranks(phase_pk=phase.pk)
+    assert incremental_ranks == get_ranks()
+
+    # Unpublish an existing result
+    evaluations[1].published = False
+    evaluations[1].save()
+
+    update_ranks_for_evaluation(evaluation_pk=evaluations[1].pk)
+
+    incremental_ranks = get_ranks()
+    assert incremental_ranks[1] == (0, 0.0, {})
+    calculate_ranks(phase_pk=phase.pk)
+    assert incremental_ranks == get_ranks()
+
+
+@pytest.mark.django_db
+def test_update_ranks_for_evaluation_skips_unranked_evaluations(
+    django_assert_max_num_queries,
+):
+    phase = PhaseFactory(score_jsonpath="a")
+    evaluation = EvaluationFactory(
+        submission__phase=phase,
+        status=Evaluation.EXECUTING,
+        time_limit=phase.evaluation_time_limit,
+    )
+
+    calculate_ranks(phase_pk=phase.pk)
+
+    with django_assert_max_num_queries(8):
+        update_ranks_for_evaluation(evaluation_pk=evaluation.pk)
+
+    evaluation.refresh_from_db()
+    assert evaluation.rank == 0
+
+
+@pytest.mark.django_db
+def test_update_ranks_for_evaluation_defers_rebuild(
+    django_capture_on_commit_callbacks,
+):
+    phase = PhaseFactory(score_jsonpath="a")
+    evaluation = EvaluationFactory(
+        submission__phase=phase,
+        status=Evaluation.SUCCESS,
+        time_limit=phase.evaluation_time_limit,
+    )
+    evaluation.outputs.add(
+        ComponentInterfaceValue.objects.create(
+            interface=ComponentInterface.objects.get(slug="metrics-json-file"),
+            value={"a": 0.5},
+        )
+    )
+
+    # The index was built for other metrics
+    PhaseRankingIndex.objects.filter(phase=phase).update(metric_paths=[])
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        update_ranks_for_evaluation(evaluation_pk=evaluation.pk)
+
+    evaluation.refresh_from_db()
+    assert evaluation.rank == 0
+    assert len(callbacks) == 1
+
+    calculate_ranks(phase_pk=phase.pk)
+
+    evaluation.refresh_from_db()
+    assert evaluation.metrics == {"a": 0.5}
+    assert evaluation.rank == 1
+
+
+@pytest.mark.parametrize(
+    "scores, reverse, expected_ranks",
+    (
+        ([0.5, 0.2, 0.5, 0.9], False, [2, 1, 2, 4]),
+        ([0.5, 0.2, 0.5, 0.9], True, [2, 4, 2, 1]),
+        ([1, 1.0, True, 0], False, [2, 2, 2, 1]),
+        ([3, 3, 3], True, [1, 1, 1]),
+    ),
+)
+def test_rank_metric_values_ties(scores, reverse, expected_ranks):
+    metrics = (Metric(path="a", reverse=reverse),)
+    pks = tuple(range(len(scores)))
+
+    positions = rank_metric_values(
+        metric_values=MetricValues(
+            pks=pks,
+            values=np.array(scores, dtype=np.float64).reshape(-1, 1),
+        ),
+        metrics=metrics,
+        score_method=lambda x: x[:, 0],
+    )
+
+    assert [positions.ranks[pk] for pk in pks] == expected_ranks
+    assert [positions.rank_per_metric[pk] for pk in pks] == [
+        {"a": rank} for rank in expected_ranks
+    ]
+    assert all(type(r) is int for r in positions.ranks.values())
+
+
+def test_get_metric_values_excludes_invalid():
+    Result = namedtuple("Result", ["pk", "metrics"])  # noqa: N806
+
+    metrics = (
+        Metric(path="a.b", reverse=False),
+        Metric(path="c", reverse=True),
+    )
+
+    metric_values = get_metric_values(
+        evaluations=[
+            Result(1, {"a.b": 1, "c": 0.5}),
+            Result(2, {"a.b": None, "c": 0.5}),
+            Result(3, {"c": 0.5}),
+            Result(4, {"a.b": 2.5, "c": 1}),
+            Result(5, {}),
+        ],
+        metrics=metrics,
+    )
+
+    assert metric_values.pks == (1, 4)
+    assert metric_values.values.tolist() == [[1.0, 0.5], [2.5, 1.0]]
+    assert metric_values.subset(pks=[4]).pks == (4,)
+    assert metric_values.subset(pks=[4]).values.tolist() == [[2.5, 1.0]]
+
+
+def test_rank_metric_values_empty():
+    positions = rank_metric_values(
+        metric_values=get_metric_values(
+            evaluations=[], metrics=(Metric(path="a", reverse=False),)
+        ),
+        metrics=(Metric(path="a", reverse=False),),
+        score_method=lambda x: x[:, 0],
+    )
+
+    assert positions.ranks == {}
+    assert positions.rank_scores == {}
+    assert positions.rank_per_metric == {}
+
+
 def assert_ranks(queryset, expected_ranks, expected_rank_scores=None):
     for r in queryset:
         r.refresh_from_db()
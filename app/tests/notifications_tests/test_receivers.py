@@ -0,0 +1,108 @@
+import pytest
+from actstream.actions import follow, unfollow
+
+from grandchallenge.notifications.models import NotificationTypeChoices
+from grandchallenge.notifications.receivers import Receiver, get_receivers
+from grandchallenge.profiles.models import NotificationEmailOptions
+from tests.evaluation_tests.factories import PhaseFactory
+from tests.factories import UserFactory
+
+
+@pytest.mark.django_db
+def test_evaluation_status_receivers(django_assert_num_queries):
+    phase = PhaseFactory()
+    admin, admin_not_following, participant, other_user = (
+        UserFactory.create_batch(4)
+    )
+
+    phase.challenge.add_admin(admin)
+    phase.challenge.add_admin(admin_not_following)
+    unfollow(admin_not_following, phase, send_action=False)
+    follow(participant, phase, send_action=False)
+    follow(other_user, phase, send_action=False)
+
+    admin_ids = {
+        r.user_id
+        for r in get_receivers(
+            kind=NotificationTypeChoices.MISSING_METHOD,
+            actor=None,
+            action_object=None,
+            target=phase,
+        )
+    }
+    assert admin.pk in admin_ids
+    assert admin_not_following.pk not in admin_ids
+    assert participant.pk not in admin_ids
+
+    with django_assert_num_queries(1):
+        receivers = get_receivers(
+            kind=NotificationTypeChoices.EVALUATION_STATUS,
+            actor=participant,
+            action_object=None,
+            target=phase,
+        )
+
+    assert {r.user_id for r in receivers} == admin_ids | {participant.pk}
+    assert (
+        Receiver(
+            user_id=participant.pk,
+            notification_email_choice=NotificationEmailOptions.DAILY_SUMMARY,
+        )
+        in receivers
+    )
+
+
+@pytest.mark.django_db
+def test_receivers_cache_invalidated_on_follow(
+    settings, django_assert_num_queries
+):
+    settings.NOTIFICATIONS_RECEIVERS_CACHE_TIMEOUT = 60
+
+    phase = PhaseFactory()
+    user = UserFactory()
+
+    def get_follower_ids():
+        return {
+            r.user_id
+            for r in get_receivers(
+                kind=NotificationTypeChoices.FORUM_POST,
+                actor=None,
+                action_object=None,
+                target=phase,
+            )
+        }
+
+    follow(user, phase, send_action=False)
+    assert user.pk in get_follower_ids()
+
+    with django_assert_num_queries(0):
+        assert user.pk in get_follower_ids()
+
+    unfollow(user, phase, send_action=False)
+    assert user.pk not in get_follower_ids()
+
+
+@pytest.mark.django_db
+def test_admin_receivers_not_cached(settings):
+    settings.NOTIFICATIONS_RECEIVERS_CACHE_TIMEOUT = 60
+
+    phase = PhaseFactory()
+    admin = UserFactory()
+
+    def get_admin_ids():
+        return {
+            r.user_id
+            for r in get_receivers(
+                kind=NotificationTypeChoices.MISSING_METHOD,
+                actor=None,
+                action_object=None,
+                target=phase,
+            )
+        }
+
+    phase.challenge.add_admin(admin)
+    assert admin.pk in get_admin_ids()
+
+    # Removing the admin does not change the follows of the phase
+    phase.challenge.remove_admin(admin)
+    assert admin.pk not in get_admin_ids()
@@ -1,10 +1,15 @@
 import pytest
+from actstream.actions import follow
 from django.core import mail
 from django.utils.timezone import now
 
 from grandchallenge.notifications.models import Notification
 from grandchallenge.notifications.tasks import send_unread_notification_emails
 from grandchallenge.profiles.models import NotificationEmailOptions
+from tests.discussion_forums_tests.factories import (
+    ForumFactory,
+    ForumTopicFactory,
+)
 from tests.factories import UserFactory
 from tests.notifications_tests.factories import NotificationFactory
 
@@ -127,3 +132,57 @@ def test_instant_email_notification_opt_in():
     # only the user with instant notification emails enabled gets an email
     assert len(mail.outbox) == 1
     assert mail.outbox[0].to == [user_instant_email.email]
+
+
+@pytest.mark.django_db
+def test_notifications_fanned_out_to_followers(
+    settings, django_capture_on_commit_callbacks
+):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
+    settings.NOTIFICATIONS_BULK_CREATE_BATCH_SIZE = 2
+
+    forum = ForumFactory()
+    topic = ForumTopicFactory(forum=forum)
+    followers = UserFactory.create_batch(5)
+    instant_email_follower = followers[0]
+
+    for follower in followers:
+        follow(user=follower, obj=forum, send_action=False)
+
+    instant_email_follower.user_profile.notification_email_choice = (
+        NotificationEmailOptions.INSTANT
+    )
+    instant_email_follower.user_profile.save()
+
+    Notification.objects.all().delete()
+    mail.outbox.clear()
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        Notification.send(
+            kind=Notification.Type.FORUM_POST,
+            actor=topic.creator,
+            message="posted",
+            action_object=topic,
+            target=forum,
+        )
+
+    # The notifications are only sent once the transaction commits
+    assert not Notification.objects.exists()
+
+    for callback in callbacks:
+        callback()
+
+    notifications = Notification.objects.filter(target_object_id=forum.pk)
+
+    assert {n.user for n in notifications} >= set(followers)
+    assert all(
+        n.user.has_perm(permission, n)
+        for n in notifications
+        for permission in (
+            "view_notification",
+            "change_notification",
+            "delete_notification",
+        )
+    )
+    assert [m.to for m in mail.outbox] == [[instant_email_follower.email]]
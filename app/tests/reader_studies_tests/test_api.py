@@ -7,7 +7,6 @@ from django.urls import reverse
 
 from grandchallenge.cases.models import RawImageUploadSession
 from grandchallenge.components.models import InterfaceKindChoices
-from grandchallenge.core.utils.query import set_seed
 from grandchallenge.reader_studies.models import (
     Answer,
     AnswerType,
@@ -2074,9 +2073,9 @@ def test_display_set_index(client):
     )
 
     # determine shuffled index of first Displayset
-    set_seed(1 / int(user.pk))
-    queryset = list(DisplaySet.objects.all().order_by("?"))
-    new_index = queryset.index(DisplaySet.objects.first())
+    new_index = reader_study.get_hanging_list(user=user).index(
+        DisplaySet.objects.first().pk
+    )
 
     assert response.json()["index"] == new_index
 
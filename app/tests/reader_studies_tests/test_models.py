@@ -19,6 +19,7 @@ from grandchallenge.reader_studies.models import (
     Question,
     QuestionWidgetKindChoices,
     ReaderStudy,
+    ReaderStudyUserProgress,
 )
 from tests.components_tests.factories import (
     ComponentInterfaceFactory,
@@ -192,6 +193,65 @@ def test_progress_for_user(settings):
     assert progress["questions"] == 100.0
 
 
+@pytest.mark.django_db
+def test_progress_for_user_is_maintained():
+    rs = ReaderStudyFactory()
+    q1, q2 = QuestionFactory.create_batch(2, reader_study=rs)
+    ds1, ds2 = DisplaySetFactory.create_batch(2, reader_study=rs)
+    reader = UserFactory()
+
+    a1 = AnswerFactory(question=q1, display_set=ds1, creator=reader)
+    AnswerFactory(question=q2, display_set=ds1, creator=reader)
+    AnswerFactory(question=q1, display_set=ds2, creator=reader)
+
+    def get_counts():
+        progress = ReaderStudyUserProgress.objects.get(
+            reader_study=rs, user=reader
+        )
+        return progress.answer_count, progress.completed_display_set_count
+
+    assert get_counts() == (3, 1)
+
+    # Adding a question means that the display set is no longer complete
+    q3 = QuestionFactory(reader_study=rs)
+    assert get_counts() == (3, 0)
+
+    q3.delete()
+    assert get_counts() == (3, 1)
+
+    a1.delete()
+    assert get_counts() == (2, 0)
+
+    Answer.objects.filter(creator=reader).update(is_ground_truth=True)
+    ReaderStudyUserProgress.recalculate(reader_study=rs, user=reader)
+    assert get_counts() == (0, 0)
+
+
+@pytest.mark.django_db
+def test_hanging_list():
+    rs = ReaderStudyFactory()
+    ds1, ds2, ds3 = DisplaySetFactory.create_batch(3, reader_study=rs)
+    u1, u2 = UserFactory.create_batch(2)
+
+    ds2.order = ds1.order
+    ds2.save()
+
+    assert rs.get_hanging_list(user=u1) == [ds1.pk, ds2.pk, ds3.pk]
+    assert [ds.standard_index for ds in (ds1, ds2, ds3)] == [0, 1, 2]
+
+    rs.shuffle_hanging_list = True
+    rs.save()
+
+    shuffled = rs.get_hanging_list(user=u1)
+
+    assert sorted(shuffled) == sorted([ds1.pk, ds2.pk, ds3.pk])
+    assert rs.get_hanging_list(user=u1) == shuffled
+    assert {
+        tuple(rs.get_hanging_list(user=user))
+        for user in [u1, u2, *UserFactory.create_batch(8)]
+    } != {tuple(shuffled)}
+
+
 @pytest.mark.django_db
 def test_leaderboard(  # noqa: C901
     reader_study_with_gt, settings, django_capture_on_commit_callbacks
@@ -21,6 +21,8 @@ TEMPLATES[0]["DIRS"].append(SITE_ROOT / "tests" / "templates")  # noqa 405
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 
 FORUMS_MIN_ACCOUNT_AGE_DAYS = 0
+# Primary keys are reused between tests, so do not share cached receivers
+NOTIFICATIONS_RECEIVERS_CACHE_TIMEOUT = 0
 ACCOUNT_RATE_LIMITS = False
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
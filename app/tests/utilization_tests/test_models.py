@@ -317,3 +317,57 @@ def test_evaluation_utilization_created_on_evaluation_sets_properties():
     )
     assert evaluation_utilization.algorithm_image == algorithm_image
     assert evaluation_utilization.algorithm == algorithm_image.algorithm
+
+
+@pytest.mark.django_db
+def test_compute_costs_applied_to_challenge_and_phase(
+    django_capture_on_commit_callbacks,
+):
+    phase = PhaseFactory()
+    evaluation = EvaluationFactory(submission__phase=phase, time_limit=60)
+    job = AlgorithmJobFactory(time_limit=60)
+    job.utilization.phase = phase
+    job.utilization.challenge = phase.challenge
+    job.utilization.save()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        evaluation.utilization.compute_cost_euro_millicents = 100
+        evaluation.utilization.save()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        job.utilization.compute_cost_euro_millicents = 20
+        job.utilization.save(update_fields=["compute_cost_euro_millicents"])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        # Only the difference is applied when the cost changes again
+        job.utilization.compute_cost_euro_millicents = 30
+        job.utilization.save(update_fields=["compute_cost_euro_millicents"])
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        job.utilization.save()
+
+    assert callbacks == []
+
+    phase.refresh_from_db()
+    phase.challenge.refresh_from_db()
+
+    assert phase.compute_cost_euro_millicents == 130
+    assert phase.challenge.compute_cost_euro_millicents == 130
+
+
+@pytest.mark.django_db
+def test_external_evaluation_compute_costs_not_applied_to_phase(
+    django_capture_on_commit_callbacks,
+):
+    phase = PhaseFactory(external_evaluation=True)
+    evaluation = EvaluationFactory(submission__phase=phase, time_limit=60)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        evaluation.utilization.compute_cost_euro_millicents = 100
+        evaluation.utilization.save()
+
+    phase.refresh_from_db()
+    phase.challenge.refresh_from_db()
+
+    assert phase.compute_cost_euro_millicents == 0
+    assert phase.challenge.compute_cost_euro_millicents == 100
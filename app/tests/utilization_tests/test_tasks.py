@@ -1,6 +1,11 @@
 import pytest
+from botocore.stub import Stubber
+from django.core.cache import cache
 
 from grandchallenge.algorithms.models import Job
+from grandchallenge.components.backends.amazon_sagemaker_base import (
+    get_sagemaker_client,
+)
 from grandchallenge.components.backends.base import Executor
 from grandchallenge.utilization.models import JobWarmPoolUtilization
 from grandchallenge.utilization.tasks import create_job_warm_pool_utilizations
@@ -54,7 +59,7 @@ def test_create_job_warm_pool_utilizations(
     )
     settings.COMPONENTS_USD_TO_EUR = 1
 
-    n_expected_queries = 4
+    n_expected_queries = 5
 
     challenge = ChallengeFactory()
     archive = ArchiveFactory()
@@ -105,7 +110,91 @@ def test_create_job_warm_pool_utilizations(
     assert warm_pool_utilization.compute_cost_euro_millicents == 4494
 
     # Run again, check nothing else is created
-    with django_assert_num_queries(n_expected_queries - 1):
+    with django_assert_num_queries(1):
         create_job_warm_pool_utilizations()
 
     assert JobWarmPoolUtilization.objects.count() == 1
+
+
+def _describe_training_job_response(*, warm_pool_status):
+    return {
+        "TrainingJobName": "job",
+        "TrainingJobArn": "arn:aws:sagemaker:us-east-1:123456789012:training-job/job",
+        "ModelArtifacts": {"S3ModelArtifacts": "s3://bucket/model.tar.gz"},
+        "TrainingJobStatus": "Completed",
+        "SecondaryStatus": "Completed",
+        "AlgorithmSpecification": {"TrainingInputMode": "File"},
+        "ResourceConfig": {
+            "VolumeSizeInGB": 30,
+            "InstanceType": "ml.m7i.large",
+        },
+        "StoppingCondition": {},
+        "CreationTime": "2024-01-01T00:00:00Z",
+        "WarmPoolStatus": warm_pool_status,
+    }
+
+
+@pytest.mark.django_db
+def test_create_job_warm_pool_utilizations_batched(settings, mocker):
+    settings.COMPONENTS_DEFAULT_BACKEND = "grandchallenge.components.backends.amazon_sagemaker_training.AmazonSageMakerTrainingExecutor"
+    settings.COMPONENTS_AMAZON_ECR_REGION = "us-east-1"
+    mocker.patch(
+        "grandchallenge.utilization.tasks.WARM_POOL_UTILIZATION_BATCH_SIZE", 2
+    )
+    # The stubbed responses are returned in order
+    mocker.patch(
+        "grandchallenge.utilization.tasks.WARM_POOL_DESCRIBE_CONCURRENCY", 1
+    )
+    cache.clear()
+
+    jobs = sorted(
+        (
+            AlgorithmJobFactory(
+                status=Job.SUCCESS,
+                use_warm_pool=True,
+                time_limit=60,
+            )
+            for _ in range(3)
+        ),
+        key=lambda j: j.pk,
+    )
+    warm_pool_statuses = [
+        {"Status": "Terminated", "ResourceRetainedBillableTimeInSeconds": 60},
+        {"Status": "Available"},
+        {"Status": "Reused", "ResourceRetainedBillableTimeInSeconds": 30},
+    ]
+
+    with Stubber(get_sagemaker_client(region_name="us-east-1")) as s:
+        for warm_pool_status in warm_pool_statuses:
+            s.add_response(
+                method="describe_training_job",
+                service_response=_describe_training_job_response(
+                    warm_pool_status=warm_pool_status
+                ),
+            )
+
+        create_job_warm_pool_utilizations()
+
+        s.assert_no_pending_responses()
+
+    assert {
+        u.job: u.duration.total_seconds()
+        for u in JobWarmPoolUtilization.objects.all()
+    } == {jobs[0]: 60, jobs[2]: 30}
+
+    # The retained times are cached, so only the warm job is described
+    JobWarmPoolUtilization.objects.all().delete()
+
+    with Stubber(get_sagemaker_client(region_name="us-east-1")) as s:
+        s.add_response(
+            method="describe_training_job",
+            service_response=_describe_training_job_response(
+                warm_pool_status={"Status": "Available"}
+            ),
+        )
+
+        create_job_warm_pool_utilizations()
+
+        s.assert_no_pending_responses()
+
+    assert JobWarmPoolUtilization.objects.count() == 2